@@ -0,0 +1,146 @@
+# =============================================================================
+# Program Title: Bulk Summarization of Court Cases
+# Programmer: Jewell Anne Diamante
+# Date Written: October 17, 2026
+# Date Revised: October 17, 2026
+#
+# Purpose:
+#     Re-summarizing a whole docket one case at a time repeats the same model
+#     calls and leaves most of every batch empty. This program summarizes many
+#     court cases in one pass: the paragraphs of every case are classified
+#     together in shared batches, the cases are summarized with LSA in
+#     parallel worker processes, and a failure in one case is reported for
+#     that case only instead of stopping the others.
+#
+# Where the program fits in the general system design:
+#     It is the Python API behind the application's bulk summarization
+#     endpoint, which loads the cases from the database and stores the
+#     summaries. It can also be called directly, e.g. from a notebook.
+#
+# Data Structures, Algorithms, and Control:
+#     - Data Structures:
+#         - **Dictionary (`documents`)**: Document ids mapped to case texts.
+#         - **Dictionary (`outcomes`)**: Document ids mapped to either the
+#           summary, its spans and the segmentation and LSA scores it was
+#           built from, or {"error": ...}.
+#     - Algorithms:
+#         - **Cross-document Batching**: TopicSegmentation.classify_documents
+#           pools the distinct non-heading paragraphs of every case into
+#           shared, length-sorted batches.
+#         - **Parallel LSA**: Each case is summarized in a ProcessPoolExecutor,
+#           since TF-IDF and SVD are CPU-bound and hold the GIL.
+#     - Control:
+#         - Preprocessing, classification and LSA run one after another over
+#           all cases; each stage only receives the cases that passed the
+#           previous one.
+# =============================================================================
+
+
+from concurrent.futures import ProcessPoolExecutor
+
+from Custom_Modules.LSA import summarize_segments_with_spans
+
+
+def bulk_summarize(
+    documents: dict,
+    segmentation,
+    preprocessor,
+    threshold: float = 0.8,
+    batch_size: int = 16,
+    lsa_executor: ProcessPoolExecutor = None,
+    decoder: str = "threshold",
+    lsa_kwargs: dict = None,
+) -> dict:
+    """
+    Description:
+        Summarizes several court cases, classifying all of their paragraphs in
+        shared batches.
+
+    Parameters:
+        documents (dict): Document ids mapped to their case texts.
+        segmentation (TopicSegmentation): The paragraph classifier.
+        preprocessor (preprocess): The preprocessor used to clean and segment
+                                the case texts into paragraphs.
+        threshold (float): The classification confidence threshold.
+        batch_size (int): The number of paragraphs per forward pass.
+        lsa_executor (ProcessPoolExecutor): The worker processes running LSA.
+                                If None, LSA runs in the calling process.
+        decoder (str): The label decoder, "threshold" or "viterbi".
+        lsa_kwargs (dict): Extra keyword arguments of LSA, e.g. the rank policy.
+
+    Returns:
+        outcomes (dict): Every document id mapped to {"summary": summary,
+        "spans": spans, "scores": scores, "paragraphs": paragraphs, "labels":
+        labels, "probabilities": probabilities} on success, or {"error":
+        message} if the case could not be summarized. The spans locate the
+        summary in the case text, the scores are the LSA sentences, sentence
+        scores and SVD row sums, the paragraphs are the segmented paragraphs,
+        the labels their [label, probability] lists and the probabilities the
+        classifier probabilities of every key that is not a heading.
+    """
+    outcomes = {}
+    lsa_kwargs = lsa_kwargs or {}
+
+    # Preprocessing
+    segmented = {}
+    for doc_id, case_text in documents.items():
+        try:
+            if not case_text:
+                raise ValueError("No case text provided")
+            cleaned_text = preprocessor.remove_unnecesary_char(case_text)
+            segmented[doc_id] = preprocessor.segment_paragraph(cleaned_text, case_text)
+        except Exception as e:
+            outcomes[doc_id] = {"error": str(e)}
+
+    # Segmentation of every case in shared batches
+    paragraph_probabilities = {}
+    try:
+        predicted_labels = segmentation.classify_documents(
+            segmented,
+            threshold=threshold,
+            batch_size=batch_size,
+            decoder=decoder,
+            paragraph_probabilities=paragraph_probabilities,
+        )
+    except Exception as e:
+        print("Error during bulk segmentation:", e)
+        for doc_id in segmented:
+            outcomes[doc_id] = {"error": str(e)}
+        return outcomes
+
+    # Summarization of each case
+    futures = {}
+    for doc_id, labels in predicted_labels.items():
+        segmentation_output = segmentation.label_mapping(labels)
+        if lsa_executor is None:
+            try:
+                outcomes[doc_id] = summarize_segments_with_spans(
+                    segmentation_output, documents[doc_id], **lsa_kwargs
+                )
+            except Exception as e:
+                outcomes[doc_id] = {"error": str(e)}
+        else:
+            futures[doc_id] = lsa_executor.submit(
+                summarize_segments_with_spans, segmentation_output, documents[doc_id], **lsa_kwargs
+            )
+
+    for doc_id, future in futures.items():
+        try:
+            outcomes[doc_id] = future.result()
+        except Exception as e:
+            outcomes[doc_id] = {"error": str(e)}
+
+    # The segmentation each summary was built from, so it can be stored
+    for doc_id, labels in predicted_labels.items():
+        if "summary" in outcomes[doc_id]:
+            outcomes[doc_id].update(
+                paragraphs=segmented[doc_id],
+                labels=labels,
+                probabilities={
+                    key: paragraph_probabilities[key]
+                    for key in segmented[doc_id]
+                    if key in paragraph_probabilities
+                },
+            )
+
+    return outcomes
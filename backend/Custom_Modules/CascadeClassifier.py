@@ -0,0 +1,180 @@
+# =============================================================================
+# Program Title: Cheap First-stage Paragraph Classifier for the BART Cascade
+# Programmer: Miguel Tolentino
+# Date Written: October 17, 2026
+# Date Revised: October 17, 2026
+#
+# Purpose:
+#     Most paragraphs of a court case are easy to label: procedural history
+#     reads as facts and dispositive paragraphs read as rulings. This program
+#     trains a tiny TF-IDF and logistic regression classifier on the same
+#     preprocessed sentence/label CSV files used to fine-tune case-bart. The
+#     classifier labels every paragraph first, and only the paragraphs it is
+#     not confident about are sent to the much slower BART model.
+#
+# Where the program fits in the general system design:
+#     The trained classifier is saved with joblib and loaded by
+#     TopicSegmentation when a cascade model path is configured. The model is
+#     trained on sentences but labels paragraphs, so its confidence on
+#     paragraphs is not the one seen in training: the escalation threshold is
+#     calibrated on the paragraphs of the segmented evaluation corpus, with
+#     case-bart's labels as the reference, by Evaluation/CascadeReport.py,
+#     which also measures the share of escalated paragraphs and the speedup.
+#
+# Data Structures, Algorithms, and Control:
+#     - Data Structures:
+#         - **Pipeline (`pipeline`)**: A scikit-learn pipeline of a word and
+#           bigram TF-IDF vectorizer and a logistic regression model.
+#     - Algorithms:
+#         - **Logistic Regression**: Gives class probabilities whose maximum
+#           is used as the escalation criterion.
+#         - **Threshold Calibration**: For every candidate threshold, the
+#           fraction of paragraphs escalated and the fraction whose final
+#           label agrees with case-bart; the lowest threshold reaching the
+#           target agreement escalates the fewest paragraphs.
+#     - Control:
+#         - `train_cascade_model` fits the pipeline on the CSV files, reports
+#           its held-out sentence accuracy and saves it;
+#           `calibrate_threshold` picks the threshold on paragraph-level
+#           probabilities; `CascadeClassifier.load` reads the model back for
+#           inference.
+# =============================================================================
+
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+
+from Custom_Modules.InferenceBackends import ID2LABEL
+
+
+class CascadeClassifier:
+    def __init__(self, pipeline: Pipeline):
+        """
+        Description:
+            Wraps a fitted TF-IDF and logistic regression pipeline.
+
+        Parameters:
+            pipeline (Pipeline): The fitted pipeline. Its classes are the label
+                                ids of ID2LABEL.
+        """
+        self.pipeline = pipeline
+
+        # Column of every label id in the pipeline's probability output
+        self.columns = [list(pipeline.classes_).index(label_id) for label_id in sorted(ID2LABEL)]
+
+    @classmethod
+    def load(cls, model_path: str) -> "CascadeClassifier":
+        """
+        Loads a classifier saved by `train_cascade_model`.
+        """
+        return cls(joblib.load(model_path))
+
+    def predict_probabilities(self, keys: list) -> np.ndarray:
+        """
+        Description:
+            Computes the label probabilities of paragraph keys.
+
+        Parameters:
+            keys (list): The paragraph keys to classify.
+
+        Returns:
+            np.ndarray: A (len(keys), number of labels) array whose columns
+            follow the label ids of ID2LABEL, like the BART probabilities.
+        """
+        if not keys:
+            return np.zeros((0, len(ID2LABEL)), dtype=np.float32)
+        probabilities = self.pipeline.predict_proba(keys)
+        return probabilities[:, self.columns].astype(np.float32)
+
+
+def train_cascade_model(csv_paths: list, output_path: str) -> CascadeClassifier:
+    """
+    Description:
+        Trains the first-stage classifier on preprocessed sentence/label CSV
+        files and saves it.
+
+    Parameters:
+        csv_paths (list): Paths of CSV files written by
+                        `preprocess.output_csv_file`.
+        output_path (str): Where the fitted pipeline is saved.
+
+    Returns:
+        CascadeClassifier: The trained classifier. Its held-out accuracy is
+        measured on sentences; the escalation threshold must still be chosen
+        on paragraphs with `calibrate_threshold`.
+    """
+    from Custom_Modules.Distillation import load_training_frame
+
+    training_df = load_training_frame(csv_paths)
+    train_df, eval_df = train_test_split(
+        training_df, test_size=0.1, random_state=42, stratify=training_df["labels"]
+    )
+
+    pipeline = Pipeline([
+        ("tfidf", TfidfVectorizer(ngram_range=(1, 2), min_df=2, sublinear_tf=True)),
+        ("classifier", LogisticRegression(max_iter=1000, C=4.0)),
+    ])
+    pipeline.fit(train_df["text"], train_df["labels"])
+
+    accuracy = pipeline.score(eval_df["text"], eval_df["labels"])
+    print(f"Held-out accuracy: {accuracy:.4f} on {len(eval_df)} sentences")
+
+    joblib.dump(pipeline, output_path)
+    print(f"Cascade model saved to '{output_path}'.")
+    return CascadeClassifier(pipeline)
+
+
+def calibrate_threshold(cascade_probabilities: np.ndarray, reference_labels: np.ndarray,
+                        thresholds: list, min_agreement: float = 0.98) -> tuple:
+    """
+    Description:
+        Measures every candidate escalation threshold on paragraphs labeled by
+        both the cascade model and case-bart, and picks the lowest threshold
+        whose final labels agree with case-bart on at least `min_agreement`
+        of the paragraphs. An escalated paragraph takes case-bart's label, so
+        it always agrees.
+
+    Parameters:
+        cascade_probabilities (np.ndarray): The cascade model's probabilities
+                        of the paragraphs, as from `predict_probabilities`.
+        reference_labels (np.ndarray): case-bart's label id of every paragraph.
+        thresholds (list): The candidate thresholds.
+        min_agreement (float): The smallest acceptable agreement with case-bart.
+
+    Returns:
+        tuple: A list with the threshold, escalated fraction and agreement of
+               every candidate, and the chosen threshold, or None if no
+               candidate reaches `min_agreement`.
+    """
+    confidence = cascade_probabilities.max(axis=1)
+    cheap_agrees = cascade_probabilities.argmax(axis=1) == reference_labels
+
+    rows, chosen = [], None
+    for threshold in sorted(thresholds):
+        escalated = confidence < threshold
+        agreement = float(np.mean(escalated | cheap_agrees))
+        rows.append({
+            "Threshold": threshold,
+            "Escalated": float(np.mean(escalated)),
+            "Agreement": agreement,
+        })
+        if chosen is None and agreement >= min_agreement:
+            chosen = threshold
+    return rows, chosen
+
+
+# Training command, run from the backend folder:
+#     python -m Custom_Modules.CascadeClassifier --csv csv_files/all_preprocessed_data.csv --output instance/cascade.joblib
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train the first-stage cascade classifier.")
+    parser.add_argument("--csv", nargs="+", required=True)
+    parser.add_argument("--output", required=True)
+    args = parser.parse_args()
+
+    train_cascade_model(args.csv, args.output)
@@ -0,0 +1,196 @@
+# =============================================================================
+# Program Title: Persistent Paragraph Classification Cache
+# Programmer: Jewell Anne Diamante
+# Date Written: October 17, 2026
+# Date Revised: October 17, 2026
+#
+# Purpose:
+#     Court decisions share a lot of boilerplate ("WHEREFORE, premises
+#     considered...", "SO ORDERED.", standard recitals of the Rules of Court).
+#     This program stores the classifier's logits for every paragraph key it
+#     has seen, in a SQLite table next to the application's `file` table, so
+#     that repeated paragraphs are never run through the model twice.
+#
+# Where the program fits in the general system design:
+#     TopicSegmentation looks paragraph keys up in the cache before inference
+#     and stores the logits of the keys it had to classify. The cache counters
+#     are reported by the application's health endpoint.
+#
+# Data Structures, Algorithms, and Control:
+#     - Data Structures:
+#         - **SQLite table (`paragraph_cache`)**: Rows of (model fingerprint,
+#           SHA-256 of the normalized key, float32 logits, last use).
+#     - Algorithms:
+#         - **Key Normalization**: Runs of whitespace are collapsed before
+#           hashing, so trivially different copies share one entry.
+#         - **LRU Eviction**: Every hit refreshes the entry's `last_used`
+#           counter, and the least recently used entries are deleted once the
+#           table grows beyond `max_entries`.
+#         - **Invalidation**: Entries belong to a model fingerprint. Opening
+#           the cache for a new model deletes the entries of older models.
+#     - Control:
+#         - All database access is serialized by a lock, so one cache can be
+#           shared by every request thread.
+# =============================================================================
+
+
+import hashlib
+import sqlite3
+import threading
+
+import numpy as np
+
+
+class ClassificationCache:
+    def __init__(self, db_path: str, model_fingerprint: str, max_entries: int = 50000):
+        """
+        Description:
+            Opens (and creates, if needed) the cache table for one model.
+
+        Parameters:
+            db_path (str): The SQLite database file holding the cache table.
+            model_fingerprint (str): Identifies the model and backend the
+                                    cached logits were produced by.
+            max_entries (int): The largest number of cached paragraphs.
+        """
+        self.model_fingerprint = model_fingerprint
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+
+        with self._lock, self.connection:
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS paragraph_cache (
+                    model_fingerprint TEXT NOT NULL,
+                    key_hash TEXT NOT NULL,
+                    logits BLOB NOT NULL,
+                    last_used INTEGER NOT NULL,
+                    PRIMARY KEY (model_fingerprint, key_hash)
+                )
+                """
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS paragraph_cache_last_used ON paragraph_cache (last_used)"
+            )
+
+            # Entries of any other model are stale
+            self.connection.execute(
+                "DELETE FROM paragraph_cache WHERE model_fingerprint != ?",
+                (model_fingerprint,),
+            )
+            self._clock = self.connection.execute(
+                "SELECT COALESCE(MAX(last_used), 0) FROM paragraph_cache"
+            ).fetchone()[0]
+
+    @staticmethod
+    def key_hash(key: str) -> str:
+        """
+        Hashes a paragraph key after collapsing runs of whitespace.
+        """
+        normalized_key = " ".join(key.split())
+        return hashlib.sha256(normalized_key.encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: list) -> dict:
+        """
+        Description:
+            Looks up the cached logits of several paragraph keys.
+
+        Parameters:
+            keys (list): The paragraph keys to look up.
+
+        Returns:
+            cached (dict): The keys that were found, mapped to their logits.
+        """
+        hashes = {}
+        for key in keys:
+            hashes.setdefault(self.key_hash(key), []).append(key)
+
+        cached = {}
+        with self._lock, self.connection:
+            hash_list = list(hashes)
+            # Stay below SQLite's limit on query parameters
+            for start in range(0, len(hash_list), 500):
+                chunk = hash_list[start:start + 500]
+                rows = self.connection.execute(
+                    f"SELECT key_hash, logits FROM paragraph_cache "
+                    f"WHERE model_fingerprint = ? AND key_hash IN ({','.join('?' * len(chunk))})",
+                    [self.model_fingerprint, *chunk],
+                ).fetchall()
+
+                for key_hash, logits in rows:
+                    for key in hashes[key_hash]:
+                        cached[key] = np.frombuffer(logits, dtype=np.float32)
+
+                # Refresh the recency of every hit
+                self._clock += 1
+                self.connection.executemany(
+                    "UPDATE paragraph_cache SET last_used = ? WHERE model_fingerprint = ? AND key_hash = ?",
+                    [(self._clock, self.model_fingerprint, key_hash) for key_hash, _ in rows],
+                )
+
+            self.hits += len(cached)
+            self.misses += len(keys) - len(cached)
+
+        return cached
+
+    def put_many(self, logits_by_key: dict):
+        """
+        Description:
+            Stores the logits of newly classified paragraph keys and evicts the
+            least recently used entries if the cache is over its size limit.
+
+        Parameters:
+            logits_by_key (dict): Paragraph keys mapped to their logits.
+        """
+        if not logits_by_key:
+            return
+
+        with self._lock, self.connection:
+            self._clock += 1
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO paragraph_cache (model_fingerprint, key_hash, logits, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        self.model_fingerprint,
+                        self.key_hash(key),
+                        np.asarray(logits, dtype=np.float32).tobytes(),
+                        self._clock,
+                    )
+                    for key, logits in logits_by_key.items()
+                ],
+            )
+
+            size = self.connection.execute("SELECT COUNT(*) FROM paragraph_cache").fetchone()[0]
+            if size > self.max_entries:
+                evicted = self.connection.execute(
+                    "DELETE FROM paragraph_cache WHERE rowid IN ("
+                    "SELECT rowid FROM paragraph_cache ORDER BY last_used LIMIT ?)",
+                    (size - self.max_entries,),
+                ).rowcount
+                self.evictions += evicted
+
+    def stats(self) -> dict:
+        """
+        Description:
+            Reports the cache size and its hit/miss/eviction counters.
+
+        Returns:
+            dict: The number of entries, hits, misses, hit rate and evictions.
+        """
+        with self._lock:
+            size = self.connection.execute("SELECT COUNT(*) FROM paragraph_cache").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "entries": size,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,145 @@
+# =============================================================================
+# Program Title: Content-addressed Storage of Case Texts
+# Programmer: Jewell Anne Diamante
+# Date Written: October 17, 2026
+# Date Revised: October 17, 2026
+#
+# Purpose:
+#     Every file used to store its text up to three times: the original text,
+#     the edited text and the uploaded bytes, which are the same text again.
+#     This program provides the pieces of a content-addressed store: a text or
+#     upload is identified by the SHA-256 of its bytes and kept once,
+#     compressed with zstd, however many files or columns refer to it.
+#
+# Where the program fits in the general system design:
+#     The application's `content_blob` table holds the compressed contents,
+#     keyed by `content_hash`, and the `file` table only holds the hashes of
+#     its original text, text and upload. A file whose text was never edited
+#     refers to the same content three times. Uploads are downloaded by
+#     reading their blob incrementally and decompressing it as a stream; the
+#     blob row records where each of its frames starts, so a byte range is
+#     read from the frame that holds it.
+#
+# Data Structures, Algorithms, and Control:
+#     - Data Structures:
+#         - **bytes**: The UTF-8 bytes of a text, or the uploaded file.
+#         - **List (frame offsets)**: The compressed offset of every frame of
+#           a content.
+#     - Algorithms:
+#         - **SHA-256**: The address of a content.
+#         - **zstd**: Compression of each content as independent frames of a
+#           fixed uncompressed size, each recording its own size. A frame can
+#           be decompressed without the ones before it.
+#         - **Streaming Decompression**: A byte range is read by seeking to
+#           the frame holding its first byte and decompressing from there in
+#           fixed-size chunks, skipping the bytes before the range within that
+#           frame only, so neither memory nor the skipped work grows with the
+#           content. Contents stored as one frame, before frames were
+#           introduced, are read from their start.
+#     - Control:
+#         - The functions are stateless and can be called from any thread.
+# =============================================================================
+
+
+import hashlib
+import io
+
+import zstandard
+
+
+def content_hash(data: bytes) -> str:
+    """
+    Description:
+        Computes the address of a content.
+
+    Parameters:
+        data (bytes): The content.
+
+    Returns:
+        str: The SHA-256 hex digest of the content.
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def compress_content(data: bytes, level: int = 10, frame_size: int = 1024 * 1024) -> tuple:
+    """
+    Description:
+        Compresses a content into independent zstd frames, one for every
+        `frame_size` bytes of it.
+
+    Parameters:
+        data (bytes): The content.
+        level (int): The zstd compression level (1-22).
+        frame_size (int): The uncompressed bytes of every frame but the last.
+
+    Returns:
+        tuple: The concatenated frames (bytes) and the offset of each frame
+               in them (list of int).
+    """
+    compressor = zstandard.ZstdCompressor(level=level)
+    frames, frame_offsets, offset = [], [], 0
+    for position in range(0, max(len(data), 1), frame_size):
+        frame = compressor.compress(data[position:position + frame_size])
+        frames.append(frame)
+        frame_offsets.append(offset)
+        offset += len(frame)
+    return b"".join(frames), frame_offsets
+
+
+def decompress_content(data: bytes) -> bytes:
+    """
+    Description:
+        Decompresses a content stored by `compress_content`.
+
+    Parameters:
+        data (bytes): The zstd frames.
+
+    Returns:
+        bytes: The content.
+    """
+    reader = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data), read_across_frames=True)
+    with reader:
+        return reader.readall()
+
+
+def read_content_range(compressed_file, start: int, stop: int, chunk_size: int = 64 * 1024,
+                       frame_size: int = None, frame_offsets: list = None):
+    """
+    Description:
+        Decompresses a range of a stored content from a seekable file-like
+        object, such as an SQLite blob, one chunk at a time, starting at the
+        frame that holds the first byte of the range.
+
+    Parameters:
+        compressed_file: The zstd frames, readable with `read` and `seek`.
+        start (int): The first byte of the range, in the uncompressed content.
+        stop (int): The byte after the range.
+        chunk_size (int): The compressed bytes read, and the most
+                        uncompressed bytes yielded, at a time.
+        frame_size (int): The uncompressed bytes of every frame, or None for
+                        a content stored as one frame.
+        frame_offsets (list): The offset of every frame in `compressed_file`,
+                        or None for a content stored as one frame.
+
+    Returns:
+        generator: The bytes of the range, chunk by chunk.
+    """
+    skip = start
+    if frame_size and frame_offsets:
+        frame = min(start // frame_size, len(frame_offsets) - 1)
+        compressed_file.seek(frame_offsets[frame])
+        skip = start - frame * frame_size
+
+    reader = zstandard.ZstdDecompressor().stream_reader(
+        compressed_file, read_size=chunk_size, read_across_frames=True, closefd=False
+    )
+    with reader:
+        # A frame cannot be entered in the middle, bytes before the range in it are skipped
+        reader.seek(skip)
+        remaining = stop - start
+        while remaining > 0:
+            chunk = reader.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
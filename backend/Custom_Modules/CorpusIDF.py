@@ -0,0 +1,288 @@
+# =============================================================================
+# Program Title: Corpus-level IDF Model for LSA
+# Programmer: Jewell Anne Diamante
+# Date Written: October 17, 2026
+# Date Revised: October 17, 2026
+#
+# Purpose:
+#     The LSA used to fit a new TF-IDF vectorizer on every case, so the
+#     document frequencies came from the paragraphs of that case alone and the
+#     vocabulary was rebuilt for every summary. Short cases, with only a few
+#     paragraphs, got unstable weights. This program keeps the document
+#     frequencies of every term over the paragraphs of all stored court cases,
+#     in a SQLite table next to the application's `file` table, and updates
+#     them incrementally as cases are uploaded, edited and deleted. The LSA
+#     then only transforms a case's paragraphs with the corpus weights.
+#
+# Where the program fits in the general system design:
+#     The application adds a case to the model when it is uploaded or edited
+#     and removes it when it is deleted. Before summarizing, it takes a
+#     snapshot of the model (`CorpusIDF.model`) and passes it to the LSA,
+#     which uses it instead of fitting its own vectorizer.
+#
+# Data Structures, Algorithms, and Control:
+#     - Data Structures:
+#         - **SQLite table (`corpus_idf_terms`)**: Every term and the number
+#           of paragraphs containing it.
+#         - **SQLite table (`corpus_idf_documents`)**: Every indexed case, the
+#           hash of its text, its number of paragraphs and the paragraph
+#           counts of its terms, so the case can be removed exactly.
+#         - **IDFModel**: A snapshot of the vocabulary and IDF weights.
+#     - Algorithms:
+#         - **Smoothed IDF**: idf = ln((1 + n) / (1 + df)) + 1, with n the
+#           number of paragraphs, as computed by scikit-learn's
+#           TfidfVectorizer.
+#         - **Transform-only Vectorization**: Term counts from a
+#           CountVectorizer with the fixed corpus vocabulary, multiplied by
+#           the IDF weights and L2-normalized, as TfidfVectorizer does.
+#     - Control:
+#         - All database access is serialized by a lock, so one model can be
+#           shared by every request thread. The snapshot is rebuilt lazily,
+#           on the first request after the corpus changed.
+# =============================================================================
+
+
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import Counter
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.preprocessing import normalize
+
+
+def split_paragraphs(case_text: str) -> list:
+    """
+    Splits a case text into paragraphs the same way as
+    `preprocess.segment_paragraph` (non-empty lines, stripped).
+    """
+    return [line.strip() for line in case_text.split("\n") if line.strip()]
+
+
+class IDFModel:
+    def __init__(self, vocabulary: dict, idf: np.ndarray, num_paragraphs: int):
+        """
+        Description:
+            A fixed vocabulary and its IDF weights. It can be pickled, so it
+            can be sent to LSA worker processes.
+
+        Parameters:
+            vocabulary (dict): Every term mapped to its column.
+            idf (np.ndarray): The IDF weight of every column.
+            num_paragraphs (int): The number of paragraphs the model was
+                                computed from.
+        """
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.num_paragraphs = num_paragraphs
+        self.vectorizer = CountVectorizer(stop_words="english", vocabulary=vocabulary)
+
+    def transform(self, sentences: list):
+        """
+        Description:
+            Computes the TF-IDF term matrix of sentences without fitting.
+
+        Parameters:
+            sentences (list): The sentences to vectorize.
+
+        Returns:
+            scipy.sparse.csr_matrix: The L2-normalized (sentences, terms)
+            TF-IDF matrix. Terms outside the corpus vocabulary are ignored.
+        """
+        counts = self.vectorizer.transform(sentences)
+        return normalize(counts.multiply(self.idf).tocsr(), norm="l2", copy=False)
+
+
+class CorpusIDF:
+    def __init__(self, db_path: str):
+        """
+        Description:
+            Opens (and creates, if needed) the corpus IDF tables.
+
+        Parameters:
+            db_path (str): The SQLite database file holding the tables.
+        """
+        self.analyzer = CountVectorizer(stop_words="english").build_analyzer()
+        self._model = None
+
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+
+        with self._lock, self.connection:
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS corpus_idf_terms (
+                    term TEXT PRIMARY KEY,
+                    document_frequency INTEGER NOT NULL
+                )
+                """
+            )
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS corpus_idf_documents (
+                    file_id INTEGER PRIMARY KEY,
+                    text_hash TEXT NOT NULL,
+                    num_paragraphs INTEGER NOT NULL,
+                    term_counts TEXT NOT NULL
+                )
+                """
+            )
+
+    @staticmethod
+    def text_hash(case_text: str) -> str:
+        """
+        Hashes a case text, to detect edits.
+        """
+        return hashlib.sha256(case_text.encode("utf-8")).hexdigest()
+
+    def term_counts(self, case_text: str) -> tuple:
+        """
+        Description:
+            Counts, for every term of a case, the paragraphs containing it.
+
+        Parameters:
+            case_text (str): The text of the court case.
+
+        Returns:
+            tuple: The number of paragraphs and a Counter of terms.
+        """
+        paragraphs = split_paragraphs(case_text)
+        counts = Counter()
+        for paragraph in paragraphs:
+            counts.update(set(self.analyzer(paragraph)))
+        return len(paragraphs), counts
+
+    def add_document(self, file_id: int, case_text: str):
+        """
+        Description:
+            Adds a case to the model, replacing its previous text if the case
+            was already indexed. Nothing changes if the text is the same.
+
+        Parameters:
+            file_id (int): The id of the case's file.
+            case_text (str): The text of the court case.
+        """
+        text_hash = self.text_hash(case_text)
+        num_paragraphs, counts = self.term_counts(case_text)
+
+        with self._lock, self.connection:
+            row = self.connection.execute(
+                "SELECT text_hash FROM corpus_idf_documents WHERE file_id = ?", (file_id,)
+            ).fetchone()
+            if row is not None and row[0] == text_hash:
+                return
+
+            self._remove(file_id)
+            self.connection.executemany(
+                "INSERT INTO corpus_idf_terms (term, document_frequency) VALUES (?, ?) "
+                "ON CONFLICT (term) DO UPDATE SET document_frequency = document_frequency + excluded.document_frequency",
+                counts.items(),
+            )
+            self.connection.execute(
+                "INSERT INTO corpus_idf_documents (file_id, text_hash, num_paragraphs, term_counts) "
+                "VALUES (?, ?, ?, ?)",
+                (file_id, text_hash, num_paragraphs, json.dumps(counts)),
+            )
+            self._model = None
+
+    def remove_document(self, file_id: int):
+        """
+        Description:
+            Removes a case from the model, if it was indexed.
+
+        Parameters:
+            file_id (int): The id of the case's file.
+        """
+        with self._lock, self.connection:
+            if self._remove(file_id):
+                self._model = None
+
+    def _remove(self, file_id: int) -> bool:
+        """
+        Subtracts the term counts of an indexed case and forgets the case.
+        Must be called with the lock held, inside a transaction. Returns
+        whether the case was indexed.
+        """
+        row = self.connection.execute(
+            "SELECT term_counts FROM corpus_idf_documents WHERE file_id = ?", (file_id,)
+        ).fetchone()
+        if row is None:
+            return False
+
+        self.connection.executemany(
+            "UPDATE corpus_idf_terms SET document_frequency = document_frequency - ? WHERE term = ?",
+            [(count, term) for term, count in json.loads(row[0]).items()],
+        )
+        self.connection.execute("DELETE FROM corpus_idf_terms WHERE document_frequency <= 0")
+        self.connection.execute("DELETE FROM corpus_idf_documents WHERE file_id = ?", (file_id,))
+        return True
+
+    def sync(self, text_hashes: dict, load_text):
+        """
+        Description:
+            Brings the model in line with the stored cases: new and edited
+            cases are added and cases that no longer exist are removed. The
+            cases are compared by the hashes of their texts (the SHA-256 of
+            the UTF-8 text, as `text_hash` computes it), so only the texts of
+            new and edited cases are loaded.
+
+        Parameters:
+            text_hashes (dict): The id of every stored file mapped to the hash
+                                of its text, or None if it has no text.
+            load_text: Called as `load_text(file_id)` to get the text of a case
+                                that has to be indexed.
+        """
+        with self._lock:
+            indexed_hashes = dict(
+                self.connection.execute("SELECT file_id, text_hash FROM corpus_idf_documents")
+            )
+
+        empty_hash = self.text_hash("")
+        for file_id in set(indexed_hashes) - set(text_hashes):
+            self.remove_document(file_id)
+        for file_id, text_hash in text_hashes.items():
+            if indexed_hashes.get(file_id) != (text_hash or empty_hash):
+                self.add_document(file_id, load_text(file_id) or "")
+
+    def model(self) -> IDFModel:
+        """
+        Description:
+            Returns a snapshot of the current vocabulary and IDF weights.
+
+        Returns:
+            IDFModel: The snapshot, or None if no paragraphs are indexed yet.
+        """
+        with self._lock:
+            if self._model is None:
+                num_paragraphs = self.connection.execute(
+                    "SELECT COALESCE(SUM(num_paragraphs), 0) FROM corpus_idf_documents"
+                ).fetchone()[0]
+                rows = self.connection.execute(
+                    "SELECT term, document_frequency FROM corpus_idf_terms ORDER BY term"
+                ).fetchall()
+                if num_paragraphs == 0 or not rows:
+                    return None
+
+                vocabulary = {term: column for column, (term, _) in enumerate(rows)}
+                document_frequency = np.array([frequency for _, frequency in rows], dtype=np.float64)
+                idf = np.log((1 + num_paragraphs) / (1 + document_frequency)) + 1
+                self._model = IDFModel(vocabulary, idf, num_paragraphs)
+
+            return self._model
+
+    def stats(self) -> dict:
+        """
+        Description:
+            Reports the size of the model.
+
+        Returns:
+            dict: The number of indexed cases, paragraphs and terms.
+        """
+        with self._lock:
+            documents, paragraphs = self.connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(num_paragraphs), 0) FROM corpus_idf_documents"
+            ).fetchone()
+            terms = self.connection.execute("SELECT COUNT(*) FROM corpus_idf_terms").fetchone()[0]
+            return {"documents": documents, "paragraphs": paragraphs, "terms": terms}
@@ -0,0 +1,292 @@
+# =============================================================================
+# Program Title: Knowledge Distillation of the Paragraph Classifier
+# Programmer: Miguel Tolentino
+# Date Written: October 17, 2026
+# Date Revised: October 17, 2026
+#
+# Purpose:
+#     This program trains a much smaller student classifier from the
+#     fine-tuned case-bart model (the teacher). The student keeps a few of the
+#     teacher's encoder and decoder layers and learns from both the teacher's
+#     softened logits and the true labels of the preprocessed training data.
+#     The student is saved in the same format as the teacher, so it can be
+#     loaded by TopicSegmentation as a drop-in, faster paragraph classifier.
+#
+# Where the program fits in the general system design:
+#     It extends the training pipeline (Preprocess, ModelConfiguration and
+#     Modelling). The trained student is compared with the teacher by
+#     Evaluation/DistillationReport.py before it is deployed.
+#
+# Data Structures, Algorithms, and Control:
+#     - Data Structures:
+#         - **DataFrame (`training_df`)**: The preprocessed sentences and labels,
+#           with columns 'text' and 'labels'.
+#         - **Dataset (`train_data`, `eval_data`)**: Tokenized datasets used by
+#           the Hugging Face Trainer.
+#     - Algorithms:
+#         - **Layer Selection**: The student copies the embeddings, the
+#           classification head and evenly spaced layers of the teacher.
+#         - **Distillation Loss**: A weighted sum of the KL divergence between
+#           the temperature-softened teacher and student distributions and the
+#           usual cross-entropy on the true labels.
+#     - Control:
+#         - The program follows the same flow as Training.ipynb: load the
+#           preprocessed CSV files, prepare the datasets, build the student,
+#           train it with `DistillationModelling` and save it.
+# =============================================================================
+
+
+import copy
+
+import numpy as np
+import pandas as pd
+import torch
+import torch.nn.functional as F
+from datasets import Dataset
+from sklearn.model_selection import train_test_split
+from transformers import BartForSequenceClassification, Trainer
+
+from Custom_Modules.modelling import Modelling
+
+
+def load_training_frame(csv_paths):
+    """
+    Loads and concatenates preprocessed sentence/label CSV files, as written by
+    `preprocess.output_csv_file`.
+
+    Parameters:
+        csv_paths (list): Paths of the preprocessed CSV files.
+
+    Returns:
+        training_df (DataFrame): The sentences and labels, with columns 'text'
+                                and 'labels'.
+    """
+    frames = []
+    for csv_path in csv_paths:
+        df = pd.read_csv(csv_path)[["sentence", "label"]]
+        df = df.rename(columns={"sentence": "text", "label": "labels"})
+        frames.append(df)
+
+    training_df = pd.concat(frames, axis=0, ignore_index=True)
+    training_df.dropna(subset=["text", "labels"], inplace=True)
+    training_df["labels"] = training_df["labels"].astype(int)
+    return training_df
+
+
+def prepare_datasets(training_df, tokenizer, max_length=128):
+    """
+    Splits and tokenizes the training data the same way as
+    `preprocess.prepare_BART_data`.
+
+    Parameters:
+        training_df (DataFrame): The sentences and labels.
+        tokenizer: The tokenizer of the teacher model.
+        max_length (int): The maximum number of tokens per sentence.
+
+    Returns:
+        train_data, eval_data (Dataset): The tokenized training and evaluation
+                                        datasets in torch format.
+    """
+    def tokenize(batch):
+        inputs = tokenizer(
+            batch["text"],
+            padding="max_length",
+            truncation=True,
+            max_length=max_length,
+        )
+        batch["input_ids"] = inputs["input_ids"]
+        batch["attention_mask"] = inputs["attention_mask"]
+        return batch
+
+    train_df, eval_df = train_test_split(training_df, test_size=0.1, random_state=42)
+
+    datasets = []
+    for df in (train_df, eval_df):
+        dataset = Dataset.from_pandas(df, preserve_index=False)
+        dataset = dataset.map(tokenize, batched=True, remove_columns=["text"])
+        dataset.set_format(type="torch", columns=["input_ids", "attention_mask", "labels"])
+        datasets.append(dataset)
+
+    return datasets[0], datasets[1]
+
+
+def _select_layers(total_layers, kept_layers):
+    """
+    Picks evenly spaced layer indices, always keeping the first and last layer.
+    """
+    return [int(idx) for idx in np.linspace(0, total_layers - 1, kept_layers).round()]
+
+
+def build_student(teacher, encoder_layers=2, decoder_layers=1):
+    """
+    Builds a smaller BART classifier initialized from the teacher's weights.
+
+    Parameters:
+        teacher (BartForSequenceClassification): The fine-tuned teacher model.
+        encoder_layers (int): The number of encoder layers of the student.
+        decoder_layers (int): The number of decoder layers of the student.
+
+    Returns:
+        student (BartForSequenceClassification): The untrained student model.
+    """
+    config = copy.deepcopy(teacher.config)
+    config.encoder_layers = encoder_layers
+    config.decoder_layers = decoder_layers
+    student = BartForSequenceClassification(config)
+
+    # Map every student layer to the teacher layer it is copied from
+    layer_map = {}
+    for stack, kept in (("encoder", encoder_layers), ("decoder", decoder_layers)):
+        total = getattr(teacher.config, f"{stack}_layers")
+        for student_idx, teacher_idx in enumerate(_select_layers(total, kept)):
+            layer_map[f"model.{stack}.layers.{student_idx}."] = f"model.{stack}.layers.{teacher_idx}."
+
+    teacher_state = teacher.state_dict()
+    student_state = student.state_dict()
+    for name in student_state:
+        teacher_name = name
+        for student_prefix, teacher_prefix in layer_map.items():
+            if name.startswith(student_prefix):
+                teacher_name = teacher_prefix + name[len(student_prefix):]
+                break
+        student_state[name] = teacher_state[teacher_name].clone()
+
+    student.load_state_dict(student_state)
+    return student
+
+
+class DistillationTrainer(Trainer):
+    def __init__(self, *args, teacher=None, temperature=2.0, alpha=0.5, **kwargs):
+        """
+        Hugging Face Trainer whose loss mixes the teacher's soft labels with the
+        true labels.
+
+        Parameters:
+            teacher: The frozen teacher model.
+            temperature (float): Softens both distributions before comparing them.
+            alpha (float): The weight of the distillation loss; the cross-entropy
+                            on the true labels gets (1 - alpha).
+        """
+        super().__init__(*args, **kwargs)
+        self.teacher = teacher.eval()
+        self.temperature = temperature
+        self.alpha = alpha
+
+    def compute_loss(self, model, inputs, return_outputs=False, num_items_in_batch=None):
+        """
+        Computes the distillation loss for one batch.
+        """
+        outputs = model(**inputs)
+
+        if self.teacher.device != model.device:
+            self.teacher.to(model.device)
+
+        with torch.no_grad():
+            teacher_logits = self.teacher(
+                input_ids=inputs["input_ids"],
+                attention_mask=inputs["attention_mask"],
+            ).logits
+
+        temperature = self.temperature
+        distillation_loss = F.kl_div(
+            F.log_softmax(outputs.logits / temperature, dim=-1),
+            F.softmax(teacher_logits / temperature, dim=-1),
+            reduction="batchmean",
+        ) * temperature ** 2
+        loss = self.alpha * distillation_loss + (1 - self.alpha) * outputs.loss
+
+        return (loss, outputs) if return_outputs else loss
+
+
+class DistillationModelling(Modelling):
+    def __init__(
+        self,
+        train_data,
+        eval_data,
+        BART_tokenizer,
+        teacher_model,
+        student_model,
+        temperature=2.0,
+        alpha=0.5,
+        output_dir="student_model",
+    ):
+        """
+        Sets up Modelling for the student, replacing its Trainer with a
+        DistillationTrainer that learns from the teacher's logits.
+
+        Parameters:
+            train_data: Dataset used for training the student.
+            eval_data: Dataset used for evaluating the student.
+            BART_tokenizer: The tokenizer shared by the teacher and the student.
+            teacher_model: The fine-tuned case-bart model.
+            student_model: The student built by `build_student`.
+            temperature (float): The distillation temperature.
+            alpha (float): The weight of the distillation loss.
+            output_dir (str): Where training checkpoints are written.
+        """
+        super().__init__(train_data, eval_data, BART_tokenizer, student_model)
+        self.teacher_model = teacher_model
+        self.training_args.output_dir = output_dir
+
+        self.trainer = DistillationTrainer(
+            model=self.BART_model,
+            args=self.training_args,
+            train_dataset=self.train_data,
+            eval_dataset=self.eval_data,
+            tokenizer=self.BART_tokenizer,
+            compute_metrics=self.compute_metrics,
+            teacher=teacher_model,
+            temperature=temperature,
+            alpha=alpha,
+        )
+
+    def save_student(self, model_path):
+        """
+        Saves the trained student and its tokenizer in the format loaded by
+        TopicSegmentation.
+
+        Parameters:
+            model_path (str): The directory to save the student to.
+        """
+        self.trainer.save_model(model_path)
+        self.BART_tokenizer.save_pretrained(model_path)
+        print(f"Student model saved to '{model_path}'.")
+
+
+# Distillation command, run from the backend folder:
+#     python -m Custom_Modules.Distillation --csv csv_files/all_preprocessed_data.csv --output "Case Bart Student"
+if __name__ == "__main__":
+    import argparse
+
+    from transformers import BartTokenizer
+
+    from Custom_Modules.InferenceBackends import load_classifier
+
+    parser = argparse.ArgumentParser(description="Distill case-bart into a smaller classifier.")
+    parser.add_argument("--teacher", default="jijemini/case-bart")
+    parser.add_argument("--csv", nargs="+", required=True)
+    parser.add_argument("--encoder-layers", type=int, default=2)
+    parser.add_argument("--decoder-layers", type=int, default=1)
+    parser.add_argument("--temperature", type=float, default=2.0)
+    parser.add_argument("--alpha", type=float, default=0.5)
+    parser.add_argument("--output", required=True)
+    args = parser.parse_args()
+
+    tokenizer = BartTokenizer.from_pretrained(args.teacher)
+    teacher = load_classifier(args.teacher)
+    student = build_student(teacher, args.encoder_layers, args.decoder_layers)
+
+    train_data, eval_data = prepare_datasets(load_training_frame(args.csv), tokenizer)
+
+    modeller = DistillationModelling(
+        train_data,
+        eval_data,
+        tokenizer,
+        teacher,
+        student,
+        temperature=args.temperature,
+        alpha=args.alpha,
+        output_dir=args.output + "_checkpoints",
+    )
+    modeller.train_model()
+    modeller.save_student(args.output)
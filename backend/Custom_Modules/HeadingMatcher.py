@@ -0,0 +1,121 @@
+# =============================================================================
+# Program Title: Fast Section Heading Matcher
+# Programmer: Jewell Anne Diamante
+# Date Written: October 17, 2026
+# Date Revised: October 17, 2026
+#
+# Purpose:
+#     This program decides which paragraphs of a court case are section
+#     headings ('The Facts', 'The Issues', 'Our Ruling', ...). It gives exactly
+#     the same answers as comparing every paragraph with every heading using
+#     `fuzzywuzzy.fuzz.ratio`, but scores all paragraphs against all headings
+#     in a single C-accelerated call and skips paragraphs that are too long to
+#     ever reach the similarity threshold.
+#
+# Where the program fits in the general system design:
+#     TopicSegmentation uses the matcher to label heading paragraphs directly,
+#     before the remaining paragraphs are sent to the BART classifier.
+#
+# Data Structures, Algorithms, and Control:
+#     - Data Structures:
+#         - **List (`headings`)**: Every lowercased heading, grouped by label in
+#           priority order ('facts', then 'issues', then 'rulings').
+#         - **np.ndarray (`heading_labels`)**: The label index of each heading.
+#     - Algorithms:
+#         - **Length Prefilter**: The ratio of two strings of lengths a and b is
+#           at most 200 * min(a, b) / (a + b), so paragraphs whose length rules
+#           out every heading are never scored.
+#         - **Vectorized Scoring**: `rapidfuzz.process.cdist` scores the
+#           remaining paragraphs against all headings at once. Its ratio (based
+#           on the longest common subsequence) is never lower than fuzzywuzzy's,
+#           so it is used as a cutoff and only the surviving pairs are confirmed
+#           with `fuzzywuzzy.fuzz.ratio`, which keeps the original semantics,
+#           including its rounding.
+#     - Control:
+#         - `match` labels a list of paragraphs in one call; each paragraph
+#           gets the first label, in priority order, with a matching heading.
+# =============================================================================
+
+
+from typing import Dict, List, Optional
+
+import numpy as np
+from fuzzywuzzy import fuzz
+from rapidfuzz import fuzz as rapid_fuzz
+from rapidfuzz import process
+
+
+class HeadingMatcher:
+    def __init__(self, headings_by_label: Dict[str, List[str]], threshold: int = 75):
+        """
+        Description:
+            Precompiles the headings for matching.
+
+        Parameters:
+            headings_by_label (dict): Labels mapped to their headings, in the
+                                    priority order used to break ties.
+            threshold (int): The minimum `fuzz.ratio` for a heading match.
+        """
+        self.labels = list(headings_by_label)
+        self.threshold = threshold
+        self.headings = []
+        heading_labels = []
+        for label_idx, headings in enumerate(headings_by_label.values()):
+            for heading in headings:
+                self.headings.append(heading.lower())
+                heading_labels.append(label_idx)
+        self.heading_labels = np.array(heading_labels)
+
+        # fuzz.ratio rounds half to even, so anything scoring above this
+        # cutoff may still round up to the threshold
+        self.score_cutoff = threshold - 0.5
+
+        # Longest paragraph that can still reach the cutoff against some heading:
+        # 200 * h / (n + h) >= cutoff  <=>  n <= h * (200 / cutoff - 1)
+        longest_heading = max((len(heading) for heading in self.headings), default=0)
+        self.max_length = (
+            int(longest_heading * (200 / self.score_cutoff - 1))
+            if self.score_cutoff > 0 else None
+        )
+
+    def match(self, lines: List[str]) -> List[Optional[str]]:
+        """
+        Description:
+            Finds the heading label of each line, if any.
+
+        Parameters:
+            lines (list): The paragraphs (or paragraph keys) to check.
+
+        Returns:
+            list: For each line, the label of its first matching heading group,
+            or None if it matches no heading.
+        """
+        matches = [None] * len(lines)
+        candidates = [
+            idx for idx, line in enumerate(lines)
+            if self.max_length is None or len(line) <= self.max_length
+        ]
+        if not candidates or not self.headings:
+            return matches
+
+        candidate_lines = [lines[idx].lower() for idx in candidates]
+        scores = process.cdist(
+            candidate_lines,
+            self.headings,
+            scorer=rapid_fuzz.ratio,
+            score_cutoff=self.score_cutoff,
+        )
+
+        for row, col in zip(*np.nonzero(scores)):
+            line_idx = candidates[row]
+            label_idx = self.heading_labels[col]
+            current = matches[line_idx]
+
+            # A higher priority group already matched this line
+            if current is not None and self.labels.index(current) <= label_idx:
+                continue
+
+            if fuzz.ratio(candidate_lines[row], self.headings[col]) >= self.threshold:
+                matches[line_idx] = self.labels[label_idx]
+
+        return matches
@@ -0,0 +1,324 @@
+# =============================================================================
+# Program Title: Inference Backends for the Topic Segmentation Model
+# Programmer: Jewell Anne Diamante
+# Date Written: October 17, 2026
+# Date Revised: October 17, 2026
+#
+# Purpose:
+#     This program provides interchangeable inference backends for the
+#     fine-tuned BART paragraph classifier used by TopicSegmentation. The
+#     default backend runs the model in eager PyTorch, while the ONNX backend
+#     runs an exported copy of the model through ONNX Runtime with all graph
+#     optimizations enabled, which is considerably faster on CPU-only servers.
+#     A dynamically quantized (int8) PyTorch model is available as well.
+#     It also contains the command used to export the model to ONNX.
+#
+# Where the program fits in the general system design:
+#     TopicSegmentation tokenizes the paragraphs and hands the padded token ids
+#     to one of these backends, which only has to return the raw logits. The
+#     rest of the segmentation pipeline is the same for every backend.
+#
+# Data Structures, Algorithms, and Control:
+#     - Data Structures:
+#         - **np.ndarray (`input_ids`, `attention_mask`)**: Padded batches of
+#           token ids and attention masks, shaped (batch size, sequence length).
+#         - **np.ndarray (`logits`)**: Raw model outputs, shaped
+#           (batch size, number of labels).
+#     - Algorithms:
+#         - **Dynamic Quantization**: The "quantized" variant of the PyTorch
+#           backend stores the Linear layer weights as int8 and caches the
+#           quantized model on disk, keyed by the model fingerprint.
+#         - **ONNX Export**: Traces the classifier with dynamic batch and
+#           sequence axes so one exported graph serves every batch shape.
+#         - **Graph Optimization**: ONNX Runtime fuses and folds the exported
+#           graph (ORT_ENABLE_ALL) before running it.
+#     - Control:
+#         - `export_onnx` is run once, from the command line, to produce a
+#           self-contained model directory (ONNX graph, config and tokenizer).
+#         - TopicSegmentation picks a backend by name when it is constructed.
+# =============================================================================
+
+
+import argparse
+import hashlib
+import os
+import uuid
+
+import numpy as np
+import torch
+from transformers import BartForSequenceClassification, BartTokenizer
+
+
+ID2LABEL = {0: "rulings", 1: "facts", 2: "issues"}
+LABEL2ID = {"rulings": 0, "facts": 1, "issues": 2}
+ONNX_FILE_NAME = "model.onnx"
+
+
+def load_classifier(model_path: str) -> BartForSequenceClassification:
+    """
+    Description:
+        Loads the fine-tuned BART classifier in evaluation mode with the
+        label mapping used throughout the system.
+
+    Parameters:
+        model_path (str): The path or hub id of the fine-tuned model.
+
+    Returns:
+        BartForSequenceClassification: The loaded model.
+    """
+    model = BartForSequenceClassification.from_pretrained(
+        model_path,
+        id2label=ID2LABEL,
+        label2id=LABEL2ID,
+        problem_type="single_label_classification",
+        ignore_mismatched_sizes=True
+    )
+    model.eval()  # Set model to evaluation mode
+    return model
+
+
+def model_fingerprint(model_path: str) -> str:
+    """
+    Description:
+        Computes a fingerprint of a model, so artifacts derived from it can be
+        invalidated when it changes. A local directory or file is identified
+        by the names, sizes and modification times of its files. A hub id is
+        identified by the commit of its cached snapshot, or of the hub's
+        current revision if it is not cached, never by its name alone, since
+        a new upload keeps the same id. If the commit cannot be resolved, the
+        fingerprint is unique to this call, so nothing derived is reused.
+
+    Parameters:
+        model_path (str): The path or hub id of the model.
+
+    Returns:
+        fingerprint (str): A hexadecimal SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    if os.path.isfile(model_path):
+        stat = os.stat(model_path)
+        digest.update(f"{os.path.basename(model_path)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    if not os.path.isdir(model_path):
+        digest.update(f"{model_path}@{hub_commit(model_path)}".encode("utf-8"))
+        return digest.hexdigest()
+
+    for folder, _, files in sorted(os.walk(model_path)):
+        for name in sorted(files):
+            path = os.path.join(folder, name)
+            stat = os.stat(path)
+            relative_path = os.path.relpath(path, model_path)
+            digest.update(f"{relative_path}:{stat.st_size}:{stat.st_mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def hub_commit(model_id: str) -> str:
+    """
+    Description:
+        Resolves a hub model id to the commit its files come from: the cached
+        snapshot that `from_pretrained` loads, or else the hub's current
+        revision.
+
+    Parameters:
+        model_id (str): The hub id of the model.
+
+    Returns:
+        str: The commit sha, or a random value if it cannot be resolved.
+    """
+    try:
+        from huggingface_hub import model_info, snapshot_download
+    except ImportError:
+        return f"unresolved-{uuid.uuid4().hex}"
+
+    try:
+        # Snapshot folders are named after their commit
+        return os.path.basename(snapshot_download(model_id, local_files_only=True))
+    except Exception:
+        pass
+    try:
+        return model_info(model_id).sha
+    except Exception:
+        return f"unresolved-{uuid.uuid4().hex}"
+
+
+def load_quantized_classifier(model_path: str, cache_dir: str = "quantized_models") -> torch.nn.Module:
+    """
+    Description:
+        Loads the classifier with its Linear layers dynamically quantized to
+        int8. The quantized model is cached on disk under the fingerprint of
+        the model directory, so only the first startup pays for quantization.
+
+    Parameters:
+        model_path (str): The path or hub id of the fine-tuned model.
+        cache_dir (str): The directory holding the quantized artifacts.
+
+    Returns:
+        torch.nn.Module: The quantized classifier in evaluation mode.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    cache_path = os.path.join(
+        cache_dir, f"case-bart-int8-{model_fingerprint(model_path)[:16]}.pt"
+    )
+
+    if os.path.exists(cache_path):
+        model = torch.load(cache_path, weights_only=False)
+    else:
+        model = torch.ao.quantization.quantize_dynamic(
+            load_classifier(model_path), {torch.nn.Linear}, dtype=torch.qint8
+        )
+        torch.save(model, cache_path)
+        print(f"Quantized model cached at '{cache_path}'.")
+
+    model.eval()
+    return model
+
+
+class TorchBackend:
+    def __init__(self, model: BartForSequenceClassification):
+        """
+        Description:
+            Runs the classifier in eager PyTorch.
+
+        Parameters:
+            model (BartForSequenceClassification): The loaded classifier.
+        """
+        self.model = model
+
+    def predict_logits(self, input_ids: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        """
+        Description:
+            Performs inference on one padded batch.
+
+        Parameters:
+            input_ids (np.ndarray): Padded token ids.
+            attention_mask (np.ndarray): The matching attention mask.
+
+        Returns:
+            logits (np.ndarray): The raw logits of every label.
+        """
+        with torch.no_grad():
+            outputs = self.model(
+                input_ids=torch.from_numpy(input_ids),
+                attention_mask=torch.from_numpy(attention_mask),
+            )
+        return outputs.logits.numpy()
+
+
+class ONNXBackend:
+    def __init__(self, onnx_path: str, num_threads: int = 0):
+        """
+        Description:
+            Runs an exported classifier through ONNX Runtime on the CPU.
+
+        Parameters:
+            onnx_path (str): The path of the exported ONNX graph.
+            num_threads (int): Intra-op threads. 0 lets ONNX Runtime decide.
+        """
+        import onnxruntime as ort
+
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session_options.intra_op_num_threads = num_threads
+
+        self.session = ort.InferenceSession(
+            onnx_path, session_options, providers=["CPUExecutionProvider"]
+        )
+
+    def predict_logits(self, input_ids: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        """
+        Description:
+            Performs inference on one padded batch.
+
+        Parameters:
+            input_ids (np.ndarray): Padded token ids.
+            attention_mask (np.ndarray): The matching attention mask.
+
+        Returns:
+            logits (np.ndarray): The raw logits of every label.
+        """
+        return self.session.run(
+            ["logits"],
+            {
+                "input_ids": input_ids.astype(np.int64),
+                "attention_mask": attention_mask.astype(np.int64),
+            },
+        )[0]
+
+
+class _LogitsOnly(torch.nn.Module):
+    """
+    Wraps the classifier so the exported graph has a single `logits` output.
+    """
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask):
+        return self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+
+
+def export_onnx(model_path: str, output_dir: str, opset_version: int = 14) -> str:
+    """
+    Description:
+        Exports the fine-tuned classifier to ONNX. The config and tokenizer are
+        saved next to the graph so the output directory can be passed directly
+        as the `model_path` of TopicSegmentation with the "onnx" backend.
+
+    Parameters:
+        model_path (str): The path or hub id of the fine-tuned model.
+        output_dir (str): The directory to write the exported model to.
+        opset_version (int): The ONNX opset to export with.
+
+    Returns:
+        onnx_path (str): The path of the exported ONNX graph.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    onnx_path = os.path.join(output_dir, ONNX_FILE_NAME)
+
+    model = load_classifier(model_path)
+    tokenizer = BartTokenizer.from_pretrained(model_path)
+
+    # Trace with a padded batch so both axes are exported as dynamic
+    sample = tokenizer(
+        [
+            "The petitioner filed a complaint before the regional trial court.",
+            "The issue is whether the court of appeals erred.",
+        ],
+        return_tensors="pt",
+        max_length=128,
+        truncation=True,
+        padding=True,
+    )
+
+    torch.onnx.export(
+        _LogitsOnly(model),
+        (sample["input_ids"], sample["attention_mask"]),
+        onnx_path,
+        input_names=["input_ids", "attention_mask"],
+        output_names=["logits"],
+        dynamic_axes={
+            "input_ids": {0: "batch", 1: "sequence"},
+            "attention_mask": {0: "batch", 1: "sequence"},
+            "logits": {0: "batch"},
+        },
+        opset_version=opset_version,
+    )
+
+    model.config.save_pretrained(output_dir)
+    tokenizer.save_pretrained(output_dir)
+
+    print(f"ONNX model written to '{onnx_path}'.")
+    return onnx_path
+
+
+# Export command, run from the backend folder:
+#     python -m Custom_Modules.InferenceBackends --output-dir "Case Bart ONNX"
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the case-bart classifier to ONNX.")
+    parser.add_argument("--model-path", default="jijemini/case-bart")
+    parser.add_argument("--output-dir", required=True)
+    parser.add_argument("--opset", type=int, default=14)
+    args = parser.parse_args()
+
+    export_onnx(args.model_path, args.output_dir, opset_version=args.opset)
@@ -0,0 +1,255 @@
+# =============================================================================
+# Program Title: Dynamic Micro-batching Scheduler for Paragraph Classification
+# Programmer: Jewell Anne Diamante
+# Date Written: October 17, 2026
+# Date Revised: October 17, 2026
+#
+# Purpose:
+#     When several users summarize court cases at the same time, each request
+#     used to run its own forward passes, and the requests fought over the same
+#     CPU cores. This program puts a single scheduler in front of the
+#     classifier: paragraphs submitted by concurrent requests are collected for
+#     a short wait window and classified together in shared batches, and every
+#     request gets its own probabilities back through a future.
+#
+# Where the program fits in the general system design:
+#     The Flask application creates one scheduler for the whole process and
+#     passes it to TopicSegmentation.sequence_classification, which submits its
+#     non-heading paragraph keys instead of running the model itself.
+#
+# Data Structures, Algorithms, and Control:
+#     - Data Structures:
+#         - **queue.Queue (`_queue`)**: Pending requests, each holding the
+#           model, the paragraph keys and the future to resolve.
+#         - **List (`active`)**: The requests being classified, each with the
+#           position of its next key and the probabilities of its slices.
+#         - **concurrent.futures.Future**: Per-request result handle.
+#     - Algorithms:
+#         - **Micro-batching**: Requests are classified in slices. Every
+#           forward pass holds up to `max_batch_size` keys, shared equally
+#           between the active requests and topped up by those with keys left,
+#           so a long document does not hold back the documents submitted
+#           after it. When the keys waiting do not fill a pass, the worker
+#           waits up to `max_wait_ms` for more requests. A request's future is
+#           resolved with its slices reassembled in order.
+#     - Control:
+#         - A single daemon worker thread runs every forward pass, so inference
+#           never competes with itself for cores. Requests for different model
+#           instances (e.g. across a hot reload) are never mixed in one batch.
+# =============================================================================
+
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class _PendingRequest:
+    def __init__(self, segmentation, keys, future):
+        self.segmentation = segmentation
+        self.keys = keys
+        self.future = future
+        self.position = 0   # Index of the first key not yet classified
+        self.results = []   # Probabilities of the classified keys, slice by slice
+
+    def remaining(self) -> int:
+        return len(self.keys) - self.position
+
+
+class InferenceScheduler:
+    def __init__(self, max_batch_size: int = 16, max_wait_ms: float = 10):
+        """
+        Description:
+            Starts the scheduler's worker thread.
+
+        Parameters:
+            max_batch_size (int): The number of paragraphs per forward pass,
+                                shared between the requests being classified.
+            max_wait_ms (float): How long the worker waits for more requests
+                                after the first one arrives.
+        """
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+
+        self._queue = queue.Queue()
+        self._stats_lock = threading.Lock()
+
+        # Counters reported by the health endpoint
+        self.requests = 0
+        self.slices = 0
+        self.paragraphs = 0
+        self.runs = 0
+
+        self._worker = threading.Thread(target=self._run, name="inference-scheduler", daemon=True)
+        self._worker.start()
+
+    def submit(self, segmentation, keys: list) -> Future:
+        """
+        Description:
+            Queues paragraph keys for classification.
+
+        Parameters:
+            segmentation (TopicSegmentation): The model to classify the keys with.
+            keys (list): The paragraph keys to classify.
+
+        Returns:
+            Future: Resolves to the (len(keys), number of labels) probability
+            array, in the same order as `keys`.
+        """
+        future = Future()
+        if not keys:
+            future.set_result(segmentation.predict_probabilities([]))
+            return future
+
+        self._queue.put(_PendingRequest(segmentation, list(keys), future))
+        return future
+
+    def predict_probabilities(self, segmentation, keys: list) -> np.ndarray:
+        """
+        Description:
+            Classifies paragraph keys through the scheduler and waits for the
+            result.
+
+        Parameters:
+            segmentation (TopicSegmentation): The model to classify the keys with.
+            keys (list): The paragraph keys to classify.
+
+        Returns:
+            np.ndarray: The probabilities of every label for every key.
+        """
+        return self.submit(segmentation, keys).result()
+
+    def _admit(self, request, active: list):
+        """
+        Adds a request to the active requests, unless it was cancelled.
+        """
+        if request.future.set_running_or_notify_cancel():
+            active.append(request)
+
+    def _collect(self, active: list):
+        """
+        Adds the queued requests to the active ones, waiting for a first
+        request if there is none. If the keys left do not fill a forward pass,
+        more requests are awaited until the wait window closes.
+        """
+        while not active:
+            self._admit(self._queue.get(), active)
+
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            try:
+                self._admit(self._queue.get_nowait(), active)
+                continue
+            except queue.Empty:
+                pass
+
+            segmentation = active[0].segmentation
+            waiting = sum(
+                request.remaining() for request in active if request.segmentation is segmentation
+            )
+            remaining = deadline - time.monotonic()
+            if waiting >= self.max_batch_size or remaining <= 0:
+                return
+            try:
+                self._admit(self._queue.get(timeout=remaining), active)
+            except queue.Empty:
+                return
+
+    def _take_batch(self, active: list) -> list:
+        """
+        Fills one forward pass with slices of the active requests of the
+        oldest request's model. Every request first gets an equal share of the
+        batch, then the space left goes to the requests that still have keys.
+        """
+        segmentation = active[0].segmentation
+        requests = [request for request in active if request.segmentation is segmentation]
+        share = -(-self.max_batch_size // len(requests))
+
+        taken = {id(request): 0 for request in requests}
+        space = self.max_batch_size
+        for limit in (share, self.max_batch_size):
+            for request in requests:
+                count = min(limit - taken[id(request)], request.remaining() - taken[id(request)], space)
+                if count > 0:
+                    taken[id(request)] += count
+                    space -= count
+
+        return [
+            (request, request.position, request.position + taken[id(request)])
+            for request in requests if taken[id(request)] > 0
+        ]
+
+    def _run(self):
+        """
+        The worker loop: fills every forward pass with slices of the active
+        requests, and resolves a request once all its keys are classified.
+        """
+        active = []
+        while True:
+            self._collect(active)
+            batch = self._take_batch(active)
+            self._run_batch(batch)
+
+            # Finished and failed requests leave, the others wait for the next pass
+            active[:] = [request for request in active if not request.future.done()]
+
+            # The next pass starts with another request's model, so no model waits forever
+            if active:
+                active.append(active.pop(0))
+
+    def _run_batch(self, batch: list):
+        """
+        Classifies the slices of several requests in one call and hands every
+        request the probabilities of its slice.
+        """
+        keys = [key for request, start, end in batch for key in request.keys[start:end]]
+
+        try:
+            probabilities = batch[0][0].segmentation.predict_probabilities(
+                keys, batch_size=self.max_batch_size
+            )
+        except Exception as e:
+            for request, _, _ in batch:
+                request.future.set_exception(e)
+            return
+
+        offset = 0
+        finished = 0
+        for request, start, end in batch:
+            request.results.append(probabilities[offset:offset + end - start])
+            request.position = end
+            offset += end - start
+            if request.remaining() == 0:
+                request.future.set_result(np.concatenate(request.results))
+                finished += 1
+
+        with self._stats_lock:
+            self.requests += finished
+            self.slices += len(batch)
+            self.paragraphs += len(keys)
+            self.runs += 1
+
+    def stats(self) -> dict:
+        """
+        Description:
+            Reports how well concurrent requests are being coalesced.
+
+        Returns:
+            dict: The number of finished requests, paragraphs and model runs,
+            the mean paragraphs and requests per run, and the current queue
+            length.
+        """
+        with self._stats_lock:
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "requests": self.requests,
+                "paragraphs": self.paragraphs,
+                "runs": self.runs,
+                "paragraphs_per_run": self.paragraphs / self.runs if self.runs else 0.0,
+                "requests_per_run": self.slices / self.runs if self.runs else 0.0,
+                "queued": self._queue.qsize(),
+            }
@@ -2,7 +2,7 @@
 # Program Title: Latent Semantic Analysis (LSA)
 # Programmers: Jewell Anne Diamante
 # Date Written: September 10, 2024
-# Date Revised: October 11, 2024
+# Date Revised: October 17, 2026
 #
 # Purpose:
 #     This program processes legal texts by segmenting them into sections
@@ -26,17 +26,22 @@
 #     - Data Structures:
 #         - **text_dict**: A dictionary holding segmented text data for
 #           "facts," "issues," and "rulings".
-#         - **summary**: A dictionary that stores the top-ranked sentences
-#           for each section after processing.
+#         - **selection**: A dictionary that stores the indices of the
+#           top-ranked sentences for each section after processing. The
+#           summary text and the character offsets of the selected sentences
+#           in the case text are both derived from it.
 #     - Algorithms:
 #         - **TF-IDF Vectorization**: Transforms sentences into a
-#           term-sentence matrix for feature extraction.
+#           term-sentence matrix for feature extraction, with weights fitted
+#           on the case itself or taken from the corpus IDF model.
 #         - **Singular Value Decomposition (SVD)**: Reduces dimensionality
 #           of the term-sentence matrix, identifying the most relevant
-#           sentences.
+#           sentences. A seeded randomized solver is used, with a rank bounded
+#           by a fixed cap or by an explained-variance target.
 #         - **Sentence Ranking**: Sentences are ranked by relevance scores,
 #           with the top-ranked sentences selected for inclusion in the
-#           final summary.
+#           final summary. Scores, eligibility masks and the per-section
+#           quotas are computed as array operations over all sentences.
 #     - Control:
 #         - The program follows a linear execution flow:
 #           1. text preprocessing
@@ -54,10 +59,22 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.decomposition import TruncatedSVD
 
 
+# Rank of the first decomposition tried when searching for a variance target
+VARIANCE_SEARCH_START_RANK = 32
+
+
 
 class LSA:
     def __init__(
-        self, text_dict: dict, facts_pct=0.5, issues_pct=0.05, ruling_pct=0.45
+        self,
+        text_dict: dict,
+        facts_pct=0.5,
+        issues_pct=0.05,
+        ruling_pct=0.45,
+        max_rank=None,
+        variance_target=None,
+        random_state=42,
+        idf_model=None,
     ):
         """
         Description:
@@ -74,12 +91,24 @@ class LSA:
                     section of the summary.
         - ruling_pct: The percentage of sentences to include in the 'rulings' 
                     section of the summary.
+        - max_rank: The largest number of SVD components. None allows a
+                    full-rank decomposition.
+        - variance_target: If given, the smallest number of components whose
+                    explained variance ratio reaches this fraction is used.
+        - random_state: The seed of the randomized SVD solver.
+        - idf_model: An IDFModel of the whole corpus (see CorpusIDF.py). If
+                    given, sentences are only transformed with its vocabulary
+                    and weights instead of fitting a vectorizer on this case.
         """
         self.text_dict = text_dict
         self.facts_pct = facts_pct
         self.issues_pct = issues_pct
         self.ruling_pct = ruling_pct
         self.labels = ["facts", "issues", "rulings"]
+        self.max_rank = max_rank
+        self.variance_target = variance_target
+        self.random_state = random_state
+        self.idf_model = idf_model
 
     def preprocess_text(self):
         """
@@ -115,30 +144,93 @@ class LSA:
 
         Return:
         - term_matrix: The term-sentence matrix produced by the TF-IDF vectorizer.
-        - vectorizer: The fitted TF-IDF vectorizer.
+        - terms: The term of each column of the matrix.
         """
+        if self.idf_model is not None:
+            term_matrix = self.idf_model.transform(sentences)
+            # Terms of the corpus that are absent from this case add nothing to the SVD
+            columns = np.unique(term_matrix.indices)
+            if len(columns):
+                terms = self.idf_model.vectorizer.get_feature_names_out()[columns]
+                return term_matrix[:, columns], terms
+            # No corpus term occurs in this case, it is weighted on its own
+
         vectorizer = TfidfVectorizer(stop_words="english")
         term_matrix = vectorizer.fit_transform(sentences)
-        return term_matrix, vectorizer
+        return term_matrix, vectorizer.get_feature_names_out()
 
     def apply_svd(self, term_matrix, n_components=4):
         """
         Description:
         Apply Singular Value Decomposition (SVD) to reduce the dimensionality of 
-            the term-sentence matrix.
+            the term-sentence matrix. The rank is chosen by the rank policy: at
+            most `max_rank` components and, with a `variance_target`, only as many
+            as are needed to reach it. Without a policy the decomposition is full
+            rank. The sparse randomized solver is seeded, so summaries are
+            reproducible.
 
         Parameters:
         - term_matrix: The term-sentence matrix generated by TF-IDF vectorization.
-        - n_components: The number of components to reduce the matrix to using SVD.
+        - n_components: Unused; the rank comes from the rank policy.
 
         Return:
         - svd_matrix: The reduced matrix obtained after applying SVD.
         """
         # n_components = int(np.mean([term_matrix.shape[0], term_matrix.shape[1]]))
-        n_components = min(term_matrix.shape[0], term_matrix.shape[1])
-        svd = TruncatedSVD(n_components=n_components)
-        svd_matrix = svd.fit_transform(term_matrix)
-        return svd_matrix
+        full_rank = min(term_matrix.shape[0], term_matrix.shape[1])
+        rank_cap = full_rank if self.max_rank is None else max(1, min(self.max_rank, full_rank))
+
+        if self.variance_target is None:
+            return self._make_svd(rank_cap).fit_transform(term_matrix)
+
+        # Grow the rank until the variance target is reached or the cap is hit
+        n_components = min(VARIANCE_SEARCH_START_RANK, rank_cap)
+        while True:
+            svd = self._make_svd(n_components)
+            svd_matrix = svd.fit_transform(term_matrix)
+            explained = np.cumsum(svd.explained_variance_ratio_)
+            if explained[-1] >= self.variance_target or n_components == rank_cap:
+                break
+            n_components = min(n_components * 2, rank_cap)
+
+        rank = min(int(np.searchsorted(explained, self.variance_target)) + 1, n_components)
+        return svd_matrix[:, :rank]
+
+    def _make_svd(self, n_components):
+        """
+        Description:
+        Creates the seeded, randomized truncated SVD solver for a given rank.
+
+        Parameters:
+        - n_components: The number of components to compute.
+
+        Return:
+        - svd: The unfitted TruncatedSVD.
+        """
+        return TruncatedSVD(
+            n_components=n_components,
+            algorithm="randomized",
+            random_state=self.random_state,
+        )
+
+    def score_sentences(self, svd_matrix, probabilities, labels):
+        """
+        Description:
+        Compute the relevance score of every sentence: the sum of its row of the
+        SVD matrix, weighted by the classifier probability for issues.
+
+        Parameters:
+        - svd_matrix: The matrix from SVD containing sentence relevance scores.
+        - probabilities: The classifier probability of each sentence.
+        - labels: List of labels corresponding to each sentence.
+
+        Return:
+        - sentence_scores: An array with the score of each sentence.
+        """
+        sentence_scores = svd_matrix.sum(axis=1)
+        is_issue = np.array(labels, dtype=str) == "issues"
+        sentence_scores[is_issue] *= np.asarray(probabilities, dtype=float)[is_issue]
+        return sentence_scores
 
     def rank_sentences(self, svd_matrix, probabilities, labels):
         """
@@ -152,30 +244,51 @@ class LSA:
         - ranked_indices: A list of indices representing sentences ranked by 
                     relevance in descending order.
         """
-        sentence_scores = np.array([
-            np.sum(svd_matrix[i]) * probabilities[i] if labels[i] == "issues" else np.sum(svd_matrix[i])
-            for i in range(len(labels))
-        ])
+        sentence_scores = self.score_sentences(svd_matrix, probabilities, labels)
         ranked_indices = np.argsort(sentence_scores)[::-1]  # Sort sentences by score in descending order
         return ranked_indices
 
-    def select_top_sentences(self, ranked_indices, sentences, labels, svd_matrix, threshold=0.1):
+    def select_top_indices(self, ranked_indices, sentences, labels, svd_matrix):
         """
         Description:
-        Select the top sentences for each label (facts, issues, ruling) based on 
-            the ranking and percentage distribution.
+        Select the indices of the top sentences for each label (facts, issues,
+            ruling) based on the ranking and percentage distribution.
 
         Parameters:
         - ranked_indices: The ranked indices of sentences based on relevance scores.
         - sentences: List of original sentences.
         - labels: List of labels corresponding to each sentence.
+        - svd_matrix: The matrix from SVD containing sentence relevance scores.
 
         Return:
-        - summary: A dictionary containing selected top sentences categorized by 
-                    'facts', 'issues', and 'rulings'.
+        - selection: A dictionary with the indices of the selected sentences,
+                    in ranking order, for 'facts', 'issues', and 'rulings'.
+        """
+        return self.select_from_scores(ranked_indices, sentences, labels, svd_matrix.sum(axis=1))
+
+    def select_from_scores(self, ranked_indices, sentences, labels, row_sums, threshold=None):
+        """
+        Description:
+        Select the indices of the top sentences for each label from the row sums
+            of the SVD matrix, so a summary can be selected again, e.g. with
+            other percentages, without recomputing the SVD.
+
+        Parameters:
+        - ranked_indices: The ranked indices of sentences based on relevance scores.
+        - sentences: List of original sentences.
+        - labels: List of labels corresponding to each sentence.
+        - row_sums: The sum of each sentence's row of the SVD matrix.
+        - threshold: The smallest row sum of a selected fact or ruling. Defaults
+                    to the average row sum.
+
+        Return:
+        - selection: A dictionary with the indices of the selected sentences,
+                    in ranking order, for 'facts', 'issues', and 'rulings'.
         """
         # # Calculate the dynamic threshold as the average sum of SVD matrix rows
-        threshold = np.mean([np.sum(row) for row in svd_matrix])
+        row_sums = np.asarray(row_sums, dtype=float)
+        if threshold is None:
+            threshold = np.mean(row_sums)
         
         total_summary_sentences = int(
             len(sentences)
@@ -187,100 +300,294 @@ class LSA:
         issues_count = int(self.issues_pct * total_summary_sentences)
         ruling_count = int(self.ruling_pct * total_summary_sentences)
 
+        labels = np.array(labels, dtype=str)
+
         # Adjust issues_count to select all sentences if percentage is too small
         if issues_count == 0:
-            issues_count = sum(1 for label in labels if label == "issues")
+            issues_count = int(np.count_nonzero(labels == "issues"))
 
-        summary = {"facts": [], "issues": [], "rulings": []}
+        # Skip sentences without a period, and sentences with low scores
+        # unless they are issues
+        has_period = np.fromiter(("." in sentence for sentence in sentences), dtype=bool, count=len(sentences))
+        eligible = has_period & ((row_sums >= threshold) | (labels == "issues"))
 
-        # Select top sentences based on ranking while maintaining original order
-        for idx in ranked_indices:
-            sentence = sentences[idx]
-            label = labels[idx]
-            if "." not in sentence:
-                continue  # Skip sentences without a period
-            # Check if the sentence passes the threshold
-            if np.sum(svd_matrix[idx]) < threshold and not label == "issues":
-                continue  # Skip sentences with low scores
+        # Position of every sentence in the ranking
+        rank_positions = np.empty(len(ranked_indices), dtype=int)
+        rank_positions[ranked_indices] = np.arange(len(ranked_indices))
 
-            if label == "facts" and len(summary["facts"]) < facts_count:
-                summary["facts"].append(sentence)
-            elif label == "issues" and len(summary["issues"]) < issues_count:
-                summary["issues"].append(sentence)
-            elif label == "rulings" and len(summary["rulings"]) < ruling_count:
-                summary["rulings"].append(sentence)
+        # Select the best-ranked eligible sentences of each section, in ranking order
+        selection = {}
+        for label, count in (("facts", facts_count), ("issues", issues_count), ("rulings", ruling_count)):
+            candidates = np.flatnonzero(eligible & (labels == label))
+            if count < len(candidates):
+                candidates = candidates[np.argpartition(rank_positions[candidates], count)[:count]]
+            candidates = candidates[np.argsort(rank_positions[candidates])]
+            selection[label] = candidates
 
-        return summary
+        return selection
 
-    def create_summary(self):
+    def select_top_sentences(self, ranked_indices, sentences, labels, svd_matrix, threshold=0.1):
         """
         Description:
-        Create a summary based on LSA using sentence ranking, ensuring that the 
-            order is preserved from the original text.
+        Select the top sentences for each label (facts, issues, ruling) based on 
+            the ranking and percentage distribution.
+
+        Parameters:
+        - ranked_indices: The ranked indices of sentences based on relevance scores.
+        - sentences: List of original sentences.
+        - labels: List of labels corresponding to each sentence.
+
+        Return:
+        - summary: A dictionary containing selected top sentences categorized by 
+                    'facts', 'issues', and 'rulings'.
+        """
+        selection = self.select_top_indices(ranked_indices, sentences, labels, svd_matrix)
+        return {
+            label: [sentences[idx] for idx in indices]
+            for label, indices in selection.items()
+        }
+
+    def score_summary(self):
+        """
+        Description:
+        Run the LSA and score every sentence. This is the costly part of the
+            summarization (vectorization and SVD); the scores can be stored and
+            the summary selected from them again with `select_summary_indices`.
 
         Parameters: None
 
         Return:
-        - summary_output: A string containing the formatted summary with sections 
-                    for FACTS, ISSUES, and RULING.
+        - sentences: A list of all sentences.
+        - labels: A list of labels corresponding to each sentence.
+        - sentence_scores: An array with the score of each sentence.
+        - row_sums: An array with the sum of each sentence's row of the SVD
+                    matrix.
         """
         # Preprocess text
         sentences, labels, probabilities = self.preprocess_text()
 
         # Create term-sentence matrix
-        term_matrix, vectorizer = self.create_term_matrix(sentences)
+        term_matrix, _ = self.create_term_matrix(sentences)
 
         # Apply SVD to get relevance scores
         svd_matrix = self.apply_svd(term_matrix)
 
+        # Score sentences based on relevance
+        sentence_scores = self.score_sentences(svd_matrix, probabilities, labels)
+
+        return sentences, labels, sentence_scores, svd_matrix.sum(axis=1)
+
+    def select_summary_indices(self, sentences, labels, sentence_scores, row_sums, threshold=None):
+        """
+        Description:
+        Select the summary sentences of each section from the sentence scores,
+            with this instance's percentages.
+
+        Parameters:
+        - sentences: A list of all sentences.
+        - labels: A list of labels corresponding to each sentence.
+        - sentence_scores: The score of each sentence.
+        - row_sums: The sum of each sentence's row of the SVD matrix.
+        - threshold: The smallest row sum of a selected fact or ruling. Defaults
+                    to the average row sum.
+
+        Return:
+        - selection: A dictionary with the indices of the selected sentences of
+                    'facts', 'issues', and 'rulings', in their original order.
+        """
         # Rank sentences based on relevance scores
-        ranked_indices = self.rank_sentences(svd_matrix, probabilities, labels)
-
-        # Select top sentences for summary
-        summary = self.select_top_sentences(ranked_indices, sentences, labels, svd_matrix=svd_matrix)
-
-        # Construct the output in proper order for each section
-        summary_output = "FACTS:\n\n\n"
-        summary_output += (
-            " ".join(
-                [
-                    sentence
-                    for sentence in sentences
-                    if sentence in summary["facts"]
-                ]
-            )
-            + "\n\n"
-        )
-        summary_output += "ISSUES:\n\n\n"
-        summary_output += (
-            " ".join(
-                [
-                    sentence
-                    for sentence in sentences
-                    if sentence in summary["issues"]
-                ]
-            )
-            + "\n\n"
-        )
-        summary_output += "RULINGS:\n\n\n"
-        summary_output += " ".join(
-            [
-                sentence.replace("so ordered.", "").strip()
-                for sentence in sentences
-                if sentence in summary["rulings"] and sentence.lower() != "so ordered."]
+        ranked_indices = np.argsort(np.asarray(sentence_scores, dtype=float))[::-1]
+
+        # Select top sentences for summary, restoring the original order
+        selection = self.select_from_scores(ranked_indices, sentences, labels, row_sums, threshold)
+        selection = {label: np.sort(indices) for label, indices in selection.items()}
+
+        # A lone "so ordered." is left out of the rulings
+        selection["rulings"] = np.array(
+            [idx for idx in selection["rulings"] if sentences[idx].lower() != "so ordered."],
+            dtype=int,
         )
-        # Create a summary dictionary
-        summary_output = {
-        "facts": " ".join(sentence for sentence in sentences if sentence in summary["facts"]),
-        "issues": " ".join(sentence for sentence in sentences if sentence in summary["issues"]),
-        "rulings": " ".join(
-                sentence.replace("so ordered.", "").strip()
-                for sentence in sentences
-                if sentence in summary["rulings"] and sentence.lower() != "so ordered."
+
+        return selection
+
+    def select_summary(self):
+        """
+        Description:
+        Run the LSA and select the summary sentences of each section, by index.
+
+        Parameters: None
+
+        Return:
+        - sentences: A list of all sentences.
+        - selection: A dictionary with the indices of the selected sentences of
+                    'facts', 'issues', and 'rulings', in their original order.
+        - sentence_scores: An array with the score of each sentence.
+        """
+        sentences, labels, sentence_scores, row_sums = self.score_summary()
+        selection = self.select_summary_indices(sentences, labels, sentence_scores, row_sums)
+        return sentences, selection, sentence_scores
+
+    def summary_text(self, sentences, selection):
+        """
+        Description:
+        Join the selected sentences of each section into the summary text.
+
+        Parameters:
+        - sentences: A list of all sentences.
+        - selection: The indices of the selected sentences of each section.
+
+        Return:
+        - summary_output: A dictionary with the 'facts', 'issues', and 'rulings'
+                    summaries.
+        """
+        return {
+            "facts": " ".join(sentences[idx] for idx in selection["facts"]),
+            "issues": " ".join(sentences[idx] for idx in selection["issues"]),
+            "rulings": " ".join(
+                sentences[idx].replace("so ordered.", "").strip() for idx in selection["rulings"]
             ),
         }
 
-        return summary_output
+    def summary_spans(self, sentences, selection, sentence_scores, case_text):
+        """
+        Description:
+        Locate the selected sentences of each section in the case text.
+
+        Parameters:
+        - sentences: A list of all sentences.
+        - selection: The indices of the selected sentences of each section.
+        - sentence_scores: An array with the score of each sentence.
+        - case_text: The original text of the court case.
+
+        Return:
+        - summary_spans: A dictionary with a list of spans for 'facts',
+                    'issues', and 'rulings'. Every span has the paragraph's
+                    position in the case ("paragraph"), its character offsets
+                    in the case text ("start" and "end") and its LSA score.
+        """
+        offsets = paragraph_offsets(case_text)
+        summary_spans = {}
+        for label, indices in selection.items():
+            summary_spans[label] = []
+            for idx in indices:
+                if sentences[idx] not in offsets:
+                    continue  # Not a paragraph of this case text
+                paragraph, start, end = offsets[sentences[idx]]
+                summary_spans[label].append({
+                    "paragraph": paragraph,
+                    "start": start,
+                    "end": end,
+                    "score": float(sentence_scores[idx]),
+                })
+        return summary_spans
+
+    def create_summary(self):
+        """
+        Description:
+        Create a summary based on LSA using sentence ranking, ensuring that the 
+            order is preserved from the original text.
+
+        Parameters: None
+
+        Return:
+        - summary_output: A dictionary with the 'facts', 'issues', and 'rulings'
+                    summaries.
+        """
+        sentences, selection, _ = self.select_summary()
+        return self.summary_text(sentences, selection)
+
+    def create_summary_with_spans(self, case_text):
+        """
+        Description:
+        Create the summary together with the location of every selected
+            sentence in the case text.
+
+        Parameters:
+        - case_text: The original text of the court case.
+
+        Return:
+        - summary_output: A dictionary with the 'facts', 'issues', and 'rulings'
+                    summaries.
+        - summary_spans: The spans of the selected sentences of each section.
+        """
+        sentences, selection, sentence_scores = self.select_summary()
+        return (
+            self.summary_text(sentences, selection),
+            self.summary_spans(sentences, selection, sentence_scores, case_text),
+        )
+
+
+def paragraph_offsets(case_text: str) -> dict:
+    """
+    Description:
+    Locate every paragraph of a case text, split the same way as
+    `preprocess.segment_paragraph` (non-empty lines, stripped). A paragraph
+    that appears more than once is located at its first occurrence.
+
+    Parameters:
+    - case_text: The original text of the court case.
+
+    Return:
+    - offsets: Each paragraph mapped to its position among the paragraphs and
+                its start and end character offsets in the case text.
+    """
+    offsets = {}
+    position = 0
+    line_start = 0
+    for line in case_text.split("\n"):
+        paragraph = line.strip()
+        if paragraph:
+            start = line_start + len(line) - len(line.lstrip())
+            offsets.setdefault(paragraph, (position, start, start + len(paragraph)))
+            position += 1
+        line_start += len(line) + 1
+    return offsets
+
+
+def summarize_segments(segmentation_output: dict, **lsa_kwargs) -> dict:
+    """
+    Description:
+    Summarizes one segmented document. A module-level function, so documents
+    can be summarized in worker processes.
+
+    Parameters:
+    - segmentation_output: The 'facts', 'issues' and 'rulings' lists of
+                (sentence, probability) tuples from `label_mapping`.
+    - lsa_kwargs: Extra keyword arguments of LSA, e.g. the rank policy.
+
+    Return:
+    - summary_output: The summary of each section.
+    """
+    return LSA(segmentation_output, **lsa_kwargs).create_summary()
+
+
+def summarize_segments_with_spans(segmentation_output: dict, case_text: str, **lsa_kwargs) -> dict:
+    """
+    Description:
+    Summarizes one segmented document and locates the summary in its case
+    text. A module-level function, so documents can be summarized in worker
+    processes.
+
+    Parameters:
+    - segmentation_output: The 'facts', 'issues' and 'rulings' lists of
+                (sentence, probability) tuples from `label_mapping`.
+    - case_text: The original text of the court case.
+    - lsa_kwargs: Extra keyword arguments of LSA, e.g. the rank policy.
+
+    Return:
+    - dict: The summary of each section ("summary"), the spans of its
+                sentences in the case text ("spans") and the sentences,
+                sentence scores and SVD row sums from `score_summary`
+                ("scores"), so the summary can be selected again later.
+    """
+    lsa = LSA(segmentation_output, **lsa_kwargs)
+    sentences, labels, sentence_scores, row_sums = lsa.score_summary()
+    selection = lsa.select_summary_indices(sentences, labels, sentence_scores, row_sums)
+    return {
+        "summary": lsa.summary_text(sentences, selection),
+        "spans": lsa.summary_spans(sentences, selection, sentence_scores, case_text),
+        "scores": (sentences, sentence_scores, row_sums),
+    }
 
 
 # Usage Example
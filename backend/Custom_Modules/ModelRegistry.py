@@ -0,0 +1,198 @@
+# =============================================================================
+# Program Title: Process-wide Model Registry for the Topic Segmentation Model
+# Programmer: Jewell Anne Diamante
+# Date Written: October 17, 2026
+# Date Revised: October 17, 2026
+#
+# Purpose:
+#     This program keeps a single, ready-to-use instance of the fine-tuned BART
+#     topic segmentation model for the whole server process. The model and its
+#     tokenizer are loaded once, warmed up with a dummy forward pass, and then
+#     lent to every request handler, instead of being rebuilt for each summary.
+#     A new model directory can be hot-swapped in with an explicit reload while
+#     the previous model keeps serving requests.
+#
+# Where the program fits in the general system design:
+#     The registry sits between the Flask application (app.py) and the
+#     TopicSegmentation module. Handlers borrow the current model from the
+#     registry, and the health endpoint reports the registry's readiness.
+#
+# Data Structures, Algorithms, and Control:
+#     - Data Structures:
+#         - **TopicSegmentation (`_segmentation`)**: The currently served model.
+#         - **threading.Event (`_ready`)**: Set once the first model is loaded.
+#         - **threading.Lock (`_lock`, `_load_lock`)**: `_lock` guards swapping
+#           the served model, `_load_lock` serializes (re)loads.
+#     - Algorithms:
+#         - **Load and Swap**: A new model is fully loaded and warmed up before
+#           it replaces the served one, so handlers never see a half-loaded model.
+#     - Control:
+#         - `load_async` starts the initial load on a background thread at
+#           startup, `get` waits until a model is ready, and `reload` swaps in
+#           a new model directory on demand.
+# =============================================================================
+
+
+import threading
+import time
+
+from Custom_Modules.TopicSegmentation import TopicSegmentation
+
+
+class ModelRegistry:
+    def __init__(self, model_path: str = "jijemini/case-bart", **segmentation_kwargs):
+        """
+        Description:
+            Initialize the registry without loading the model yet.
+
+        Parameters:
+            model_path (str): The path or hub id of the fine-tuned model.
+            segmentation_kwargs: Extra keyword arguments passed to
+                                TopicSegmentation when the model is loaded.
+        """
+        self.model_path = model_path
+        self.segmentation_kwargs = segmentation_kwargs
+
+        self._segmentation = None
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._settled = threading.Event()   # Set once a load has succeeded or failed
+
+        # Status information reported by the health endpoint
+        self.is_loading = False
+        self.generation = 0
+        self.loaded_at = None
+        self.load_seconds = None
+        self.last_error = None
+
+    def load(self, model_path: str = None) -> TopicSegmentation:
+        """
+        Description:
+            Loads and warms up a model, then makes it the served model. The
+            previously served model stays in use until the new one is ready.
+
+        Parameters:
+            model_path (str): The model to load. Defaults to the current path.
+
+        Returns:
+            TopicSegmentation: The newly served model.
+        """
+        with self._load_lock:
+            path = model_path or self.model_path
+            self.is_loading = True
+            start = time.perf_counter()
+
+            # Without a served model, requests wait for this load instead of
+            # failing with the previous load's error
+            if not self._ready.is_set():
+                self._settled.clear()
+
+            try:
+                segmentation = TopicSegmentation(path, **self.segmentation_kwargs)
+                segmentation.warm_up()
+            except Exception as e:
+                self.last_error = str(e)
+                self._settled.set()
+                raise
+            finally:
+                self.is_loading = False
+
+            with self._lock:
+                self._segmentation = segmentation
+                self.model_path = path
+                self.generation += 1
+                self.loaded_at = time.time()
+                self.load_seconds = time.perf_counter() - start
+                self.last_error = None
+
+            self._ready.set()
+            self._settled.set()
+            print(f"Model '{path}' loaded in {self.load_seconds:.2f}s")
+
+        return segmentation
+
+    def load_async(self) -> threading.Thread:
+        """
+        Description:
+            Starts the initial model load on a background thread so the server
+            can answer health checks while the model is loading.
+
+        Returns:
+            threading.Thread: The thread performing the load.
+        """
+        def _load():
+            try:
+                self.load()
+            except Exception as e:
+                print("Error loading model:", e)
+
+        thread = threading.Thread(target=_load, name="model-registry-load", daemon=True)
+        thread.start()
+        return thread
+
+    def reload(self, model_path: str = None) -> TopicSegmentation:
+        """
+        Description:
+            Explicitly hot-reloads the model, e.g. after a new model directory
+            has been dropped in.
+
+        Parameters:
+            model_path (str): The new model directory. Defaults to reloading the
+                            current path.
+
+        Returns:
+            TopicSegmentation: The newly served model.
+        """
+        return self.load(model_path)
+
+    def get(self, timeout: float = None) -> TopicSegmentation:
+        """
+        Description:
+            Borrows the currently served model, waiting for the initial load
+            if it has not finished yet. If the load failed, it raises at once
+            instead of waiting for the timeout.
+
+        Parameters:
+            timeout (float): Seconds to wait for the model. None waits forever.
+
+        Returns:
+            TopicSegmentation: The ready model.
+
+        Raises:
+            RuntimeError: If no model is ready within the timeout, or the
+                        model failed to load.
+        """
+        if not self._settled.wait(timeout):
+            raise RuntimeError("Segmentation model is not ready")
+        if not self._ready.is_set():
+            raise RuntimeError(f"Segmentation model failed to load: {self.last_error}")
+
+        with self._lock:
+            return self._segmentation
+
+    def is_ready(self) -> bool:
+        """
+        Returns whether a model is loaded and ready to serve.
+        """
+        return self._ready.is_set()
+
+    def status(self) -> dict:
+        """
+        Description:
+            Summarizes the registry state for the health endpoint.
+
+        Returns:
+            dict: Readiness, loading flag, model path, generation, load time
+                and the last load error, if any.
+        """
+        with self._lock:
+            return {
+                "ready": self.is_ready(),
+                "loading": self.is_loading,
+                "model_path": self.model_path,
+                "generation": self.generation,
+                "loaded_at": self.loaded_at,
+                "load_seconds": self.load_seconds,
+                "last_error": self.last_error,
+            }
@@ -0,0 +1,111 @@
+# =============================================================================
+# Program Title: Entity Tags and Compression of JSON Responses
+# Programmer: Jewell Anne Diamante
+# Date Written: October 17, 2026
+# Date Revised: October 17, 2026
+#
+# Purpose:
+#     Court cases are reopened many times a day, and every time the whole case
+#     text was serialized and sent again, uncompressed. This program provides
+#     the two pieces the read endpoints use to avoid that: entity tags (ETags)
+#     computed from change counters, so an unchanged response can be answered
+#     with 304 Not Modified before any text column is read, and gzip or brotli
+#     compression of the responses that are sent.
+#
+# Where the program fits in the general system design:
+#     The application computes the ETag of a response from the ids and
+#     change counter values of the files it contains, negotiates a content
+#     coding from the request's Accept-Encoding header and compresses the
+#     serialized JSON with `compress`. The compression benchmark uses the same
+#     functions.
+#
+# Data Structures, Algorithms, and Control:
+#     - Data Structures:
+#         - **Tuple (`parts`)**: Everything a response depends on (endpoint,
+#           fields, and the id and change counter value of every file).
+#     - Algorithms:
+#         - **SHA-256**: The ETag is a hash of the parts, so it changes
+#           whenever a file is updated, added or deleted.
+#         - **gzip / brotli**: gzip from the standard library; brotli only if
+#           the `brotli` package is installed.
+#     - Control:
+#         - Each content coding gets its own strong ETag (the hash with the
+#           coding appended), since the bytes differ.
+# =============================================================================
+
+
+import gzip
+import hashlib
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+
+def available_encodings() -> list:
+    """
+    Description:
+        Lists the content codings that can be produced, in order of
+        preference.
+
+    Returns:
+        list: "br" (if brotli is installed) and "gzip".
+    """
+    return (["br"] if brotli is not None else []) + ["gzip"]
+
+
+def entity_tag(*parts) -> str:
+    """
+    Description:
+        Computes the opaque value of a strong ETag from everything a response
+        depends on.
+
+    Parameters:
+        parts: The values the response depends on, e.g. the endpoint, the
+            requested fields and the (id, change counter value) of every
+            file.
+
+    Returns:
+        str: The hash of the parts, without quotes.
+    """
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()[:32]
+
+
+def representation_tag(tag: str, encoding: str = None) -> str:
+    """
+    Description:
+        Returns the ETag of one encoding of a response. Compressed responses
+        have different bytes, so they get a different strong ETag.
+
+    Parameters:
+        tag (str): The value from `entity_tag`.
+        encoding (str): The content coding, or None if not compressed.
+
+    Returns:
+        str: The ETag value, without quotes.
+    """
+    return f"{tag}-{encoding}" if encoding else tag
+
+
+def compress(body: bytes, encoding: str, level: int = 6) -> bytes:
+    """
+    Description:
+        Compresses a response body.
+
+    Parameters:
+        body (bytes): The serialized response.
+        encoding (str): "gzip" or "br".
+        level (int): The gzip level (1-9). Brotli uses its quality scale
+                    (0-11) and gets the same value, capped at 11.
+
+    Returns:
+        bytes: The compressed body.
+    """
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    if encoding == "br":
+        if brotli is None:
+            raise ValueError("brotli is not installed")
+        return brotli.compress(body, quality=min(level, 11))
+    raise ValueError(f"Unsupported content coding: {encoding}")
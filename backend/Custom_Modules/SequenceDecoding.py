@@ -0,0 +1,155 @@
+# =============================================================================
+# Program Title: Vectorized Label Decoding for Topic Segmentation
+# Programmer: Jewell Anne Diamante
+# Date Written: October 17, 2026
+# Date Revised: October 17, 2026
+#
+# Purpose:
+#     Once the classifier has produced the label probabilities of every
+#     paragraph of a case, this program turns the whole probability matrix into
+#     paragraph labels in one pass. Two decoders are provided: the original
+#     rule (keep the previous paragraph's label when the classifier is not
+#     confident enough), and a Viterbi smoother that finds the most likely
+#     label sequence under a prior on label transitions.
+#
+# Where the program fits in the general system design:
+#     TopicSegmentation classifies all paragraphs first and then calls one of
+#     these decoders, so decoding no longer forces paragraph-by-paragraph
+#     processing between forward passes.
+#
+# Data Structures, Algorithms, and Control:
+#     - Data Structures:
+#         - **np.ndarray (`probabilities`)**: The (paragraphs, labels)
+#           probability matrix, in document order.
+#         - **np.ndarray (`heading_ids`)**: The label id of every paragraph
+#           that is a section heading, and -1 for the others.
+#     - Algorithms:
+#         - **Threshold Decoding**: Confident paragraphs and headings keep
+#           their own label; every other paragraph takes the label of the
+#           closest confident paragraph before it. The forward fill is a
+#           running maximum over paragraph positions.
+#         - **Viterbi Decoding**: Dynamic programming over log probabilities
+#           with a label transition matrix. Headings are clamped to their
+#           label.
+#     - Control:
+#         - Both decoders return the label id and the reported probability of
+#           every paragraph.
+# =============================================================================
+
+
+import numpy as np
+
+
+def threshold_decode(
+    probabilities: np.ndarray,
+    heading_ids: np.ndarray,
+    threshold: float = 0.0,
+    initial_label_id: int = 0,
+) -> tuple:
+    """
+    Description:
+        Labels every paragraph with its most probable label, unless that
+        probability is below the threshold, in which case the paragraph keeps
+        the label of the paragraph before it. This is the original
+        `previous_label` rule of TopicSegmentation, without the loop.
+
+    Parameters:
+        probabilities (np.ndarray): The (paragraphs, labels) probabilities.
+        heading_ids (np.ndarray): The heading label id of each paragraph, or -1.
+        threshold (float): The minimum probability for a label to be used.
+        initial_label_id (int): The label assumed before the first paragraph.
+
+    Returns:
+        tuple: The label id and the top probability of every paragraph.
+    """
+    label_ids = probabilities.argmax(axis=1)
+    max_probabilities = probabilities.max(axis=1)
+
+    is_heading = heading_ids >= 0
+    label_ids = np.where(is_heading, heading_ids, label_ids)
+    confident = is_heading | (max_probabilities >= threshold)
+
+    # Position of the closest confident paragraph at or before each paragraph
+    positions = np.where(confident, np.arange(len(label_ids)), -1)
+    source = np.maximum.accumulate(positions) if len(positions) else positions
+
+    decoded = np.where(source >= 0, label_ids[np.maximum(source, 0)], initial_label_id)
+    return decoded, max_probabilities
+
+
+def transition_matrix(num_labels: int = 3, stay_probability: float = 0.9) -> np.ndarray:
+    """
+    Description:
+        Builds a label transition prior where a paragraph keeps the label of
+        the paragraph before it with `stay_probability`, and switches to any
+        other label with equal probability.
+
+    Parameters:
+        num_labels (int): The number of labels.
+        stay_probability (float): The probability of keeping the same label.
+
+    Returns:
+        np.ndarray: The (labels, labels) matrix of transition probabilities.
+    """
+    switch_probability = (1 - stay_probability) / (num_labels - 1)
+    matrix = np.full((num_labels, num_labels), switch_probability)
+    np.fill_diagonal(matrix, stay_probability)
+    return matrix
+
+
+def viterbi_decode(
+    probabilities: np.ndarray,
+    heading_ids: np.ndarray,
+    transitions: np.ndarray = None,
+    initial_probabilities: np.ndarray = None,
+) -> tuple:
+    """
+    Description:
+        Finds the most likely label sequence, treating the classifier
+        probabilities as emissions and `transitions` as the prior on how
+        labels follow each other. Section headings are fixed to their label.
+
+    Parameters:
+        probabilities (np.ndarray): The (paragraphs, labels) probabilities.
+        heading_ids (np.ndarray): The heading label id of each paragraph, or -1.
+        transitions (np.ndarray): The (labels, labels) transition matrix.
+                                Defaults to `transition_matrix()`.
+        initial_probabilities (np.ndarray): The prior of the first label.
+                                Defaults to uniform.
+
+    Returns:
+        tuple: The label id of every paragraph and the classifier's
+        probability of that label.
+    """
+    num_paragraphs, num_labels = probabilities.shape
+    if num_paragraphs == 0:
+        return np.zeros(0, dtype=int), np.zeros(0)
+
+    if transitions is None:
+        transitions = transition_matrix(num_labels)
+    if initial_probabilities is None:
+        initial_probabilities = np.full(num_labels, 1 / num_labels)
+
+    with np.errstate(divide="ignore"):
+        log_emissions = np.log(probabilities)
+        log_transitions = np.log(transitions)
+        log_initial = np.log(initial_probabilities)
+
+    # Headings can only take their own label
+    heading_rows = np.flatnonzero(heading_ids >= 0)
+    log_emissions[heading_rows] = -np.inf
+    log_emissions[heading_rows, heading_ids[heading_rows]] = 0.0
+
+    scores = log_initial + log_emissions[0]
+    backpointers = np.zeros((num_paragraphs, num_labels), dtype=int)
+    for idx in range(1, num_paragraphs):
+        candidates = scores[:, None] + log_transitions
+        backpointers[idx] = candidates.argmax(axis=0)
+        scores = candidates.max(axis=0) + log_emissions[idx]
+
+    decoded = np.zeros(num_paragraphs, dtype=int)
+    decoded[-1] = scores.argmax()
+    for idx in range(num_paragraphs - 1, 0, -1):
+        decoded[idx - 1] = backpointers[idx, decoded[idx]]
+
+    return decoded, probabilities[np.arange(num_paragraphs), decoded]
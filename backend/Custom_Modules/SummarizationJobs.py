@@ -0,0 +1,239 @@
+# =============================================================================
+# Program Title: Asynchronous Summarization Jobs
+# Programmer: Jewell Anne Diamante
+# Date Written: October 17, 2026
+# Date Revised: October 17, 2026
+#
+# Purpose:
+#     Summarizing a long court case (cleaning, segmentation, BART inference and
+#     LSA) can take far longer than an HTTP request should stay open. This
+#     program runs summarizations as background jobs on a small worker pool.
+#     Every job records its status, the stage it is in and how many paragraphs
+#     have been classified so far, so clients can follow it and fetch the
+#     result when it is done. Every change is also appended to the job's event
+#     log, which clients can stream as it grows.
+#
+# Where the program fits in the general system design:
+#     The Flask application submits a job when a summary is requested and
+#     returns the job's id right away; the job's state is then read by the
+#     job status endpoint, and its events are streamed by the Server-Sent
+#     Events endpoint. The summarization itself is the same function used
+#     by the synchronous `/get-summarized` endpoint.
+#
+# Data Structures, Algorithms, and Control:
+#     - Data Structures:
+#         - **SummarizationJob**: The id, file id, status, stage, progress
+#           counters, result and error of one job.
+#         - **List (`events`)**: The job's stage changes, labeled paragraphs
+#           and final outcome, numbered in order.
+#         - **Dictionary (`jobs`)**: Every known job, by id.
+#     - Algorithms:
+#         - **Deduplication**: A second request for a file whose job is still
+#           queued or running gets the existing job instead of a new one.
+#         - **Pruning**: Only the most recent `max_finished_jobs` finished jobs
+#           are kept in memory.
+#     - Control:
+#         - Jobs run on a ThreadPoolExecutor. The job function reports its
+#           stage and progress through `SummarizationJob.update`.
+#         - Readers of the event log block in `wait_for_events` until new
+#           events arrive, the job finishes or the timeout passes.
+# =============================================================================
+
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Stages a job goes through, in order
+STAGES = ["queued", "preprocessing", "segmenting", "summarizing", "saving", "done"]
+
+
+class SummarizationJob:
+    def __init__(self, file_id: int):
+        """
+        Description:
+            Creates a queued job for one court case file.
+
+        Parameters:
+            file_id (int): The id of the file to summarize.
+        """
+        self.id = uuid.uuid4().hex
+        self.file_id = file_id
+        self.status = "queued"  # "queued", "running", "completed" or "failed"
+        self.stage = "queued"
+        self.processed = 0
+        self.total = 0
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.events = []
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    def update(self, event: dict = None, **fields):
+        """
+        Description:
+            Records the job's current stage, paragraph progress or outcome, and
+            publishes the change to the job's event log.
+
+        Parameters:
+            event (dict): An event to publish with the update. It must have a
+                        "type" (e.g. "paragraph", "completed" or "failed").
+            fields: New values for any of the job's attributes, e.g. `stage`
+                    (one of STAGES), `processed` (paragraphs classified so far)
+                    and `total` (paragraphs of the case).
+        """
+        with self._changed:
+            stage_changed = "stage" in fields and fields["stage"] != self.stage
+            for name, value in fields.items():
+                setattr(self, name, value)
+
+            if stage_changed:
+                self._publish({"type": "stage", "stage": self.stage})
+            if event is not None:
+                self._publish(event)
+
+    def _publish(self, event: dict):
+        """
+        Appends a numbered event to the log and wakes every waiting reader.
+        Must be called with the job's lock held.
+        """
+        self.events.append({"id": len(self.events), **event})
+        self._changed.notify_all()
+
+    def wait_for_events(self, start: int, timeout: float = None) -> tuple:
+        """
+        Description:
+            Waits until the job's event log grows past `start` or the job
+            finishes.
+
+        Parameters:
+            start (int): The number of events the reader has already seen.
+            timeout (float): The longest time to wait, in seconds.
+
+        Returns:
+            tuple: The new events (possibly none, if the timeout passed) and
+            whether the job has finished.
+        """
+        with self._changed:
+            if len(self.events) <= start and self.is_active():
+                self._changed.wait(timeout)
+            return self.events[start:], not self.is_active()
+
+    def is_active(self) -> bool:
+        """
+        Returns whether the job is still queued or running.
+        """
+        return self.status in ("queued", "running")
+
+    def to_json(self) -> dict:
+        """
+        Description:
+            Serializes the job for the job status endpoint.
+
+        Returns:
+            dict: The job's state, including the result once it is completed.
+        """
+        with self._lock:
+            return {
+                "id": self.id,
+                "file_id": self.file_id,
+                "status": self.status,
+                "stage": self.stage,
+                "processed": self.processed,
+                "total": self.total,
+                "result": self.result,
+                "error": self.error,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+            }
+
+
+class JobManager:
+    def __init__(self, job_function, max_workers: int = 2, max_finished_jobs: int = 200):
+        """
+        Description:
+            Sets up the worker pool that runs summarization jobs.
+
+        Parameters:
+            job_function: Called as `job_function(file_id, job)` to run a job.
+                        It returns the job's result and reports progress with
+                        `job.update`.
+            max_workers (int): The number of jobs run at the same time.
+            max_finished_jobs (int): How many finished jobs are kept.
+        """
+        self.job_function = job_function
+        self.max_finished_jobs = max_finished_jobs
+        self.jobs = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="summarize-job")
+
+    def submit(self, file_id: int) -> SummarizationJob:
+        """
+        Description:
+            Queues a summarization job for a file, or returns the file's job
+            that is still queued or running.
+
+        Parameters:
+            file_id (int): The id of the file to summarize.
+
+        Returns:
+            SummarizationJob: The queued or active job.
+        """
+        with self._lock:
+            for job in self.jobs.values():
+                if job.file_id == file_id and job.is_active():
+                    return job
+
+            job = SummarizationJob(file_id)
+            self.jobs[job.id] = job
+            self._prune()
+
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> SummarizationJob:
+        """
+        Returns the job with the given id, or None if it is unknown.
+        """
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def _run(self, job: SummarizationJob):
+        """
+        Runs one job on a worker thread and records its outcome.
+        """
+        job.update(status="running", started_at=time.time())
+
+        try:
+            result = self.job_function(job.file_id, job)
+        except Exception as e:
+            print("Error during summarization job:", e)
+            job.update(
+                status="failed",
+                error=str(e),
+                finished_at=time.time(),
+                event={"type": "failed", "error": str(e)},
+            )
+        else:
+            job.update(
+                status="completed",
+                stage="done",
+                result=result,
+                finished_at=time.time(),
+                event={"type": "completed", "result": result},
+            )
+
+    def _prune(self):
+        """
+        Drops the oldest finished jobs beyond `max_finished_jobs`.
+        """
+        finished = [job for job in self.jobs.values() if not job.is_active()]
+        finished.sort(key=lambda job: job.finished_at or 0)
+        for job in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self.jobs[job.id]
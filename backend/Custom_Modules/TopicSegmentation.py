@@ -2,7 +2,7 @@
 # Program Title: Topic Segmentation Using Fine-tuned BART Model
 # Programmer: Jewell Anne Diamante
 # Date Written: October 9, 2024
-# Date Revised: October 14, 2024
+# Date Revised: October 17, 2026
 #
 # Purpose:
 #     This program leverages a fine-tuned BART (Bidirectional and Auto-Regressive
@@ -33,17 +33,41 @@
 #           to those categories.
 #     - Algorithms:
 #         - **Sequence Classification**: The `sequence_classification` method tokenizes
-#           input paragraphs, performs inference with the fine-tuned BART model, and
+#           input paragraphs, performs batched inference with the fine-tuned BART model
+#           (keys sorted by token length and dynamically padded per batch), and
 #           assigns labels ('facts', 'issues', 'rulings') to each paragraph based on
 #           predicted probabilities. The class also tracks the previous label to avoid
 #           shifting classification when the model's confidence is below a specified
 #           threshold.
+#         - **Label Decoding**: The probabilities of all paragraphs are decoded
+#           into labels in vectorized passes, either with the previous-label
+#           threshold rule or with a Viterbi smoother (see SequenceDecoding.py).
 #         - **Label Mapping and Segmentation**: The `label_mapping` function organizes
 #           paragraphs into their respective categories ('facts', 'issues', 'rulings')
 #           based on predicted labels.
 #         - **Writing Output**: The `write_output_segments` function sorts the paragraphs
 #           into categories and writes the segmented output into a text file for easy
 #           viewing and further processing.
+#         - **Heading Matching**: Paragraphs similar to a known section heading are
+#           labeled directly; all paragraphs are scored against all headings in
+#           one vectorized call (see HeadingMatcher.py).
+#         - **Tokenization**: Keys are batch-encoded after long keys are cut at
+#           a word boundary, since only their first 128 tokens are kept. Token
+#           ids are kept in an LRU cache, so rerunning a document does not
+#           tokenize it again. The fast (Rust) tokenizer is opt-in: it handles
+#           the model's added tokens differently and changes the ids of some
+#           paragraphs.
+#         - **Classifier Cascade**: Optionally, a TF-IDF and logistic regression
+#           model labels every paragraph first, and only the paragraphs it is
+#           not confident about are run through BART (see CascadeClassifier.py).
+#         - **Classification Cache**: Logits of previously seen paragraph keys are
+#           read from a persistent cache instead of being recomputed
+#           (see ClassificationCache.py).
+#         - **Micro-batching**: In the application, paragraphs of concurrent
+#           requests are classified together by a shared scheduler
+#           (see InferenceScheduler.py).
+#         - **Inference Backends**: The padded batches are run either in eager
+#           PyTorch or through ONNX Runtime (see InferenceBackends.py).
 #     - Control:
 #         - The program flows sequentially, starting with loading the model, followed
 #           by classifying the text, categorizing the paragraphs, and finally writing
@@ -56,17 +80,103 @@
 # =============================================================================
 
 
+import os
 import re
+import threading
+from collections import OrderedDict
+import numpy as np
 import torch
-from transformers import BartForSequenceClassification, BartTokenizer
+from transformers import BartTokenizer, BartTokenizerFast
 from torch.nn.functional import softmax
-from fuzzywuzzy import fuzz
 from typing import List, Dict
 
+from Custom_Modules.InferenceBackends import (
+    ID2LABEL,
+    LABEL2ID,
+    ONNX_FILE_NAME,
+    ONNXBackend,
+    TorchBackend,
+    load_classifier,
+    load_quantized_classifier,
+    model_fingerprint,
+)
+from Custom_Modules.CascadeClassifier import CascadeClassifier
+from Custom_Modules.ClassificationCache import ClassificationCache
+from Custom_Modules.HeadingMatcher import HeadingMatcher
+from Custom_Modules.SequenceDecoding import threshold_decode, viterbi_decode
+
+
+# Section headings that are labeled directly, without running the model
+FACTS_HEADINGS = [
+    'facts',
+    'antecedents',
+    'the antecedents',
+    'the factual antecedents',
+    'evidence for the prosecution',
+    'evidence for the defense',
+    'the charges',
+    'the defense\'s version',
+    'defense\'s version',
+    'the prosecution\'s version',
+    'proceedings before the court of appeals',
+    'the facts',
+    'version of the prosecution',
+    'version of the defense',
+    'the facts and the case'
+]
+ISSUES_HEADINGS = [
+    'the issue',
+    'the issues'
+    'the issues presented',
+    'the issue before the court',
+    'the issues before the court',
+    'issue',
+    'issues',
+    'the present',
+    'petition',
+    'presented',
+]
+RULING_HEADINGS = [
+    'ruling of the rtc',
+    'ruling of the ca',
+    'the ruling of the ca',
+    'our ruling',
+    'the ruling of the court',
+    'the rulings of the court',
+    'the ruling of this court',
+    'proper penalty',
+    'the court\'s ruling',
+]
+
+# Probability reported for paragraphs labeled by heading matching
+HEADING_PROBABILITY = 0.9813336682478882
+
+# Longest classifier input, in tokens (including <s> and </s>)
+MAX_LENGTH = 128
+
+# Characters kept per token when a long key is cut before tokenization. BPE
+# tokens of legal English average about four characters, so the cut prefix
+# nearly always still holds more than MAX_LENGTH tokens.
+PRE_TRUNCATE_CHARS_PER_TOKEN = 8
+
+# Forward pass batches classified between two progress reports
+PROGRESS_CHUNK_BATCHES = 4
+
 
 
 class TopicSegmentation:
-    def __init__(self, model_path: str = "jijemini/case-bart"):
+    def __init__(
+        self,
+        model_path: str = "jijemini/case-bart",
+        backend: str = "torch",
+        quantized_cache_dir: str = "quantized_models",
+        cache_path: str = None,
+        cache_size: int = 50000,
+        token_cache_size: int = 20000,
+        cascade_path: str = None,
+        cascade_threshold: float = 0.9,
+        fast_tokenizer: bool = False,
+    ):
         """
         Description:
             Initialize the TopicSegmentation class with a fine-tuned BART model 
@@ -74,88 +184,363 @@ class TopicSegmentation:
 
         Parameters:
             model_path (str): The path to the pre-trained or fine-tuned model.
+                            For the "onnx" backend, the directory written by
+                            `InferenceBackends.export_onnx`.
+            backend (str): The inference backend: "torch", "quantized" (int8
+                            dynamically quantized PyTorch) or "onnx".
+            quantized_cache_dir (str): Where the quantized model is cached.
+            cache_path (str): The SQLite database of the persistent paragraph
+                            classification cache. None disables the cache.
+            cache_size (int): The largest number of cached paragraphs.
+            token_cache_size (int): The largest number of paragraph keys whose
+                            token ids are kept in memory for reuse.
+            cascade_path (str): A first-stage classifier saved by
+                            `CascadeClassifier.train_cascade_model`. None runs
+                            every paragraph through BART.
+            cascade_threshold (float): Paragraphs the first-stage classifier
+                            labels with a lower top probability are escalated
+                            to BART.
+            fast_tokenizer (bool): Tokenize with BartTokenizerFast instead of
+                            BartTokenizer. It is faster, but its handling of the
+                            model's added tokens gives different ids for some
+                            paragraphs, so labels may differ from the slow
+                            tokenizer the model was evaluated with.
         """
         # Setup labels
-        self.id2label = {0: "rulings", 1: "facts", 2: "issues"}
-        self.label2id = {"rulings": 0, "facts": 1, "issues": 2}
-        self.facts_headings = [
-            'facts',
-            'antecedents',
-            'the antecedents',
-            'the factual antecedents',
-            'evidence for the prosecution',
-            'evidence for the defense',
-            'the charges',
-            'the defense\'s version',
-            'defense\'s version',
-            'the prosecution\'s version',
-            'proceedings before the court of appeals',
-            'the facts',
-            'version of the prosecution',
-            'version of the defense',
-            'the facts and the case'
-        ]
-        self.issues_headings = [
-            'the issue',
-            'the issues'
-            'the issues presented',
-            'the issue before the court',
-            'the issues before the court',
-            'issue',
-            'issues',
-            'the present',
-            'petition',
-            'presented',
-        ]
-        self.ruling_headings = [
-            'ruling of the rtc',
-            'ruling of the ca',
-            'the ruling of the ca',
-            'our ruling',
-            'the ruling of the court',
-            'the rulings of the court',
-            'the ruling of this court',
-            'proper penalty',
-            'the court\'s ruling',
-        ]
+        self.id2label = dict(ID2LABEL)
+        self.label2id = dict(LABEL2ID)
+        self.facts_headings = list(FACTS_HEADINGS)
+        self.issues_headings = list(ISSUES_HEADINGS)
+        self.ruling_headings = list(RULING_HEADINGS)
+        self.heading_matcher = HeadingMatcher(
+            {
+                "facts": self.facts_headings,
+                "issues": self.issues_headings,
+                "rulings": self.ruling_headings,
+            }
+        )
 
-        # Load the fine-tuned BART model and tokenizer
-        self.model = BartForSequenceClassification.from_pretrained(
-            model_path, 
-            id2label=self.id2label, 
-            label2id=self.label2id,
-            problem_type="single_label_classification",
-            ignore_mismatched_sizes=True
+        # Load the tokenizer and the fine-tuned BART model for the chosen backend
+        tokenizer_class = BartTokenizerFast if fast_tokenizer else BartTokenizer
+        self.tokenizer = tokenizer_class.from_pretrained(model_path)
+        self.backend_name = backend
+        self.model = None
+
+        if backend in ("torch", "quantized"):
+            if backend == "quantized":
+                self.model = load_quantized_classifier(model_path, quantized_cache_dir)
+            else:
+                self.model = load_classifier(model_path)
+            self.backend = TorchBackend(self.model)
+            print("Model id2label:", self.model.config.id2label)
+            print("Model label2id:", self.model.config.label2id)
+        elif backend == "onnx":
+            self.backend = ONNXBackend(os.path.join(model_path, ONNX_FILE_NAME))
+        else:
+            raise ValueError(f"Unknown inference backend: {backend}")
+
+        # Cached logits are only valid for this exact model, backend and
+        # tokenizer, since the fast tokenizer gives some keys other token ids
+        self.fingerprint = f"{model_fingerprint(model_path)}:{backend}:{type(self.tokenizer).__name__}"
+        self.cache = None
+        if cache_path is not None:
+            self.cache = ClassificationCache(cache_path, self.fingerprint, cache_size)
+
+        # Token ids of recently seen keys, reused when a document is rerun. The
+        # lock also serializes calls into the tokenizer; the Rust tokenizer
+        # rejects concurrent calls that change its truncation settings.
+        self.token_cache = OrderedDict()
+        self.token_cache_size = token_cache_size
+        self._token_lock = threading.Lock()
+
+        # Optional cheap classifier that labels the easy paragraphs without BART
+        self.cascade = CascadeClassifier.load(cascade_path) if cascade_path else None
+        self.cascade_threshold = cascade_threshold
+
+        # Probabilities are only comparable between runs of the same model,
+        # backend and cascade
+        self.probability_fingerprint = self.fingerprint
+        if cascade_path:
+            self.probability_fingerprint += f":{model_fingerprint(cascade_path)}:{cascade_threshold}"
+        self.cascade_paragraphs = 0
+        self.cascade_escalated = 0
+        self._stats_lock = threading.Lock()
+
+
+    def warm_up(self):
+        """
+        Description:
+            Runs a single dummy forward pass so the first real request does not
+            pay for lazy initialization inside PyTorch.
+        """
+        self.predict_model_probabilities(
+            ["The petitioner filed a complaint before the regional trial court."]
         )
-        self.tokenizer = BartTokenizer.from_pretrained(model_path)
-        self.model.eval()  # Set model to evaluation mode
 
-        print("Model id2label:", self.model.config.id2label)
-        print("Model label2id:", self.model.config.label2id)
 
+    def match_heading(self, key: str):
+        """
+        Description:
+            Checks whether a paragraph key is one of the known section headings.
+
+        Parameters:
+            key (str): The paragraph key to check.
+
+        Returns:
+            str or None: The label of the matched heading ('facts', 'issues' or
+            'rulings'), or None if the key is not a heading.
+        """
+        return self.heading_matcher.match([key])[0]
+
+
+    @staticmethod
+    def pre_truncate(text: str, max_length: int = MAX_LENGTH) -> str:
+        """
+        Description:
+            Cuts a long text at a word boundary before tokenization, so the BPE
+            tokenizer does not process text that truncation would discard.
+            Byte-level BPE never merges a word with the space before the next
+            word, so the tokens of the kept prefix are exactly the first tokens
+            of the full text.
+
+        Parameters:
+            text (str): The text to cut.
+            max_length (int): The number of tokens the text is truncated to.
+
+        Returns:
+            str: The text itself if it is short, otherwise its prefix up to
+            the last word that ends within the character budget.
+        """
+        budget = max_length * PRE_TRUNCATE_CHARS_PER_TOKEN
+        if len(text) <= budget:
+            return text
+
+        # Cut right before the last space that follows a non-space character,
+        # which is always a boundary between two BPE words
+        cut = text.rfind(" ", 0, budget + 1)
+        while cut > 0 and text[cut - 1].isspace():
+            cut = text.rfind(" ", 0, cut)
+        return text[:cut] if cut > 0 else text
+
+
+    def encode(self, keys: List[str]) -> List[List[int]]:
+        """
+        Description:
+            Converts paragraph keys into truncated token ids. Ids of keys seen
+            recently are reused instead of being tokenized again.
+
+        Parameters:
+            keys (list): The paragraph keys to tokenize.
+
+        Returns:
+            input_ids (list): The token ids of every key, in the same order.
+        """
+        input_ids = [None] * len(keys)
+
+        with self._token_lock:
+            missing = []
+            for idx, key in enumerate(keys):
+                ids = self.token_cache.get(key)
+                if ids is None:
+                    missing.append(idx)
+                else:
+                    self.token_cache.move_to_end(key)
+                    input_ids[idx] = ids
+
+            if missing:
+                # Batch-encode every new key, cut down to its first words
+                texts = [self.pre_truncate(keys[idx]) for idx in missing]
+                encoded = self.tokenizer(texts, max_length=MAX_LENGTH, truncation=True)["input_ids"]
+
+                # A cut text that did not fill MAX_LENGTH tokens may have lost
+                # some, so those few keys are tokenized in full
+                retry = [
+                    pos for pos, ids in enumerate(encoded)
+                    if len(ids) < MAX_LENGTH and len(texts[pos]) < len(keys[missing[pos]])
+                ]
+                if retry:
+                    full_encoded = self.tokenizer(
+                        [keys[missing[pos]] for pos in retry], max_length=MAX_LENGTH, truncation=True
+                    )["input_ids"]
+                    for pos, ids in zip(retry, full_encoded):
+                        encoded[pos] = ids
+
+                for idx, ids in zip(missing, encoded):
+                    input_ids[idx] = ids
+                    self.token_cache[keys[idx]] = ids
+
+                while len(self.token_cache) > self.token_cache_size:
+                    self.token_cache.popitem(last=False)
+
+        return input_ids
+
+
+    def pad_batch(self, batch_ids: List[List[int]]) -> tuple:
+        """
+        Description:
+            Right-pads token ids to the longest sequence of the batch.
+
+        Parameters:
+            batch_ids (list): The token ids of each key in the batch.
+
+        Returns:
+            tuple: The (batch, length) input ids and attention mask arrays.
+        """
+        length = max(len(ids) for ids in batch_ids)
+        input_ids = np.full((len(batch_ids), length), self.tokenizer.pad_token_id, dtype=np.int64)
+        attention_mask = np.zeros((len(batch_ids), length), dtype=np.int64)
+        for row, ids in enumerate(batch_ids):
+            input_ids[row, :len(ids)] = ids
+            attention_mask[row, :len(ids)] = 1
+        return input_ids, attention_mask
+
+
+    def predict_probabilities(self, keys: List[str], batch_size: int = 1) -> np.ndarray:
+        """
+        Description:
+            Returns the probabilities of every label for the paragraph keys. With
+            a cascade, the cheap classifier labels every key first and only the
+            keys whose top probability is below `cascade_threshold` are run
+            through the BART model.
+
+        Parameters:
+            keys (list): The paragraph keys to classify.
+            batch_size (int): The number of keys per BART forward pass.
+
+        Returns:
+            probabilities (np.ndarray): A (len(keys), number of labels) array,
+            in the same order as `keys`.
+        """
+        if self.cascade is None:
+            return self.predict_model_probabilities(keys, batch_size=batch_size)
+
+        probabilities = self.cascade.predict_probabilities(keys)
+        escalated = np.flatnonzero(probabilities.max(axis=1) < self.cascade_threshold)
+        if len(escalated):
+            probabilities[escalated] = self.predict_model_probabilities(
+                [keys[idx] for idx in escalated], batch_size=batch_size
+            )
+
+        with self._stats_lock:
+            self.cascade_paragraphs += len(keys)
+            self.cascade_escalated += len(escalated)
 
-    def is_similar_heading(self, line: str, headings: List[str], threshold: int = 75) -> bool:
+        return probabilities
+
+
+    def cascade_stats(self) -> dict:
+        """
+        Description:
+            Reports how many paragraphs the cascade escalated to BART.
+
+        Returns:
+            dict: The confidence threshold, the number of paragraphs and
+            escalated paragraphs, and the escalated fraction.
+        """
+        with self._stats_lock:
+            return {
+                "threshold": self.cascade_threshold,
+                "paragraphs": self.cascade_paragraphs,
+                "escalated": self.cascade_escalated,
+                "escalated_fraction": (
+                    self.cascade_escalated / self.cascade_paragraphs
+                    if self.cascade_paragraphs else 0.0
+                ),
+            }
+
+
+    def predict_model_probabilities(self, keys: List[str], batch_size: int = 1) -> np.ndarray:
         """
-        Check if the line is similar to any of the provided headings based on a similarity threshold.
+        Description:
+            Runs the BART model on the paragraph keys and returns the softmax
+            probabilities of every label. The keys are tokenized together, sorted
+            by token length and fed to the model in batches padded only up to the
+            longest key of each batch.
+
+        Parameters:
+            keys (list): The paragraph keys to classify.
+            batch_size (int): The number of keys per forward pass. A batch size
+                            of 1 reproduces the original one-pass-per-key path.
+
+        Returns:
+            probabilities (np.ndarray): A (len(keys), number of labels) array,
+            in the same order as `keys`.
         """
-        line_lower = line.lower()
-        for heading in headings:
-            if fuzz.ratio(line_lower, heading.lower()) >= threshold:
-                return True
-        return False
+        logits = np.zeros((len(keys), len(self.id2label)), dtype=np.float32)
+        if not keys:
+            return logits
+
+        # Reuse the logits of paragraphs that were already classified
+        cached_logits = self.cache.get_many(keys) if self.cache is not None else {}
+        missing = []
+        for idx, key in enumerate(keys):
+            if key in cached_logits:
+                logits[idx] = cached_logits[key]
+            else:
+                missing.append(idx)
+
+        if missing:
+            # Tokenize every remaining key at once without padding
+            input_ids = self.encode([keys[idx] for idx in missing])
+
+            # Group keys of similar length together to minimize padding
+            order = sorted(range(len(missing)), key=lambda idx: len(input_ids[idx]))
+
+            for start in range(0, len(order), batch_size):
+                batch_indices = order[start:start + batch_size]
+                batch_input_ids, batch_attention_mask = self.pad_batch(
+                    [input_ids[idx] for idx in batch_indices]
+                )
+
+                # Perform inference
+                logits[[missing[idx] for idx in batch_indices]] = self.backend.predict_logits(
+                    batch_input_ids, batch_attention_mask
+                )
+
+            if self.cache is not None:
+                self.cache.put_many({keys[idx]: logits[idx] for idx in missing})
+
+        return softmax(torch.from_numpy(logits), dim=-1).numpy()
 
 
     def sequence_classification(
-        self, tokenized_paragraphs: dict, threshold: float = 0.0
+        self,
+        tokenized_paragraphs: dict,
+        threshold: float = 0.0,
+        batch_size: int = 1,
+        scheduler=None,
+        progress_callback=None,
+        decoder: str = "threshold",
+        transitions: np.ndarray = None,
+        paragraph_probabilities: dict = None,
     ) -> dict:
         """
         Description:
             Performs sequence classification on tokenized paragraphs and assigns 
-            labels based on the predicted probabilities.
+            labels based on the predicted probabilities. All non-heading keys are
+            submitted for classification first, then the probability matrix is
+            decoded into labels (see `assign_labels`).
 
         Parameters:
             tokenized_paragraphs (dict): A dictionary with paragraph keys and values.
             threshold (float): A threshold for the classification confidence.
+            batch_size (int): The number of paragraphs per forward pass.
+            scheduler (InferenceScheduler): If given, the paragraphs are
+                            classified through the shared scheduler, batched
+                            together with those of concurrent requests.
+            progress_callback: If given, called as `progress_callback(processed,
+                            total, label, probability)` as each paragraph is
+                            labeled.
+            decoder (str): "threshold" keeps the previous paragraph's label
+                            when the classifier is not confident; "viterbi"
+                            smooths the labels with a transition prior.
+            transitions (np.ndarray): The Viterbi transition matrix. Defaults
+                            to `SequenceDecoding.transition_matrix()`.
+            paragraph_probabilities (dict): Paragraph keys mapped to label
+                            probabilities that are already known, e.g. from an
+                            earlier version of the document. These keys are not
+                            classified again, and the probabilities of every
+                            key that is classified are added to the dictionary.
 
         Returns:
             predicted_labels_dict (dict): A dictionary with paragraph keys and 
@@ -163,61 +548,216 @@ class TopicSegmentation:
                 - list[0]: Predicted label
                 - list[1]: Probability of the predicted label
         """
-        predicted_labels_dict = {}
-        previous_label = "rulings"  # To keep track of the previous label
-
-        for key, value in tokenized_paragraphs.items():
-
-            if self.is_similar_heading(key, self.facts_headings):
-                predicted_label = "facts"
-                max_probability = 0.9813336682478882
-            elif self.is_similar_heading(key, self.issues_headings):
-                predicted_label = "issues"
-                max_probability = 0.9813336682478882
-            elif self.is_similar_heading(key, self.ruling_headings):
-                predicted_label = "rulings"
-                max_probability = 0.9813336682478882
-            
-            else:  
-                # Tokenize the input
-                inputs = self.tokenizer(
-                    key,
-                    return_tensors="pt",
-                    max_length=128,
-                    truncation=True,
-                    padding=True,
-                )
+        keys = list(tokenized_paragraphs.keys())
+        heading_labels = self.heading_matcher.match(keys)
 
-                # Perform inference
-                with torch.no_grad():
-                    outputs = self.model(**inputs)
+        # Run the model on every paragraph that is not a heading
+        model_keys = [key for key, heading in zip(keys, heading_labels) if heading is None]
 
-                # Get the predicted label (logits are raw predictions before softmax)
-                logits = outputs.logits
+        # Classify in chunks when progress is reported, otherwise all at once
+        chunk_size = batch_size * PROGRESS_CHUNK_BATCHES if progress_callback else len(model_keys)
+        chunks = [
+            model_keys[start:start + chunk_size]
+            for start in range(0, len(model_keys), max(chunk_size, 1))
+        ]
 
-                # Calculate softmax probabilities
-                probabilities = softmax(logits, dim=-1)
+        # Only the keys without known probabilities go to the model
+        if paragraph_probabilities is None:
+            paragraph_probabilities = {}
+        unknown_chunks = [
+            [key for key in chunk if key not in paragraph_probabilities] for chunk in chunks
+        ]
 
-                # Get the predicted class ID and its probability
-                predicted_class_id = torch.argmax(probabilities, dim=-1).item()
-                max_probability = probabilities[0][predicted_class_id].item()  # Get the max probability
+        if scheduler is not None:
+            futures = [scheduler.submit(self, chunk) for chunk in unknown_chunks]
+            predictions = (future.result() for future in futures)
+        else:
+            predictions = (
+                self.predict_probabilities(chunk, batch_size=batch_size) for chunk in unknown_chunks
+            )
+
+        def merge(chunk, unknown_chunk, predicted):
+            paragraph_probabilities.update(zip(unknown_chunk, predicted))
+            return np.array(
+                [paragraph_probabilities[key] for key in chunk], dtype=np.float32
+            ).reshape(-1, len(self.id2label))
+
+        results = (
+            merge(chunk, unknown_chunk, predicted)
+            for chunk, unknown_chunk, predicted in zip(chunks, unknown_chunks, predictions)
+        )
 
-                # Check if the probability is below the threshold
-                if max_probability < threshold:
-                    predicted_label = previous_label  # Use the previous label if below threshold
-                else:
-                    id2label = self.model.config.id2label  # Get the label mapping from model config
-                    predicted_label = id2label[predicted_class_id]  # Map class ID to label
+        return self.assign_labels(
+            tokenized_paragraphs,
+            heading_labels,
+            results,
+            threshold,
+            progress_callback,
+            decoder=decoder,
+            transitions=transitions,
+        )
 
-            # Store the predicted label and probability in the dictionary
-            predicted_labels_dict[value] = [predicted_label, max_probability]
-            previous_label = predicted_label  # Update previous label for the next iteration
 
-            print(f"Text: {value}\nLabel: {predicted_label}\nProbability: {max_probability}\n\n")
+    def assign_labels(
+        self,
+        tokenized_paragraphs: dict,
+        heading_labels: list,
+        model_probabilities,
+        threshold: float = 0.0,
+        progress_callback=None,
+        decoder: str = "threshold",
+        transitions: np.ndarray = None,
+    ) -> dict:
+        """
+        Description:
+            Decodes the probabilities of a document into paragraph labels, with
+            headings fixed to their own label. With the "threshold" decoder a
+            paragraph's label only depends on the paragraphs before it, so each
+            chunk of paragraphs is decoded (and reported) as soon as it has been
+            classified; the "viterbi" decoder waits for the whole document.
+
+        Parameters:
+            tokenized_paragraphs (dict): A dictionary with paragraph keys and values.
+            heading_labels (list): The heading label of each key, or None.
+            model_probabilities: An iterable over (chunk, labels) probability
+                            arrays of the non-heading keys, in document order.
+            threshold (float): A threshold for the classification confidence.
+            progress_callback: If given, called as `progress_callback(processed,
+                            total, label, probability)` after each paragraph.
+            decoder (str): "threshold" or "viterbi".
+            transitions (np.ndarray): The Viterbi transition matrix.
+
+        Returns:
+            predicted_labels_dict (dict): A dictionary with paragraph values and
+            their [label, probability] lists.
+        """
+        if decoder not in ("threshold", "viterbi"):
+            raise ValueError(f"Unknown decoder: {decoder}")
+
+        values = list(tokenized_paragraphs.values())
+        heading_ids = np.array(
+            [self.label2id[label] if label is not None else -1 for label in heading_labels], dtype=int
+        )
+        model_positions = np.flatnonzero(heading_ids < 0)
+
+        # Headings are labeled with a fixed probability
+        probabilities = np.zeros((len(values), len(self.id2label)))
+        heading_positions = np.flatnonzero(heading_ids >= 0)
+        probabilities[heading_positions, heading_ids[heading_positions]] = HEADING_PROBABILITY
+
+        predicted_labels_dict = {}
+        id2label = self.id2label
+
+        def emit(start, label_ids, label_probabilities):
+            for offset, (label_id, probability) in enumerate(zip(label_ids, label_probabilities)):
+                value = values[start + offset]
+                predicted_label = id2label[int(label_id)]
+                max_probability = float(probability)
+
+                # Store the predicted label and probability in the dictionary
+                predicted_labels_dict[value] = [predicted_label, max_probability]
+
+                if progress_callback:
+                    progress_callback(start + offset + 1, len(values), predicted_label, max_probability)
+
+        received = 0
+        decoded = 0
+        previous_label_id = self.label2id["rulings"]  # To keep track of the previous label
+
+        for chunk_probabilities in model_probabilities:
+            probabilities[model_positions[received:received + len(chunk_probabilities)]] = chunk_probabilities
+            received += len(chunk_probabilities)
+            if decoder != "threshold":
+                continue
+
+            # Every paragraph before the next unclassified one is final
+            end = model_positions[received] if received < len(model_positions) else len(values)
+            label_ids, label_probabilities = threshold_decode(
+                probabilities[decoded:end], heading_ids[decoded:end], threshold, previous_label_id
+            )
+            emit(decoded, label_ids, label_probabilities)
+            if end > decoded:
+                previous_label_id = int(label_ids[-1])
+            decoded = end
+
+        if decoder == "viterbi":
+            label_ids, label_probabilities = viterbi_decode(probabilities, heading_ids, transitions)
+        else:
+            label_ids, label_probabilities = threshold_decode(
+                probabilities[decoded:], heading_ids[decoded:], threshold, previous_label_id
+            )
+        emit(decoded, label_ids, label_probabilities)
 
         return predicted_labels_dict
 
 
+    def classify_documents(
+        self,
+        documents: dict,
+        threshold: float = 0.0,
+        batch_size: int = 1,
+        decoder: str = "threshold",
+        paragraph_probabilities: dict = None,
+    ) -> dict:
+        """
+        Description:
+            Classifies the paragraphs of several documents together. The
+            non-heading keys of every document are pooled (each distinct key
+            once) and run through the model in shared batches, then each
+            document is labeled in its own order exactly as by
+            `sequence_classification`.
+
+        Parameters:
+            documents (dict): Document ids mapped to their tokenized paragraphs.
+            threshold (float): A threshold for the classification confidence.
+            batch_size (int): The number of paragraphs per forward pass.
+            decoder (str): "threshold" or "viterbi" (see `assign_labels`).
+            paragraph_probabilities (dict): Paragraph keys mapped to label
+                            probabilities that are already known. These keys
+                            are not classified again, and the probabilities of
+                            every key that is classified are added to the
+                            dictionary, as in `sequence_classification`.
+
+        Returns:
+            dict: Document ids mapped to their predicted labels dictionaries.
+        """
+        heading_labels = {
+            doc_id: self.heading_matcher.match(list(tokenized_paragraphs))
+            for doc_id, tokenized_paragraphs in documents.items()
+        }
+
+        # Pool the distinct non-heading keys of every document
+        pooled_keys = list(dict.fromkeys(
+            key
+            for doc_id, tokenized_paragraphs in documents.items()
+            for key, heading in zip(tokenized_paragraphs, heading_labels[doc_id])
+            if heading is None
+        ))
+        if paragraph_probabilities is None:
+            paragraph_probabilities = {}
+        unknown_keys = [key for key in pooled_keys if key not in paragraph_probabilities]
+        probabilities = self.predict_probabilities(unknown_keys, batch_size=batch_size)
+        paragraph_probabilities.update(zip(unknown_keys, probabilities))
+
+        return {
+            doc_id: self.assign_labels(
+                tokenized_paragraphs,
+                heading_labels[doc_id],
+                [np.array(
+                    [
+                        paragraph_probabilities[key]
+                        for key, heading in zip(tokenized_paragraphs, heading_labels[doc_id])
+                        if heading is None
+                    ],
+                    dtype=np.float32,
+                ).reshape(-1, len(self.id2label))],
+                threshold,
+                decoder=decoder,
+            )
+            for doc_id, tokenized_paragraphs in documents.items()
+        }
+
+
     def label_mapping(self, predicted_labels_dict: dict) -> dict:
         """
         Description:
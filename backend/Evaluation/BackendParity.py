@@ -0,0 +1,105 @@
+# =============================================================================
+# Program Title: Inference Backend Parity Check
+# Programmer: Jewell Anne Diamante
+# Date Written: October 17, 2026
+# Date Revised: October 17, 2026
+#
+# Purpose:
+#     This program checks that the ONNX Runtime backend of the paragraph
+#     classifier predicts the same labels as the PyTorch backend on every court
+#     case of the evaluation corpus. It fails, with a non-zero exit status, when
+#     the fraction of paragraphs whose labels differ exceeds a tolerance.
+#
+# Where the program fits in the general system design:
+#     It is run after exporting the model with
+#     `python -m Custom_Modules.InferenceBackends` and before switching the
+#     application to the "onnx" backend.
+#
+# Data Structures, Algorithms, and Control:
+#     - Data Structures:
+#         - **List (`results`)**: Per-case paragraph counts, label mismatches
+#           and the largest probability difference between the backends.
+#     - Algorithms:
+#         - **Label Comparison**: Both backends classify the same non-heading
+#           paragraph keys and their argmax labels are compared.
+#     - Control:
+#         - Run from the backend folder:
+#           python -m Evaluation.BackendParity --onnx-model "Case Bart ONNX"
+# =============================================================================
+
+
+import argparse
+import os
+import sys
+
+import numpy as np
+from tabulate import tabulate
+
+from Custom_Modules.TopicSegmentation import TopicSegmentation
+from Evaluation.EvaluationCorpus import find_case_folders, read_case_text, segment_case
+
+
+def compare_backends(reference, candidate, case_text, batch_size=16):
+    """
+    Classifies the paragraphs of a case with two segmentation models.
+
+    :param reference: The reference TopicSegmentation (PyTorch backend).
+    :param candidate: The TopicSegmentation under test.
+    :param case_text: The raw text of the court case.
+    :param batch_size: The number of paragraphs per forward pass.
+    :return: A tuple with the number of classified paragraphs, the number of
+             label mismatches and the largest absolute probability difference.
+    """
+    segmented_paragraph = segment_case(case_text)
+    keys = [key for key in segmented_paragraph if reference.match_heading(key) is None]
+
+    reference_probabilities = reference.predict_probabilities(keys, batch_size=batch_size)
+    candidate_probabilities = candidate.predict_probabilities(keys, batch_size=batch_size)
+
+    mismatches = int(np.sum(
+        reference_probabilities.argmax(axis=1) != candidate_probabilities.argmax(axis=1)
+    ))
+    max_difference = (
+        float(np.max(np.abs(reference_probabilities - candidate_probabilities)))
+        if keys else 0.0
+    )
+    return len(keys), mismatches, max_difference
+
+
+# Main Program
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the ONNX and PyTorch backends.")
+    parser.add_argument("--model-path", default="jijemini/case-bart")
+    parser.add_argument("--onnx-model", required=True)
+    parser.add_argument("--tolerance", type=float, default=0.01,
+                        help="Largest allowed fraction of paragraphs with differing labels.")
+    args = parser.parse_args()
+
+    reference = TopicSegmentation(args.model_path, backend="torch")
+    candidate = TopicSegmentation(args.onnx_model, backend="onnx")
+
+    results = []
+    for idx, case_path in enumerate(find_case_folders(), start=1):
+        paragraphs, mismatches, max_difference = compare_backends(
+            reference, candidate, read_case_text(case_path)
+        )
+        results.append({
+            "No.": idx,
+            "GR Title": os.path.basename(case_path),
+            "Paragraphs": paragraphs,
+            "Mismatches": mismatches,
+            "Max Prob Diff": max_difference,
+        })
+
+    print(tabulate(results, headers="keys", tablefmt="grid", floatfmt=".6f"))
+
+    total_paragraphs = sum(row["Paragraphs"] for row in results)
+    total_mismatches = sum(row["Mismatches"] for row in results)
+    mismatch_rate = total_mismatches / total_paragraphs if total_paragraphs else 0.0
+    print(f"Label mismatches: {total_mismatches}/{total_paragraphs} ({mismatch_rate:.4%})")
+
+    if mismatch_rate > args.tolerance:
+        print(f"FAILED: mismatch rate is above the tolerance of {args.tolerance:.4%}")
+        sys.exit(1)
+
+    print("PASSED: the ONNX backend matches the PyTorch backend.")
@@ -0,0 +1,154 @@
+# =============================================================================
+# Program Title: Classifier Cascade Calibration, Escalation and Speedup Report
+# Programmer: Miguel Tolentino
+# Date Written: October 17, 2026
+# Date Revised: October 17, 2026
+#
+# Purpose:
+#     This program calibrates and measures the classifier cascade on the
+#     paragraph keys of every case in the segmented evaluation corpus, the
+#     keys the application classifies. The TF-IDF and logistic regression
+#     model is trained on sentences, so its threshold is chosen here on
+#     paragraphs: case-bart labels every paragraph as the reference, and for
+#     every candidate threshold the report gives the fraction of paragraphs
+#     escalated to case-bart and how often the final labels agree with it.
+#     The lowest threshold reaching the target agreement is chosen. At that
+#     threshold, each case is then classified with the cascade and the report
+#     gives its escalation, the time of both runs, the end-to-end speedup and
+#     the agreement.
+#
+# Where the program fits in the general system design:
+#     CASCADE_THRESHOLD of the application is set from this report before a
+#     model trained by Custom_Modules/CascadeClassifier.py is enabled with
+#     CASCADE_MODEL_PATH.
+#
+# Data Structures, Algorithms, and Control:
+#     - Data Structures:
+#         - **List (`cases`)**: The paragraph keys, case-bart and cascade model
+#           probabilities and case-bart time of every case.
+#         - **List (`results`)**: Per-case escalation, timings and agreement.
+#     - Algorithms:
+#         - **Threshold Calibration**: `calibrate_threshold` over the pooled
+#           paragraphs of all cases.
+#         - **Agreement**: The fraction of paragraphs whose argmax label is
+#           the same with and without the cascade.
+#     - Control:
+#         - Run from the backend folder:
+#           python -m Evaluation.CascadeReport --cascade-model instance/cascade.joblib
+#         - `--threshold` skips the choice and measures the given threshold.
+# =============================================================================
+
+
+import argparse
+import os
+import time
+
+import numpy as np
+from tabulate import tabulate
+
+from Custom_Modules.CascadeClassifier import calibrate_threshold
+from Custom_Modules.TopicSegmentation import TopicSegmentation
+from Evaluation.EvaluationCorpus import find_case_folders, read_case_text, segment_case
+
+
+def timed(function):
+    """
+    Runs a function once and returns its result and elapsed time.
+    """
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+# Main Program
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Calibrate and measure the classifier cascade on the corpus.")
+    parser.add_argument("--model-path", default="jijemini/case-bart")
+    parser.add_argument("--cascade-model", required=True)
+    parser.add_argument("--thresholds", type=float, nargs="+",
+                        default=[0.5, 0.6, 0.7, 0.8, 0.85, 0.9, 0.95, 0.99],
+                        help="The candidate thresholds.")
+    parser.add_argument("--min-agreement", type=float, default=0.98,
+                        help="The smallest acceptable agreement with case-bart.")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="Measure this threshold instead of the calibrated one.")
+    parser.add_argument("--batch-size", type=int, default=16)
+    args = parser.parse_args()
+
+    segmentation = TopicSegmentation(args.model_path, cascade_path=args.cascade_model)
+    segmentation.warm_up()
+
+    # case-bart labels every paragraph once; it is the reference of the calibration
+    cases = []
+    for idx, case_path in enumerate(find_case_folders(), start=1):
+        segmented_paragraph = segment_case(read_case_text(case_path))
+        keys = [key for key in segmented_paragraph if segmentation.match_heading(key) is None]
+        if not keys:
+            continue
+
+        segmentation.token_cache.clear()
+        bart_probabilities, bart_time = timed(
+            lambda: segmentation.predict_model_probabilities(keys, batch_size=args.batch_size)
+        )
+        cases.append({
+            "No.": idx,
+            "GR Title": os.path.basename(case_path),
+            "keys": keys,
+            "bart": bart_probabilities,
+            "cascade": segmentation.cascade.predict_probabilities(keys),
+            "BART (s)": bart_time,
+        })
+
+    calibration, chosen = calibrate_threshold(
+        np.concatenate([case["cascade"] for case in cases]),
+        np.concatenate([case["bart"].argmax(axis=1) for case in cases]),
+        args.thresholds,
+        args.min_agreement,
+    )
+    print(f"Paragraphs: {sum(len(case['keys']) for case in cases)}")
+    print(tabulate(calibration, headers="keys", tablefmt="grid", floatfmt=".4f"))
+    if chosen is None:
+        print(f"No threshold reaches an agreement of {args.min_agreement}")
+    else:
+        print(f"Calibrated threshold: {chosen} (agreement >= {args.min_agreement})")
+
+    threshold = args.threshold if args.threshold is not None else chosen
+    if threshold is None:
+        raise SystemExit(1)
+    segmentation.cascade_threshold = threshold
+
+    results = []
+    for case in cases:
+        keys = case["keys"]
+
+        # The cascade run may not reuse the case-bart run's token ids
+        segmentation.token_cache.clear()
+        escalated_before = segmentation.cascade_stats()["escalated"]
+        cascade_probabilities, cascade_time = timed(
+            lambda: segmentation.predict_probabilities(keys, batch_size=args.batch_size)
+        )
+        escalated = segmentation.cascade_stats()["escalated"] - escalated_before
+
+        results.append({
+            "No.": case["No."],
+            "GR Title": case["GR Title"],
+            "Paragraphs": len(keys),
+            "Escalated": escalated / len(keys),
+            "BART (s)": case["BART (s)"],
+            "Cascade (s)": cascade_time,
+            "Speedup": case["BART (s)"] / cascade_time if cascade_time else float("inf"),
+            "Agreement": float(np.mean(
+                case["bart"].argmax(axis=1) == cascade_probabilities.argmax(axis=1)
+            )),
+        })
+
+    print(f"Threshold: {threshold}")
+    print(tabulate(results, headers="keys", tablefmt="grid", floatfmt=".3f"))
+
+    stats = segmentation.cascade_stats()
+    bart_total = sum(row["BART (s)"] for row in results)
+    cascade_total = sum(row["Cascade (s)"] for row in results)
+    agreement = sum(row["Agreement"] * row["Paragraphs"] for row in results) / stats["paragraphs"]
+    print(f"Escalated: {stats['escalated']}/{stats['paragraphs']} ({stats['escalated_fraction']:.1%})")
+    print(f"Total: {bart_total:.2f}s -> {cascade_total:.2f}s ({bart_total / cascade_total:.2f}x)")
+    print(f"Agreement with BART: {agreement:.4f}")
@@ -0,0 +1,102 @@
+# =============================================================================
+# Program Title: Corpus IDF ROUGE Comparison
+# Programmer: Jewell Anne Diamante
+# Date Written: October 17, 2026
+# Date Revised: October 17, 2026
+#
+# Purpose:
+#     This program checks whether weighting the LSA terms with IDF from the
+#     whole corpus gives better summaries than weighting them with each case
+#     alone. Every segmented case in the evaluation corpus is summarized both
+#     ways, and both summaries are scored with ROUGE against the human
+#     summary. The per-case differences are tested with a paired t-test.
+#
+# Where the program fits in the general system design:
+#     LSA_CORPUS_IDF of the application stays off until this report shows
+#     that the corpus weights help.
+#
+# Data Structures, Algorithms, and Control:
+#     - Data Structures:
+#         - **CorpusIDF**: Built from the texts of every corpus case, in a
+#           temporary database, as the application builds it from the stored
+#           cases.
+#         - **List (`results`)**: Per-case ROUGE F1 of both summaries.
+#     - Algorithms:
+#         - **ROUGE**: ROUGE-1, ROUGE-2 and ROUGE-L F1 from `rouge_score`.
+#         - **Paired t-test**: `scipy.stats.ttest_rel` over the cases.
+#     - Control:
+#         - Run from the backend folder:
+#           python -m Evaluation.CorpusIDFReport
+# =============================================================================
+
+
+import argparse
+import os
+import tempfile
+
+import numpy as np
+from rouge_score import rouge_scorer
+from scipy.stats import ttest_rel
+from tabulate import tabulate
+
+from Custom_Modules.CorpusIDF import CorpusIDF
+from Custom_Modules.LSA import LSA
+from Evaluation.EvaluationCorpus import find_case_folders, load_labeled_paragraphs, read_case_text
+from Evaluation.LSARankReport import ROUGE_TYPES, build_text_dict, rouge_f1, summary_text
+
+
+# Main Program
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare corpus IDF with per-case IDF in the LSA.")
+    parser.add_argument("--reference", default="human summary.txt",
+                        help="The reference summary file of every case.")
+    args = parser.parse_args()
+
+    scorer = rouge_scorer.RougeScorer(ROUGE_TYPES, use_stemmer=True)
+
+    with tempfile.TemporaryDirectory() as folder:
+        # The corpus model holds every case, as the application's holds every stored case
+        corpus_idf = CorpusIDF(os.path.join(folder, "corpus_idf.db"))
+        for file_id, case_path in enumerate(find_case_folders(), start=1):
+            corpus_idf.add_document(file_id, read_case_text(case_path))
+        idf_model = corpus_idf.model()
+        corpus_idf.connection.close()
+
+    results = []
+    case_paths = find_case_folders(required_file="LSATP_segments.txt")
+    for idx, case_path in enumerate(case_paths, start=1):
+        if not os.path.isfile(os.path.join(case_path, args.reference)):
+            continue
+        labeled_paragraphs = load_labeled_paragraphs(os.path.join(case_path, "LSATP_segments.txt"))
+        if not labeled_paragraphs:
+            continue
+        text_dict = build_text_dict(labeled_paragraphs)
+        reference = read_case_text(case_path, args.reference)
+
+        case_summary = summary_text(LSA(text_dict).create_summary())
+        corpus_summary = summary_text(LSA(text_dict, idf_model=idf_model).create_summary())
+
+        row = {"No.": idx, "GR Title": os.path.basename(case_path)[:40]}
+        row.update(zip(["R1 Case", "R2 Case", "RL Case"], rouge_f1(scorer, reference, case_summary)))
+        row.update(zip(["R1 Corpus", "R2 Corpus", "RL Corpus"], rouge_f1(scorer, reference, corpus_summary)))
+        results.append(row)
+
+    print(tabulate(results, headers="keys", tablefmt="grid", floatfmt=".3f"))
+
+    summary = []
+    for name in ("R1", "R2", "RL"):
+        case_scores = np.array([row[f"{name} Case"] for row in results])
+        corpus_scores = np.array([row[f"{name} Corpus"] for row in results])
+        _, p_value = ttest_rel(corpus_scores, case_scores)
+        summary.append({
+            "Metric": name,
+            "Per-case IDF": case_scores.mean(),
+            "Corpus IDF": corpus_scores.mean(),
+            "Difference": (corpus_scores - case_scores).mean(),
+            "Cases Better": int((corpus_scores > case_scores).sum()),
+            "Cases Worse": int((corpus_scores < case_scores).sum()),
+            "p-value": p_value,
+        })
+
+    print(f"Cases: {len(results)}")
+    print(tabulate(summary, headers="keys", tablefmt="grid", floatfmt=".4f"))
@@ -0,0 +1,98 @@
+# =============================================================================
+# Program Title: Distilled Student Throughput and Agreement Report
+# Programmer: Miguel Tolentino
+# Date Written: October 17, 2026
+# Date Revised: October 17, 2026
+#
+# Purpose:
+#     This program measures, for the teacher (case-bart) and any number of
+#     distilled student models, how many paragraphs per second they classify
+#     and how often their labels agree with the teacher's on the evaluation
+#     corpus. The resulting table is used to pick a speed/quality point.
+#
+# Where the program fits in the general system design:
+#     It evaluates the students written by Custom_Modules/Distillation.py
+#     before one of them is deployed as the application's MODEL_PATH.
+#
+# Data Structures, Algorithms, and Control:
+#     - Data Structures:
+#         - **List (`corpus_keys`)**: The non-heading paragraph keys of every
+#           case in Evaluation/Court_Cases.
+#         - **List (`results`)**: Throughput and agreement per model.
+#     - Algorithms:
+#         - **Throughput**: Paragraphs classified per second, after a warm-up.
+#         - **Agreement**: The fraction of paragraphs whose argmax label
+#           matches the teacher's.
+#     - Control:
+#         - Run from the backend folder:
+#           python -m Evaluation.DistillationReport --students "Case Bart Student"
+# =============================================================================
+
+
+import argparse
+import time
+
+import numpy as np
+from tabulate import tabulate
+
+from Custom_Modules.TopicSegmentation import TopicSegmentation
+from Evaluation.EvaluationCorpus import find_case_folders, read_case_text, segment_case
+
+
+def measure(segmentation, corpus_keys, batch_size):
+    """
+    Classifies every paragraph of the corpus with one model.
+
+    :param segmentation: The TopicSegmentation to measure.
+    :param corpus_keys: A list with the paragraph keys of each case.
+    :param batch_size: The number of paragraphs per forward pass.
+    :return: A tuple with the predicted label ids and the paragraphs per second.
+    """
+    segmentation.warm_up()
+    predictions = []
+    start = time.perf_counter()
+    for keys in corpus_keys:
+        probabilities = segmentation.predict_probabilities(keys, batch_size=batch_size)
+        predictions.append(probabilities.argmax(axis=1))
+    elapsed = time.perf_counter() - start
+
+    predictions = np.concatenate(predictions) if predictions else np.array([])
+    return predictions, len(predictions) / elapsed
+
+
+# Main Program
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare distilled students with the teacher.")
+    parser.add_argument("--teacher", default="jijemini/case-bart")
+    parser.add_argument("--students", nargs="+", required=True)
+    parser.add_argument("--batch-size", type=int, default=16)
+    args = parser.parse_args()
+
+    teacher = TopicSegmentation(args.teacher)
+    corpus_keys = []
+    for case_path in find_case_folders():
+        segmented_paragraph = segment_case(read_case_text(case_path))
+        corpus_keys.append(
+            [key for key in segmented_paragraph if teacher.match_heading(key) is None]
+        )
+
+    teacher_predictions, teacher_speed = measure(teacher, corpus_keys, args.batch_size)
+    results = [{
+        "Model": args.teacher,
+        "Paragraphs/sec": teacher_speed,
+        "Speedup": 1.0,
+        "Agreement": 1.0,
+    }]
+
+    for student_path in args.students:
+        student = TopicSegmentation(student_path)
+        predictions, speed = measure(student, corpus_keys, args.batch_size)
+        results.append({
+            "Model": student_path,
+            "Paragraphs/sec": speed,
+            "Speedup": speed / teacher_speed,
+            "Agreement": float(np.mean(predictions == teacher_predictions)),
+        })
+
+    print(f"Paragraphs per model: {len(teacher_predictions)}")
+    print(tabulate(results, headers="keys", tablefmt="grid", floatfmt=".4f"))
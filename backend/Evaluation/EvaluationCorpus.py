@@ -0,0 +1,109 @@
+# =============================================================================
+# Program Title: Evaluation Corpus Loading Helpers
+# Programmer: Jewell Anne Diamante
+# Date Written: October 17, 2026
+# Date Revised: October 17, 2026
+#
+# Purpose:
+#     This program gathers the court cases stored under Evaluation/Court_Cases
+#     and prepares them the same way the application does before segmentation,
+#     so that the evaluation and benchmark scripts all measure the system on
+#     identical inputs.
+#
+# Where the program fits in the general system design:
+#     It is shared by the evaluation scripts that compare inference backends,
+#     model variants and summarization settings on the evaluation corpus.
+#
+# Data Structures, Algorithms, and Control:
+#     - Data Structures:
+#         - **List (`case_folders`)**: Paths of the case folders that contain
+#           the requested file.
+#         - **Dictionary (`segmented_paragraph`)**: Paragraph keys mapped to
+#           the original paragraphs, as produced by `preprocess.segment_paragraph`.
+#         - **List (`labeled_paragraphs`)**: (paragraph, label) pairs read from
+#           a segmentation file.
+#     - Algorithms:
+#         - **Folder Discovery**: Walks the corpus folder for case folders.
+#         - **Segmentation File Parsing**: Assigns every paragraph the label
+#           of the last 'FACTS:', 'ISSUES:' or 'RULINGS:' marker above it.
+#     - Control:
+#         - The functions are called by the evaluation scripts, which are run
+#           from the backend folder, e.g. `python -m Evaluation.BackendParity`.
+# =============================================================================
+
+
+import os
+
+from Custom_Modules.Preprocess import preprocess
+
+
+CORPUS_FOLDER = "Evaluation/Court_Cases"
+
+_preprocessor = None
+
+
+def find_case_folders(main_folder=CORPUS_FOLDER, required_file="court case.txt"):
+    """
+    Finds every case folder below the main folder that contains a given file.
+
+    :param main_folder: The root folder of the evaluation corpus.
+    :param required_file: The file a case folder must contain.
+    :return: A sorted list of case folder paths.
+    """
+    case_folders = []
+    for folder, _, files in os.walk(main_folder):
+        if required_file in files:
+            case_folders.append(folder)
+    return sorted(case_folders)
+
+
+def read_case_text(case_path, file_name="court case.txt", encoding="utf-8"):
+    """
+    Reads a text file from a case folder.
+
+    :param case_path: The case folder.
+    :param file_name: The file to read.
+    :param encoding: Encoding format used to read the file.
+    :return: The content of the file.
+    """
+    with open(os.path.join(case_path, file_name), "r", encoding=encoding) as file:
+        return file.read()
+
+
+def segment_case(case_text):
+    """
+    Cleans and segments a court case exactly like the summarization endpoint.
+
+    :param case_text: The raw text of the court case.
+    :return: A dictionary of paragraph keys mapped to the original paragraphs.
+    """
+    global _preprocessor
+    if _preprocessor is None:
+        _preprocessor = preprocess(is_training=False)
+
+    cleaned_text = _preprocessor.remove_unnecesary_char(case_text)
+    return _preprocessor.segment_paragraph(cleaned_text, case_text)
+
+
+def load_labeled_paragraphs(file_path, encoding="utf-8"):
+    """
+    Loads the paragraphs of a segmentation file together with their labels.
+
+    :param file_path: Path to the segmentation file.
+    :param encoding: Encoding format used to read the file.
+    :return: A list of (paragraph, label) tuples, with labels 'facts',
+             'issues' or 'rulings'.
+    """
+    boundary_labels = {"FACTS:": "facts", "ISSUES:": "issues", "RULINGS:": "rulings"}
+    labeled_paragraphs = []
+    label = None
+
+    with open(file_path, "r", encoding=encoding, errors="replace") as file:
+        for line in file:
+            line = line.strip()
+            if line in boundary_labels:
+                label = boundary_labels[line]
+            elif line and label is not None:
+                labeled_paragraphs.append((line, label))
+
+    return labeled_paragraphs
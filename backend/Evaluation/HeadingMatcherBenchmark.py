@@ -0,0 +1,97 @@
+# =============================================================================
+# Program Title: Heading Matcher Microbenchmark
+# Programmer: Jewell Anne Diamante
+# Date Written: October 17, 2026
+# Date Revised: October 17, 2026
+#
+# Purpose:
+#     This program times the original heading detection (a `fuzz.ratio` loop
+#     over every heading for every paragraph) against the precompiled
+#     HeadingMatcher on the paragraph keys of the evaluation corpus, and
+#     checks that both detect exactly the same headings.
+#
+# Where the program fits in the general system design:
+#     It backs the switch of TopicSegmentation to HeadingMatcher.
+#
+# Data Structures, Algorithms, and Control:
+#     - Data Structures:
+#         - **List (`results`)**: Per-case paragraph counts, timings and the
+#           number of disagreements.
+#     - Algorithms:
+#         - **Timing**: Best of several runs with `time.perf_counter`.
+#     - Control:
+#         - Run from the backend folder:
+#           python -m Evaluation.HeadingMatcherBenchmark
+# =============================================================================
+
+
+import os
+import time
+
+from fuzzywuzzy import fuzz
+from tabulate import tabulate
+
+from Custom_Modules.HeadingMatcher import HeadingMatcher
+from Custom_Modules.TopicSegmentation import FACTS_HEADINGS, ISSUES_HEADINGS, RULING_HEADINGS
+from Evaluation.EvaluationCorpus import find_case_folders, read_case_text, segment_case
+
+
+HEADINGS = {"facts": FACTS_HEADINGS, "issues": ISSUES_HEADINGS, "rulings": RULING_HEADINGS}
+
+
+def legacy_match(line, threshold=75):
+    """
+    The original heading detection of TopicSegmentation.
+
+    :param line: The paragraph key to check.
+    :param threshold: The minimum `fuzz.ratio` for a match.
+    :return: The matching label, or None.
+    """
+    line_lower = line.lower()
+    for label, headings in HEADINGS.items():
+        for heading in headings:
+            if fuzz.ratio(line_lower, heading.lower()) >= threshold:
+                return label
+    return None
+
+
+def best_time(function, repeat=3):
+    """
+    Runs a function several times and returns its result and fastest time.
+    """
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+# Main Program
+if __name__ == "__main__":
+    matcher = HeadingMatcher(HEADINGS)
+    results = []
+
+    for idx, case_path in enumerate(find_case_folders(), start=1):
+        keys = list(segment_case(read_case_text(case_path)))
+
+        legacy_labels, legacy_time = best_time(lambda: [legacy_match(key) for key in keys])
+        fast_labels, fast_time = best_time(lambda: matcher.match(keys))
+
+        results.append({
+            "No.": idx,
+            "GR Title": os.path.basename(case_path),
+            "Paragraphs": len(keys),
+            "Headings": sum(label is not None for label in legacy_labels),
+            "fuzz.ratio loop (ms)": legacy_time * 1000,
+            "HeadingMatcher (ms)": fast_time * 1000,
+            "Speedup": legacy_time / fast_time if fast_time else float("inf"),
+            "Disagreements": sum(a != b for a, b in zip(legacy_labels, fast_labels)),
+        })
+
+    print(tabulate(results, headers="keys", tablefmt="grid", floatfmt=".2f"))
+
+    legacy_total = sum(row["fuzz.ratio loop (ms)"] for row in results)
+    fast_total = sum(row["HeadingMatcher (ms)"] for row in results)
+    print(f"Total: {legacy_total:.1f} ms -> {fast_total:.1f} ms ({legacy_total / fast_total:.1f}x)")
+    print(f"Disagreements: {sum(row['Disagreements'] for row in results)}")
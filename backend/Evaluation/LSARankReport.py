@@ -0,0 +1,165 @@
+# =============================================================================
+# Program Title: LSA Rank Policy Benchmark and ROUGE Comparison
+# Programmer: Jewell Anne Diamante
+# Date Written: October 17, 2026
+# Date Revised: October 17, 2026
+#
+# Purpose:
+#     This program summarizes every segmented case in the evaluation corpus
+#     twice: with the full-rank SVD the LSA used before, and with a bounded
+#     rank policy (a fixed rank cap, an explained-variance target or both).
+#     For each case it reports the time spent in the SVD and in the whole
+#     summarization, and the ROUGE F1 of the bounded summary against the
+#     full-rank summary and against the human summary. A scaling run then
+#     repeats the corpus paragraphs to show how both policies grow with the
+#     number of paragraphs.
+#
+# Where the program fits in the general system design:
+#     It is used to choose the LSA_MAX_RANK and LSA_VARIANCE_TARGET of the
+#     application.
+#
+# Data Structures, Algorithms, and Control:
+#     - Data Structures:
+#         - **Dictionary (`text_dict`)**: The 'facts', 'issues' and 'rulings'
+#           (paragraph, probability) lists of a case, read from its
+#           LSATP_segments.txt file with a probability of 1.0.
+#         - **List (`results`)**: Per-case timings, ranks and ROUGE scores.
+#     - Algorithms:
+#         - **ROUGE**: ROUGE-1, ROUGE-2 and ROUGE-L F1 from `rouge_score`.
+#     - Control:
+#         - Run from the backend folder:
+#           python -m Evaluation.LSARankReport --max-rank 100
+# =============================================================================
+
+
+import argparse
+import os
+import time
+
+from rouge_score import rouge_scorer
+from tabulate import tabulate
+
+from Custom_Modules.LSA import LSA
+from Evaluation.EvaluationCorpus import find_case_folders, load_labeled_paragraphs, read_case_text
+
+
+ROUGE_TYPES = ["rouge1", "rouge2", "rougeL"]
+
+
+def build_text_dict(labeled_paragraphs):
+    """
+    Groups (paragraph, label) pairs into the LSA input, with every paragraph
+    given a probability of 1.0.
+    """
+    text_dict = {"facts": [], "issues": [], "rulings": []}
+    for paragraph, label in labeled_paragraphs:
+        text_dict[label].append((paragraph, 1.0))
+    return text_dict
+
+
+def summary_text(summary):
+    """
+    Joins the sections of an LSA summary into one text.
+    """
+    return "\n".join(summary[label] for label in ("facts", "issues", "rulings"))
+
+
+def time_summary(text_dict, **lsa_kwargs):
+    """
+    Summarizes a case and measures the SVD and the whole summarization.
+
+    :param text_dict: The LSA input of the case.
+    :param lsa_kwargs: The rank policy of the LSA.
+    :return: The summary text, its SVD rank, the SVD time and the total time.
+    """
+    lsa = LSA(text_dict, **lsa_kwargs)
+
+    # The SVD alone, on the same term matrix create_summary builds
+    sentences, _, _ = lsa.preprocess_text()
+    term_matrix, _ = lsa.create_term_matrix(sentences)
+    start = time.perf_counter()
+    svd_matrix = lsa.apply_svd(term_matrix)
+    svd_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    summary = lsa.create_summary()
+    total_time = time.perf_counter() - start
+
+    return summary_text(summary), svd_matrix.shape[1], svd_time, total_time
+
+
+def rouge_f1(scorer, reference, candidate):
+    """
+    Returns the ROUGE F1 scores of a candidate text against a reference text.
+    """
+    scores = scorer.score(reference, candidate)
+    return [scores[rouge_type].fmeasure for rouge_type in ROUGE_TYPES]
+
+
+# Main Program
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare a bounded LSA rank with full rank.")
+    parser.add_argument("--max-rank", type=int, default=100)
+    parser.add_argument("--variance-target", type=float, default=None)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+
+    policy = {"max_rank": args.max_rank, "variance_target": args.variance_target}
+    scorer = rouge_scorer.RougeScorer(ROUGE_TYPES, use_stemmer=True)
+
+    results = []
+    corpus_paragraphs = []
+    case_paths = find_case_folders(required_file="LSATP_segments.txt")
+    for idx, case_path in enumerate(case_paths, start=1):
+        labeled_paragraphs = load_labeled_paragraphs(os.path.join(case_path, "LSATP_segments.txt"))
+        if not labeled_paragraphs:
+            continue
+        corpus_paragraphs.extend(labeled_paragraphs)
+        text_dict = build_text_dict(labeled_paragraphs)
+
+        full_summary, full_rank, full_svd, full_total = time_summary(text_dict)
+        bounded_summary, rank, bounded_svd, bounded_total = time_summary(text_dict, **policy)
+
+        row = {
+            "No.": idx,
+            "GR Title": os.path.basename(case_path),
+            "Paragraphs": len(labeled_paragraphs),
+            "Rank": f"{rank}/{full_rank}",
+            "SVD Full (s)": full_svd,
+            "SVD Bounded (s)": bounded_svd,
+            "Total Full (s)": full_total,
+            "Total Bounded (s)": bounded_total,
+        }
+        row.update(zip(["R1 vs Full", "R2 vs Full", "RL vs Full"],
+                       rouge_f1(scorer, full_summary, bounded_summary)))
+
+        if os.path.isfile(os.path.join(case_path, "human summary.txt")):
+            human_summary = read_case_text(case_path, "human summary.txt")
+            row["R1 Human Full"], _, row["RL Human Full"] = rouge_f1(scorer, human_summary, full_summary)
+            row["R1 Human Bounded"], _, row["RL Human Bounded"] = rouge_f1(scorer, human_summary, bounded_summary)
+
+        results.append(row)
+
+    print(tabulate(results, headers="keys", tablefmt="grid", floatfmt=".3f"))
+
+    for column in ["R1 vs Full", "R2 vs Full", "RL vs Full"]:
+        print(f"Mean {column}: {sum(row[column] for row in results) / len(results):.4f}")
+    full_total = sum(row["Total Full (s)"] for row in results)
+    bounded_total = sum(row["Total Bounded (s)"] for row in results)
+    print(f"Total: {full_total:.2f}s -> {bounded_total:.2f}s ({full_total / bounded_total:.2f}x)")
+
+    # Scaling with the number of paragraphs
+    scaling = []
+    for scale in args.scales:
+        text_dict = build_text_dict(corpus_paragraphs * scale)
+        _, full_rank, full_svd, _ = time_summary(text_dict)
+        _, rank, bounded_svd, _ = time_summary(text_dict, **policy)
+        scaling.append({
+            "Paragraphs": len(corpus_paragraphs) * scale,
+            "Rank": f"{rank}/{full_rank}",
+            "SVD Full (s)": full_svd,
+            "SVD Bounded (s)": bounded_svd,
+            "Speedup": full_svd / bounded_svd if bounded_svd else float("inf"),
+        })
+
+    print(tabulate(scaling, headers="keys", tablefmt="grid", floatfmt=".3f"))
@@ -0,0 +1,148 @@
+# =============================================================================
+# Program Title: Int8 Quantization Report for the Paragraph Classifier
+# Programmer: Jewell Anne Diamante
+# Date Written: October 17, 2026
+# Date Revised: October 17, 2026
+#
+# Purpose:
+#     This program compares the dynamically quantized (int8) paragraph
+#     classifier with the full-precision model. It reports the memory saved by
+#     quantization, the inference speedup, and the segmentation accuracy of
+#     both models against the human segmentations of the held-out structured
+#     cases, together with how often the two models agree.
+#
+# Where the program fits in the general system design:
+#     It is used to decide whether the application can run with the
+#     "quantized" inference backend of TopicSegmentation.
+#
+# Data Structures, Algorithms, and Control:
+#     - Data Structures:
+#         - **List (`results`)**: Per-case paragraph counts, accuracies and
+#           label agreement of the two models.
+#     - Algorithms:
+#         - **Model Size**: The serialized size of each model's state dict.
+#         - **Throughput**: Paragraphs classified per second by each model.
+#         - **Segmentation Accuracy**: Paragraph labels from
+#           `sequence_classification` compared with the human segments.
+#     - Control:
+#         - Run from the backend folder: python -m Evaluation.QuantizationReport
+# =============================================================================
+
+
+import argparse
+import io
+import os
+import time
+
+import torch
+from tabulate import tabulate
+
+from Custom_Modules.TopicSegmentation import TopicSegmentation
+from Evaluation.EvaluationCorpus import (
+    find_case_folders,
+    load_labeled_paragraphs,
+    read_case_text,
+    segment_case,
+)
+
+
+def model_size_mb(model):
+    """
+    Computes the serialized size of a model's weights.
+
+    :param model: A PyTorch model.
+    :return: The size of its state dict in megabytes.
+    """
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.getbuffer().nbytes / (1024 * 1024)
+
+
+def segmentation_accuracy(predicted_labels, human_labels):
+    """
+    Compares predicted paragraph labels with the human segmentation.
+
+    :param predicted_labels: Output of `TopicSegmentation.sequence_classification`.
+    :param human_labels: A dictionary of paragraphs mapped to their human label.
+    :return: A tuple with the number of compared paragraphs and correct labels.
+    """
+    compared, correct = 0, 0
+    for paragraph, (label, _) in predicted_labels.items():
+        if paragraph in human_labels:
+            compared += 1
+            correct += int(human_labels[paragraph] == label)
+    return compared, correct
+
+
+# Main Program
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the int8 and full-precision classifiers.")
+    parser.add_argument("--model-path", default="jijemini/case-bart")
+    parser.add_argument("--cache-dir", default="instance/quantized_models")
+    parser.add_argument("--batch-size", type=int, default=16)
+    args = parser.parse_args()
+
+    full_precision = TopicSegmentation(args.model_path, backend="torch")
+    quantized = TopicSegmentation(
+        args.model_path, backend="quantized", quantized_cache_dir=args.cache_dir
+    )
+
+    results = []
+    keys_per_case = []
+    for idx, case_path in enumerate(
+        find_case_folders("Evaluation/Court_Cases/Structured", "human segments.txt"), start=1
+    ):
+        segmented_paragraph = segment_case(read_case_text(case_path))
+        human_labels = dict(load_labeled_paragraphs(os.path.join(case_path, "human segments.txt")))
+        keys_per_case.append(
+            [key for key in segmented_paragraph if full_precision.match_heading(key) is None]
+        )
+
+        fp32_labels = full_precision.sequence_classification(
+            segmented_paragraph, threshold=0.8, batch_size=args.batch_size
+        )
+        int8_labels = quantized.sequence_classification(
+            segmented_paragraph, threshold=0.8, batch_size=args.batch_size
+        )
+
+        compared, fp32_correct = segmentation_accuracy(fp32_labels, human_labels)
+        _, int8_correct = segmentation_accuracy(int8_labels, human_labels)
+        agreement = sum(
+            fp32_labels[paragraph][0] == int8_labels[paragraph][0] for paragraph in fp32_labels
+        )
+
+        results.append({
+            "No.": idx,
+            "GR Title": os.path.basename(case_path),
+            "Paragraphs": compared,
+            "FP32 Accuracy": fp32_correct / compared if compared else 0.0,
+            "INT8 Accuracy": int8_correct / compared if compared else 0.0,
+            "Agreement": agreement / len(fp32_labels) if fp32_labels else 0.0,
+        })
+
+    print(tabulate(results, headers="keys", tablefmt="grid", floatfmt=".4f"))
+
+    # Time both models on the same paragraphs
+    timings = {}
+    for name, segmentation in [("fp32", full_precision), ("int8", quantized)]:
+        segmentation.warm_up()
+        start = time.perf_counter()
+        for keys in keys_per_case:
+            segmentation.predict_probabilities(keys, batch_size=args.batch_size)
+        timings[name] = time.perf_counter() - start
+
+    total_paragraphs = sum(len(keys) for keys in keys_per_case)
+    fp32_size = model_size_mb(full_precision.model)
+    int8_size = model_size_mb(quantized.model)
+
+    print(tabulate(
+        [
+            ["FP32", fp32_size, total_paragraphs / timings["fp32"]],
+            ["INT8", int8_size, total_paragraphs / timings["int8"]],
+        ],
+        headers=["Model", "Size (MB)", "Paragraphs/sec"],
+        tablefmt="grid",
+        floatfmt=".2f",
+    ))
+    print(f"Memory saved: {fp32_size - int8_size:.2f} MB ({1 - int8_size / fp32_size:.2%})")
+    print(f"Speedup: {timings['fp32'] / timings['int8']:.2f}x")
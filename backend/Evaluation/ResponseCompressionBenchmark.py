@@ -0,0 +1,156 @@
+# =============================================================================
+# Program Title: Conditional Request and Response Compression Benchmark
+# Programmer: Jewell Anne Diamante
+# Date Written: October 17, 2026
+# Date Revised: October 17, 2026
+#
+# Purpose:
+#     This program measures what the ETags and compression of the read
+#     endpoints save on the evaluation corpus. For every case it builds the
+#     responses of `/get-file/<id>` and `/get-summarized/<id>`, and reports
+#     their size and build time uncompressed, gzip-compressed and (if the
+#     brotli package is installed) brotli-compressed, with the transfer time
+#     at a given bandwidth. Reopening an unchanged case costs a 304 with no
+#     body, whose time is reported as well.
+#
+# Where the program fits in the general system design:
+#     It is used to choose COMPRESSION_LEVEL and COMPRESSION_MIN_BYTES of the
+#     application, and uses the same functions as its endpoints.
+#
+# Data Structures, Algorithms, and Control:
+#     - Data Structures:
+#         - **Dictionary (`payloads`)**: The file and summary responses of a
+#           case, as the endpoints return them.
+#         - **List (`results`)**: Bytes and times per case and encoding.
+#     - Algorithms:
+#         - **Timing**: Best of several runs with `time.perf_counter`.
+#         - **Transfer Time**: Response bytes over the given bandwidth.
+#     - Control:
+#         - Run from the backend folder:
+#           python -m Evaluation.ResponseCompressionBenchmark --bandwidth-mbps 10
+# =============================================================================
+
+
+import argparse
+import json
+import os
+import time
+
+from tabulate import tabulate
+
+from Custom_Modules.ResponseCompression import available_encodings, compress, entity_tag
+from Evaluation.EvaluationCorpus import find_case_folders, load_labeled_paragraphs, read_case_text
+
+
+def case_payloads(case_id, case_path):
+    """
+    Builds the `/get-file/<id>` and `/get-summarized/<id>` responses of a
+    case, using its LSATP summary as the stored summary.
+    """
+    case_text = read_case_text(case_path)
+    sections = {"facts": [], "issues": [], "rulings": []}
+    for paragraph, label in load_labeled_paragraphs(os.path.join(case_path, "LSATP_summary.txt")):
+        sections[label].append(paragraph)
+    summary = {label: "\n".join(paragraphs) for label, paragraphs in sections.items()}
+
+    title = os.path.basename(case_path)
+    return {
+        "File": {
+            "id": case_id,
+            "file_name": title,
+            "file_orig_text": case_text,
+            "file_text": case_text,
+            "file_summary": 1,
+            "file_facts": summary["facts"],
+            "file_issues": summary["issues"],
+            "file_rulings": summary["rulings"],
+            "file_summary_spans": None,
+        },
+        "Summary": {"title": title, "spans": None, **summary},
+    }
+
+
+def serialize(payload):
+    """
+    Serializes a payload like the application's JSON provider.
+    """
+    return json.dumps(payload, ensure_ascii=True, sort_keys=True).encode("utf-8")
+
+
+def best_time(function, repeat=5):
+    """
+    Runs a function several times and returns its result and fastest time.
+    """
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def transfer_time(num_bytes, bandwidth_mbps):
+    """
+    Returns the seconds needed to send a number of bytes at a bandwidth.
+    """
+    return num_bytes * 8 / (bandwidth_mbps * 1_000_000)
+
+
+# Main Program
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark ETags and compression of the read endpoints.")
+    parser.add_argument("--level", type=int, default=6)
+    parser.add_argument("--bandwidth-mbps", type=float, default=10.0)
+    args = parser.parse_args()
+
+    encodings = ["identity"] + available_encodings()
+    if "br" not in encodings:
+        print("brotli is not installed, only gzip is measured\n")
+
+    results = []
+    totals = {}
+    case_paths = [
+        case_path for case_path in find_case_folders()
+        if os.path.isfile(os.path.join(case_path, "LSATP_summary.txt"))
+    ]
+    for case_id, case_path in enumerate(case_paths, start=1):
+        for endpoint, payload in case_payloads(case_id, case_path).items():
+            row = {"No.": case_id, "GR Title": os.path.basename(case_path)[:30], "Response": endpoint}
+
+            for encoding in encodings:
+                def build():
+                    body = serialize(payload)
+                    return body if encoding == "identity" else compress(body, encoding, args.level)
+
+                body, build_seconds = best_time(build)
+                row[f"{encoding} (KB)"] = len(body) / 1024
+                row[f"{encoding} (ms)"] = (build_seconds + transfer_time(len(body), args.bandwidth_mbps)) * 1000
+
+                total = totals.setdefault((endpoint, encoding), [0, 0.0])
+                total[0] += len(body)
+                total[1] += build_seconds + transfer_time(len(body), args.bandwidth_mbps)
+
+            # Reopening an unchanged case: only the ETag is computed
+            _, tag_seconds = best_time(lambda: entity_tag(endpoint, case_id, case_id))
+            row["304 (ms)"] = tag_seconds * 1000
+            total = totals.setdefault((endpoint, "304"), [0, 0.0])
+            total[1] += tag_seconds
+
+            results.append(row)
+
+    print(tabulate(results, headers="keys", tablefmt="grid", floatfmt=".2f"))
+    print(f"Times include the transfer at {args.bandwidth_mbps:g} Mbps.\n")
+
+    summary = []
+    for (endpoint, encoding), (num_bytes, seconds) in totals.items():
+        identity_bytes, identity_seconds = totals[(endpoint, "identity")]
+        summary.append({
+            "Response": endpoint,
+            "Encoding": encoding,
+            "Total (KB)": num_bytes / 1024,
+            "Bytes Saved": f"{1 - num_bytes / identity_bytes:.1%}",
+            "Total (ms)": seconds * 1000,
+            "Latency Saved": f"{1 - seconds / identity_seconds:.1%}",
+        })
+
+    print(tabulate(summary, headers="keys", tablefmt="grid", floatfmt=".2f"))
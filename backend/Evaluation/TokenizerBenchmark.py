@@ -0,0 +1,99 @@
+# =============================================================================
+# Program Title: Tokenizer Microbenchmark
+# Programmer: Jewell Anne Diamante
+# Date Written: October 17, 2026
+# Date Revised: October 17, 2026
+#
+# Purpose:
+#     This program times the tokenization of the longest paragraph keys of the
+#     evaluation corpus with the original slow BartTokenizer, the slow
+#     tokenizer after pre-truncation, a rerun served from the token id cache,
+#     and the opt-in fast (Rust) tokenizer on the full text and after
+#     pre-truncation. It also counts the keys whose token ids differ from the
+#     original tokenizer; the fast tokenizer handles the model's added tokens
+#     differently, so it is expected to differ on some keys.
+#
+# Where the program fits in the general system design:
+#     It backs the tokenization path of TopicSegmentation (`encode`).
+#
+# Data Structures, Algorithms, and Control:
+#     - Data Structures:
+#         - **List (`keys`)**: The longest paragraph keys of the corpus.
+#         - **List (`results`)**: Timings and id mismatches per method.
+#     - Algorithms:
+#         - **Timing**: Best of several runs with `time.perf_counter`.
+#     - Control:
+#         - Run from the backend folder:
+#           python -m Evaluation.TokenizerBenchmark --top 500
+# =============================================================================
+
+
+import argparse
+import time
+
+from tabulate import tabulate
+from transformers import BartTokenizer, BartTokenizerFast
+
+from Custom_Modules.TopicSegmentation import MAX_LENGTH, TopicSegmentation
+from Evaluation.EvaluationCorpus import find_case_folders, read_case_text, segment_case
+
+
+def best_time(function, repeat=3, setup=None):
+    """
+    Runs a function several times and returns its result and fastest time.
+    """
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+# Main Program
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the paragraph tokenization paths.")
+    parser.add_argument("--model-path", default="jijemini/case-bart")
+    parser.add_argument("--top", type=int, default=500, help="Number of longest keys to tokenize.")
+    args = parser.parse_args()
+
+    keys = []
+    for case_path in find_case_folders():
+        keys.extend(segment_case(read_case_text(case_path)))
+    keys = sorted(set(keys), key=len, reverse=True)[:args.top]
+    print(f"Keys: {len(keys)}, characters: {len(keys[-1])} to {len(keys[0])}")
+
+    slow_tokenizer = BartTokenizer.from_pretrained(args.model_path)
+    fast_tokenizer = BartTokenizerFast.from_pretrained(args.model_path)
+    segmentation = TopicSegmentation(args.model_path)
+    fast_segmentation = TopicSegmentation(args.model_path, fast_tokenizer=True)
+
+    def tokenize(tokenizer, texts):
+        return tokenizer(texts, max_length=MAX_LENGTH, truncation=True)["input_ids"]
+
+    reference, slow_time = best_time(lambda: tokenize(slow_tokenizer, keys))
+    methods = [
+        ("BartTokenizer, full text", reference, slow_time),
+        ("BartTokenizer, pre-truncated", *best_time(
+            lambda: segmentation.encode(keys), setup=segmentation.token_cache.clear
+        )),
+        ("Token id cache (rerun)", *best_time(lambda: segmentation.encode(keys))),
+        ("BartTokenizerFast, full text", *best_time(lambda: tokenize(fast_tokenizer, keys))),
+        ("BartTokenizerFast, pre-truncated", *best_time(
+            lambda: fast_segmentation.encode(keys), setup=fast_segmentation.token_cache.clear
+        )),
+    ]
+
+    results = []
+    for name, input_ids, elapsed in methods:
+        results.append({
+            "Method": name,
+            "Time (ms)": elapsed * 1000,
+            "Keys/sec": len(keys) / elapsed if elapsed else float("inf"),
+            "Speedup": slow_time / elapsed if elapsed else float("inf"),
+            "Mismatches": sum(ids != expected for ids, expected in zip(input_ids, reference)),
+        })
+
+    print(tabulate(results, headers="keys", tablefmt="grid", floatfmt=".2f"))
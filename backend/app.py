@@ -2,7 +2,7 @@
 # Program Title: Legal Document Analysis Application
 # Programmers: Nicholas Dela Torre, Jewell Anne Diamante, Miguel Tolentino
 # Date Written: October 12, 2024
-# Date Revised: January 24, 2025
+# Date Revised: October 17, 2026
 #
 # Purpose:
 #     This application serves as the main entry point for a comprehensive
@@ -53,25 +53,40 @@
 
 
 # Import required libraries and modules
-from flask import Flask, request, jsonify  # Flask for the web server
+from flask import Flask, Response, request, jsonify  # Flask for the web server
 from flask_sqlalchemy import SQLAlchemy    # For database interactions
 from flask_cors import CORS                # To handle cross-origin requests
-from sqlalchemy.orm import declarative_base  # For SQLAlchemy models
+from sqlalchemy.orm import declarative_base, load_only, selectinload  # For SQLAlchemy models and column projection
+from sqlalchemy.orm.util import identity_key  # For finding loaded stored contents
+from sqlalchemy import delete, event, func, insert, inspect, or_, select, text, union  # For schema migrations, the change feed and the content store
 from bs4 import BeautifulSoup              # For parsing HTML content
 import requests                            # For making HTTP requests
 import re                                  # For pattern matching
 import os                                  # For OS-level interactions
 import spacy                               # For NLP tasks
-import base64                              # For encoding and decoding data
+from urllib.parse import quote             # For download file names
+import sqlite3                             # For streaming stored contents
+import json                                # For Server-Sent Event payloads and frame offsets
+import numpy as np                         # For stored classifier probabilities
+import multiprocessing                     # For the start method of the LSA workers
+import threading                           # For starting the services once
+from concurrent.futures import ProcessPoolExecutor  # For running LSA in worker processes
 
 
 # Import custom modules
 from Custom_Modules.Preprocess import preprocess  
-from Custom_Modules.TopicSegmentation import TopicSegmentation  
-from Custom_Modules.LSA import LSA                
-
-# Initialize the preprocessor instance
-preprocessor = preprocess(is_training=False)
+from Custom_Modules.ModelRegistry import ModelRegistry
+from Custom_Modules.InferenceScheduler import InferenceScheduler
+from Custom_Modules.SummarizationJobs import JobManager
+from Custom_Modules.BulkSummarization import bulk_summarize
+from Custom_Modules.CorpusIDF import CorpusIDF
+from Custom_Modules.LSA import LSA, paragraph_offsets
+from Custom_Modules.ClassificationCache import ClassificationCache
+from Custom_Modules.ResponseCompression import available_encodings, compress, entity_tag, representation_tag
+from Custom_Modules.ContentStore import compress_content, content_hash, decompress_content, read_content_range
+
+# The preprocessor instance, initialized by init_app_services
+preprocessor = None
 
 # Set up the Flask application and enable CORS
 app = Flask(__name__)
@@ -81,11 +96,39 @@ CORS(app)
 app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///test.db"
 db = SQLAlchemy(app)
 
+# Segmentation model served by every request, overridable for new model directories
+app.config["MODEL_PATH"] = os.environ.get("CASE_BART_MODEL_PATH", "jijemini/case-bart")
+app.config["MODEL_BACKEND"] = os.environ.get("CASE_BART_BACKEND", "torch")  # "torch", "quantized" or "onnx"
+app.config["MODEL_DIRECTORIES"] = {}  # Model names /reload-model may switch to, mapped to local model directories
+app.config["MODEL_READY_TIMEOUT"] = 120  # Seconds a request waits for the model
+app.config["SEGMENTATION_BATCH_SIZE"] = 16  # Paragraphs per forward pass
+app.config["SEGMENTATION_DECODER"] = "threshold"  # "threshold" (previous-label rule) or "viterbi"
+app.config["SEGMENTATION_FAST_TOKENIZER"] = False  # Rust tokenizer, faster but changes the token ids of some paragraphs
+app.config["SCHEDULER_MAX_WAIT_MS"] = 10  # Wait window for coalescing concurrent requests
+app.config["SUMMARIZATION_WORKERS"] = 2  # Summarization jobs run at the same time
+app.config["SSE_HEARTBEAT_SECONDS"] = 15  # Idle time before a keep-alive comment is streamed
+app.config["LSA_WORKERS"] = min(4, os.cpu_count() or 1)  # Processes summarizing bulk requests
+app.config["LSA_MAX_RANK"] = None  # Largest SVD rank of the LSA, None allows full rank
+app.config["LSA_VARIANCE_TARGET"] = None  # Explained variance that bounds the SVD rank, e.g. 0.5
+app.config["LSA_CORPUS_IDF"] = False  # Weight terms with IDF from all stored cases instead of each case alone (opt-in, see Evaluation.CorpusIDFReport)
+app.config["BULK_COMMIT_BATCH_SIZE"] = 50  # Summaries stored per database transaction
+app.config["FILE_PAGE_SIZE"] = 500  # Files listed per page by default
+app.config["FILE_PAGE_SIZE_MAX"] = 1000  # Largest page a client may request
+app.config["COMPRESSION_ENABLED"] = True  # Compress JSON responses with gzip, or brotli if installed
+app.config["COMPRESSION_MIN_BYTES"] = 1024  # Smallest JSON response that is compressed
+app.config["COMPRESSION_LEVEL"] = 6  # gzip level (1-9), also used as the brotli quality
+app.config["CONTENT_ZSTD_LEVEL"] = 10  # zstd level (1-22) of the stored case texts and uploads
+app.config["CONTENT_FRAME_SIZE"] = 1024 * 1024  # Uncompressed bytes of each independently readable zstd frame
+app.config["DOWNLOAD_CHUNK_SIZE"] = 64 * 1024  # Bytes of a file's content streamed at a time
+app.config["CLASSIFICATION_CACHE_SIZE"] = 50000  # Paragraphs kept in the classification cache
+app.config["CASCADE_MODEL_PATH"] = os.environ.get("CASCADE_MODEL_PATH")  # Cheap first-stage classifier, None disables it
+app.config["CASCADE_THRESHOLD"] = 0.9  # Cheap-model confidence below which BART is used, set from Evaluation.CascadeReport's paragraph calibration before CASCADE_MODEL_PATH is set
+
 # Define the base for SQLAlchemy models
 Base = declarative_base()
 
-# Load the small English model for spaCy
-nlp = spacy.load("en_core_web_sm")
+# The small English model for spaCy, loaded by init_app_services
+nlp = None
 
 
 def scrape_court_case(url):
@@ -193,26 +236,138 @@ def scrape_court_case(url):
         return None
     
 
+# JSON fields of a file, mapped to the File attributes they are read from
+FILE_FIELDS = {
+    "id": "id",
+    "file_name": "file_name",
+    "file_orig_text": "file_orig_text",
+    "file_text": "file_text",
+    "file_summary": "file_has_summ",
+    "file_facts": "file_facts",
+    "file_issues": "file_issues",
+    "file_rulings": "file_rulings",
+    "file_summary_spans": "file_summary_spans",
+}  # The uploaded file content is not a field, it is streamed by /download-file/<id>
+FILE_BLOB_FIELDS = {
+    "file_orig_text": "orig_text_blob",
+    "file_text": "text_blob",
+}  # Fields stored in the content store, mapped to the File relationships holding them
+FILE_LIST_FIELDS = ["id", "file_name", "file_summary"]  # Default fields of the file list
+FILE_DETAIL_FIELDS = list(FILE_FIELDS)  # Default fields of a file
+BLOB_HASH_COLUMNS = ["orig_text_hash", "text_hash", "content_hash"]  # File columns referring to stored contents
+
+
+class ContentBlob(db.Model):
+    __tablename__ = "content_blob"
+
+    # Define columns in the database table
+    hash = db.Column(db.String, primary_key=True)   # SHA-256 of the uncompressed content
+    size = db.Column(db.Integer, nullable=False)    # Size of the uncompressed content in bytes
+    data = db.Column(db.LargeBinary, nullable=False)    # zstd-compressed content
+    frame_size = db.Column(db.Integer)  # Uncompressed bytes of each zstd frame, None for a single frame
+    frame_offsets = db.Column(db.Text)  # JSON list of the offset of each frame in data
+
+    @classmethod
+    def store(cls, content):
+        """
+        Returns the blob of a content, creating it only if no stored or pending
+        blob has the same hash, so identical contents share one row.
+        """
+        digest = content_hash(content)
+        blob = db.session.get(cls, digest)
+        if blob is None:
+            blob = next((obj for obj in db.session.new if isinstance(obj, cls) and obj.hash == digest), None)
+        if blob is None:
+            data, frame_offsets = compress_content(
+                content, app.config["CONTENT_ZSTD_LEVEL"], app.config["CONTENT_FRAME_SIZE"]
+            )
+            blob = cls(
+                hash=digest,
+                size=len(content),
+                data=data,
+                frame_size=app.config["CONTENT_FRAME_SIZE"],
+                frame_offsets=json.dumps(frame_offsets),
+            )
+            db.session.add(blob)
+        blob._content = content
+        return blob
+
+    def content(self):
+        """
+        Returns the uncompressed content, decompressing it on first use only.
+        """
+        if getattr(self, "_content", None) is None:
+            self._content = decompress_content(self.data)
+        return self._content
+
+
+def blob_property(relationship_name, is_text=True):
+    """
+    Description:
+    Builds a File attribute whose value is kept in the content store. Reading
+    it loads and decompresses the blob; assigning it stores the value (or
+    reuses the blob of an identical value) and points the file at it.
+
+    Parameters:
+    - relationship_name (str): The File relationship to the blob.
+    - is_text (bool): Whether the value is text (stored as UTF-8) or bytes.
+
+    Returns:
+    - property: The attribute.
+    """
+    def get_value(file):
+        blob = getattr(file, relationship_name)
+        if blob is None:
+            return None
+        return blob.content().decode("utf-8") if is_text else blob.content()
+
+    def set_value(file, value):
+        if value is None:
+            setattr(file, relationship_name, None)
+            return
+        content = value.encode("utf-8") if is_text else value
+        setattr(file, relationship_name, ContentBlob.store(content))
+
+    return property(get_value, set_value)
+
+
 class File(db.Model):
     __tablename__ = "file"
     
     # Define columns in the database table
     id = db.Column(db.Integer, primary_key=True)    # Unique ID for each file
     file_name = db.Column(db.String, nullable=False)    # Name of the file
-    file_orig_text = db.Column(db.String, nullable=False)   # Original file text
-    file_text = db.Column(db.String, nullable=False)    # Processed file text
+    orig_text_hash = db.Column(db.String, db.ForeignKey("content_blob.hash"), index=True)   # Content of the original file text
+    text_hash = db.Column(db.String, db.ForeignKey("content_blob.hash"), index=True)    # Content of the processed file text
     file_has_summ = db.Column(db.Integer, nullable=False, default=int(0))  # Indicator for whether the file has a summary (0 = No, 1 = Yes)
     file_facts = db.Column(db.String, nullable=False)   # Facts extracted from the file
     file_issues = db.Column(db.String, nullable=False)  # Issues extracted from the file
     file_rulings = db.Column(db.String, nullable=False) # Rulings extracted from the file
-    file_content = db.Column(db.LargeBinary)    # Binary content of the file
+    content_hash = db.Column(db.String, db.ForeignKey("content_blob.hash"), index=True)     # Binary content of the file
+    file_summary_spans = db.Column(db.Text)     # JSON offsets of the summary paragraphs in file_text
+    segmented_text_hash = db.Column(db.String)  # Content of the file text the stored segmentation was built from
+    change_seq = db.Column(db.Integer, nullable=False, default=1, index=True)  # Change counter value of the last insert or update
 
-    def to_json(self):
+    # Stored contents, loaded only when a handler reads them
+    orig_text_blob = db.relationship(ContentBlob, foreign_keys=[orig_text_hash])
+    text_blob = db.relationship(ContentBlob, foreign_keys=[text_hash])
+    content_blob = db.relationship(ContentBlob, foreign_keys=[content_hash])
+
+    file_orig_text = blob_property("orig_text_blob")    # Original file text
+    file_text = blob_property("text_blob")  # Processed file text
+    file_content = blob_property("content_blob", is_text=False)     # Binary content of the file
+
+    def to_json(self, fields=None):
         """
         Converts the File object to a JSON-compatible dictionary.
 
-        Encodes the binary file content to a Base64 string to ensure 
-        compatibility with JSON format.
+        The binary file content is not included; it is downloaded from
+        /download-file/<id>.
+
+        Args:
+            fields (list): The fields to include (keys of FILE_FIELDS). Only
+                  these attributes are read, so columns left out of the query
+                  are not loaded. Defaults to every field.
 
         Returns:
             dict: A dictionary containing the file's data, including:
@@ -224,36 +379,584 @@ class File(db.Model):
                   - file_facts: Extracted facts
                   - file_issues: Extracted issues
                   - file_rulings: Extracted rulings
-                  - file_content: Base64-encoded binary content
+                  - file_summary_spans: Location of each summary paragraph
+                    in file_text, per section
+        """
+        result = {}
+        for field in fields or FILE_FIELDS:
+            value = getattr(self, FILE_FIELDS[field])
+            if field == "file_summary_spans":
+                value = json.loads(value) if value else None
+            result[field] = value
+        return result
+
+
+class FileParagraph(db.Model):
+    __tablename__ = "file_paragraph"
+    __table_args__ = (db.Index("ix_file_paragraph_file_hash", "file_id", "paragraph_hash"),)
+
+    # Define columns in the database table
+    id = db.Column(db.Integer, primary_key=True)    # Unique ID for each paragraph
+    file_id = db.Column(db.Integer, db.ForeignKey("file.id"), nullable=False)   # File the paragraph belongs to
+    position = db.Column(db.Integer, nullable=False)    # Position of the paragraph in the file
+    paragraph_hash = db.Column(db.String, nullable=False)   # Hash of the paragraph key
+    paragraph_start = db.Column(db.Integer)     # Start offset of the paragraph in file_text
+    paragraph_end = db.Column(db.Integer)       # End offset of the paragraph in file_text
+    label = db.Column(db.String, nullable=False)    # Predicted label (facts, issues or rulings)
+    probability = db.Column(db.Float, nullable=False)   # Probability of the predicted label
+    is_heading = db.Column(db.Integer, nullable=False, default=int(0))  # Whether the paragraph is a section heading (0 = No, 1 = Yes)
+    probabilities = db.Column(db.LargeBinary)   # float32 classifier probabilities of every label, None for headings
+    lsa_position = db.Column(db.Integer)    # Position of the paragraph in the LSA input, None if it was not summarized
+    lsa_score = db.Column(db.Float)     # LSA relevance score used to rank the paragraph
+    lsa_row_sum = db.Column(db.Float)   # Sum of the paragraph's row of the SVD matrix, compared to the threshold
+    model_fingerprint = db.Column(db.String)    # Model, backend and cascade that computed the probabilities
+
+    def to_json(self):
+        """
+        Converts the FileParagraph object to a JSON-compatible dictionary.
+
+        Returns:
+            dict: The paragraph's position, location in the file text, label,
+                  probability, heading flag and classifier probabilities.
         """
         return {
-            "id": self.id,
-            "file_name": self.file_name,
-            "file_orig_text": self.file_orig_text,
-            "file_text": self.file_text,
-            "file_summary":self.file_has_summ,
-            "file_facts":self.file_facts,
-            "file_issues":self.file_issues,
-            "file_rulings":self.file_rulings,
-            "file_content": base64.b64encode(self.file_content).decode('utf-8') if self.file_content else None,
+            "position": self.position,
+            "start": self.paragraph_start,
+            "end": self.paragraph_end,
+            "label": self.label,
+            "probability": self.probability,
+            "is_heading": self.is_heading,
+            "probabilities": (
+                np.frombuffer(self.probabilities, dtype=np.float32).tolist()
+                if self.probabilities is not None else None
+            ),
         }
 
 
+class FileTombstone(db.Model):
+    __tablename__ = "file_tombstone"
+
+    # Define columns in the database table
+    file_id = db.Column(db.Integer, primary_key=True)   # ID of the deleted file
+    change_seq = db.Column(db.Integer, nullable=False, index=True)  # Change counter value of the deletion
+
+
+class FileChangeCounter(db.Model):
+    __tablename__ = "file_change_counter"
+
+    # Define columns in the database table
+    id = db.Column(db.Integer, primary_key=True)    # Always 1, the table has a single row
+    value = db.Column(db.Integer, nullable=False)   # Last change counter value given to a file change
+
+
+@event.listens_for(db.session, "before_flush")
+def record_file_changes(session, flush_context, instances):
+    """
+    Description:
+    Gives every file inserted, updated or deleted in a flush its own change
+    counter value, and records a tombstone for every deleted file. The counter
+    row is incremented first, which takes SQLite's write lock, so concurrent
+    writers never hand out the same values.
+
+    Parameters:
+    - session (Session): The session being flushed.
+    - flush_context, instances: Unused, passed by SQLAlchemy.
+
+    Returns: None
+    """
+    changed_files = [obj for obj in session.new if isinstance(obj, File)]
+    changed_files += [
+        obj for obj in session.dirty if isinstance(obj, File) and session.is_modified(obj)
+    ]
+    deleted_files = [obj for obj in session.deleted if isinstance(obj, File)]
+    num_changes = len(changed_files) + len(deleted_files)
+    if num_changes == 0:
+        return
+
+    connection = session.connection()
+    connection.execute(
+        text("UPDATE file_change_counter SET value = value + :n WHERE id = 1"), {"n": num_changes}
+    )
+    last_seq = connection.execute(text("SELECT value FROM file_change_counter WHERE id = 1")).scalar()
+    change_seqs = iter(range(last_seq - num_changes + 1, last_seq + 1))
+
+    for file in changed_files:
+        file.change_seq = next(change_seqs)
+    with session.no_autoflush:
+        for file in deleted_files:
+            session.merge(FileTombstone(file_id=file.id, change_seq=next(change_seqs)))
+
+
+@event.listens_for(db.session, "after_flush")
+def clear_reused_tombstones(session, flush_context):
+    """
+    Description:
+    Removes the tombstone of a deleted file whose ID was given to a new file,
+    so a file ID is never both in the change feed and deleted.
+
+    Parameters:
+    - session (Session): The session being flushed.
+    - flush_context: Unused, passed by SQLAlchemy.
+
+    Returns: None
+    """
+    new_ids = [obj.id for obj in session.new if isinstance(obj, File)]
+    if new_ids:
+        session.connection().execute(
+            FileTombstone.__table__.delete().where(FileTombstone.file_id.in_(new_ids))
+        )
+
+
+@event.listens_for(db.session, "before_flush")
+def collect_released_blobs(session, flush_context, instances):
+    """
+    Description:
+    Remembers the stored contents that updated and deleted files referred to
+    before the flush, so those no file refers to anymore can be deleted once
+    the flush has written the new references.
+
+    Parameters:
+    - session (Session): The session being flushed.
+    - flush_context, instances: Unused, passed by SQLAlchemy.
+
+    Returns: None
+    """
+    released = session.info.setdefault("released_blob_hashes", set())
+    for file in list(session.dirty) + list(session.deleted):
+        if not isinstance(file, File):
+            continue
+        state = inspect(file)
+        for column in BLOB_HASH_COLUMNS:
+            # Only the references read from the database are known
+            old_hash = state.attrs[column].loaded_value
+            if isinstance(old_hash, str):
+                released.add(old_hash)
+
+
+@event.listens_for(db.session, "after_flush")
+def delete_released_blobs(session, flush_context):
+    """
+    Description:
+    Keeps the content store in step with the files in the same transaction:
+    the released contents that no file refers to anymore are deleted, and a
+    stored content that a file now refers to is written again in case another
+    request deleted it after this one looked it up. The flush already holds
+    SQLite's write lock, so no other request can change either until commit.
+
+    Parameters:
+    - session (Session): The session being flushed.
+    - flush_context: Unused, passed by SQLAlchemy.
+
+    Returns: None
+    """
+    connection = session.connection()
+
+    # Reused contents are written again if they were deleted meanwhile
+    referenced = {
+        getattr(file, column)
+        for file in session.new | session.dirty if isinstance(file, File)
+        for column in BLOB_HASH_COLUMNS
+    }
+    for digest in referenced - {None}:
+        blob = session.identity_map.get(identity_key(ContentBlob, digest))
+        if blob is None or blob in session.new or "data" not in inspect(blob).dict:
+            continue
+        connection.execute(
+            insert(ContentBlob).prefix_with("OR IGNORE"),
+            {"hash": blob.hash, "size": blob.size, "data": blob.data},
+        )
+
+    released = session.info.pop("released_blob_hashes", set()) - referenced
+    if released:
+        still_referenced = or_(*[
+            getattr(File, column) == ContentBlob.hash for column in BLOB_HASH_COLUMNS
+        ])
+        connection.execute(
+            delete(ContentBlob).where(
+                ContentBlob.hash.in_(released),
+                ~select(File.id).where(still_referenced).exists(),
+            )
+        )
+
+
+def requested_file_fields(default_fields):
+    """
+    Description:
+    Reads the comma-separated "fields" query parameter of a file request.
+
+    Parameters:
+    - default_fields (list): The fields used when the parameter is missing.
+
+    Returns:
+    - list: The requested fields, always including "id".
+
+    Raises:
+    - ValueError: If an unknown field is requested.
+    """
+    fields_param = request.args.get("fields")
+    if not fields_param:
+        return list(default_fields)
+
+    fields = [field.strip() for field in fields_param.split(",") if field.strip()]
+    unknown_fields = [field for field in fields if field not in FILE_FIELDS]
+    if unknown_fields:
+        raise ValueError(f"Unknown fields: {', '.join(unknown_fields)}")
+    return ["id"] + [field for field in dict.fromkeys(fields) if field != "id"]
+
+
+def file_query(fields, *extra_columns):
+    """
+    Description:
+    Builds a File query that loads only the columns of the requested fields.
+    The contents of requested content store fields are loaded together, in
+    one query for all files.
+
+    Parameters:
+    - fields (list): The requested fields.
+    - extra_columns: File columns needed besides the fields, e.g. File.change_seq.
+
+    Returns:
+    - Query: The File query.
+    """
+    columns = [getattr(File, FILE_FIELDS[field]) for field in fields if field not in FILE_BLOB_FIELDS]
+    blobs = [getattr(File, FILE_BLOB_FIELDS[field]) for field in fields if field in FILE_BLOB_FIELDS]
+    foreign_keys = [getattr(File, column.key) for blob in blobs for column in blob.property.local_columns]
+    return File.query.options(
+        load_only(*columns, *foreign_keys, *extra_columns),
+        *[selectinload(blob) for blob in blobs],
+    )
+
+
+def conditional_json_response(tag, build_payload):
+    """
+    Description:
+    Answers a read request with a strong ETag, compressed if the client accepts
+    it and the body is large enough. The ETag names the bytes actually sent:
+    an uncompressed body always gets the plain tag. If the client already holds
+    the current response (If-None-Match), 304 Not Modified is returned without
+    building the payload, so the text columns are never read.
+
+    Parameters:
+    - tag (str): The entity tag of the response, from `entity_tag` over the IDs
+      and change counter values of the files it contains.
+    - build_payload (callable): Returns the JSON-compatible payload.
+
+    Returns:
+    - Response: 304 with no body, or 200 with the (compressed) JSON payload.
+    """
+    encoding = None
+    if app.config["COMPRESSION_ENABLED"]:
+        encoding = request.accept_encodings.best_match(available_encodings())
+
+    # The tag is the same for the same payload, so the client holds either its
+    # compressed representation or, if it was small or not compressed, the
+    # uncompressed one; whichever it holds is still current
+    held_tags = [
+        etag for etag in (representation_tag(tag, encoding), tag)
+        if request.if_none_match.contains_weak(etag)
+    ]
+    if held_tags:
+        etag = held_tags[0]
+        response = Response(status=304)
+    else:
+        body = app.json.dumps(build_payload()).encode("utf-8")
+        if encoding and len(body) >= app.config["COMPRESSION_MIN_BYTES"]:
+            body = compress(body, encoding, app.config["COMPRESSION_LEVEL"])
+            response = Response(body, mimetype="application/json")
+            response.headers["Content-Encoding"] = encoding
+        else:
+            encoding = None
+            response = Response(body, mimetype="application/json")
+        etag = representation_tag(tag, encoding)
+
+    # The client must revalidate before reusing a response, which costs a 304 at most
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    response.vary.add("Accept-Encoding")
+    return response
+
+
 @app.route("/get-files", methods=["GET"])
 def get_files():
     """
     Description:
-    Retrieves all file entries from the database and returns them in JSON format.
+    Lists the court case files one page at a time, in ID order. Only the
+    requested fields are loaded and returned, so listing the library does not
+    transfer the case texts and file contents. The ETag of a page comes from
+    the IDs and change counter values of its files, and is checked before the
+    fields are loaded.
 
-    Parameters: None
+    Parameters: None (accepts the query parameters "fields", a comma-separated
+    list of fields, "limit", the page size, and "after_id", the ID of the last
+    file of the previous page)
 
     Returns:
-    - JSON: A JSON array of files, where each file is represented as a dictionary.
+    - JSON: The page of files and the "next_after_id" to request the next page
+      with, or null on the last page.
+    - 304: If the page has not changed since the client's ETag.
+    - JSON: An error message if a parameter is invalid.
     """
-    files = File.query.all()
-    result = [file.to_json() for file in files]
+    try:
+        fields = requested_file_fields(FILE_LIST_FIELDS)
+        limit = int(request.args.get("limit", app.config["FILE_PAGE_SIZE"]))
+        after_id = int(request.args.get("after_id", 0))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if not 1 <= limit <= app.config["FILE_PAGE_SIZE_MAX"]:
+        return jsonify({"error": f"limit must be between 1 and {app.config['FILE_PAGE_SIZE_MAX']}"}), 400
+
+    # Keyset pagination: one more row than requested tells whether a next page exists
+    change_seqs = (
+        db.session.query(File.id, File.change_seq)
+        .filter(File.id > after_id)
+        .order_by(File.id)
+        .limit(limit + 1)
+        .all()
+    )
+    tag = entity_tag("get-files", fields, limit, after_id, [tuple(row) for row in change_seqs])
+
+    def build_payload():
+        files = file_query(fields).filter(File.id > after_id).order_by(File.id).limit(limit + 1).all()
+        has_next_page = len(files) > limit
+        files = files[:limit]
+        return {
+            "files": [file.to_json(fields) for file in files],
+            "next_after_id": files[-1].id if has_next_page else None,
+        }
+
+    return conditional_json_response(tag, build_payload)
+
+
+@app.route("/files/changes", methods=["GET"])
+def get_file_changes():
+    """
+    Description:
+    Lists the files created, updated or deleted after a change counter value,
+    in the order of the changes, so a client can keep its copy of the file list
+    in sync without fetching the whole library again.
+
+    Parameters: None (accepts the query parameters "since", the cursor returned
+    by the previous call, 0 to get every file, "fields", a comma-separated list
+    of fields, and "limit", the largest number of changes returned)
+
+    Returns:
+    - JSON: The created or updated "files", the IDs of the "deleted" files, the
+      "cursor" to pass as "since" next time and "has_more", true if more
+      changes follow the cursor.
+    - 304: If nothing changed since the client's ETag.
+    - JSON: An error message if a parameter is invalid.
+    """
+    try:
+        fields = requested_file_fields(FILE_LIST_FIELDS)
+        since = int(request.args.get("since", 0))
+        limit = int(request.args.get("limit", app.config["FILE_PAGE_SIZE"]))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if not 1 <= limit <= app.config["FILE_PAGE_SIZE_MAX"]:
+        return jsonify({"error": f"limit must be between 1 and {app.config['FILE_PAGE_SIZE_MAX']}"}), 400
+
+    last_seq = db.session.query(FileChangeCounter.value).filter(FileChangeCounter.id == 1).scalar() or 0
+    tag = entity_tag("files-changes", fields, since, limit, last_seq)
+
+    def build_payload():
+        # One more change than requested, from each table, tells whether more changes follow
+        files = (
+            file_query(fields, File.change_seq)
+            .filter(File.change_seq > since)
+            .order_by(File.change_seq)
+            .limit(limit + 1)
+            .all()
+        )
+        tombstones = (
+            FileTombstone.query
+            .filter(FileTombstone.change_seq > since)
+            .order_by(FileTombstone.change_seq)
+            .limit(limit + 1)
+            .all()
+        )
+        changes = sorted(files + tombstones, key=lambda change: change.change_seq)
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+
+        return {
+            "files": [change.to_json(fields) for change in changes if isinstance(change, File)],
+            "deleted": [change.file_id for change in changes if isinstance(change, FileTombstone)],
+            "cursor": changes[-1].change_seq if has_more else max(last_seq, since),
+            "has_more": has_more,
+        }
+
+    return conditional_json_response(tag, build_payload)
+
+
+@app.route("/get-file/<int:id>", methods=["GET"])
+def get_file(id):
+    """
+    Description:
+    Retrieves one court case file.
+
+    Parameters:
+    - id (int): The ID of the file.
+    (accepts the query parameter "fields", a comma-separated list of fields;
+    every field is returned by default)
+
+    Returns:
+    - JSON: The requested fields of the file.
+    - 304: If the file has not changed since the client's ETag.
+    - JSON: An error message if a field is unknown or the file is not found.
+    """
+    try:
+        fields = requested_file_fields(FILE_DETAIL_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    return jsonify(result)
+    change_seq = db.session.query(File.change_seq).filter(File.id == id).scalar()
+    if change_seq is None:
+        return jsonify({"error": "File not found"}), 404
+
+    def build_payload():
+        return file_query(fields).filter(File.id == id).one().to_json(fields)
+
+    return conditional_json_response(entity_tag("get-file", fields, id, change_seq), build_payload)
+
+
+class StoredBlobFile:
+    """
+    A read-only, seekable file over the compressed data of a stored content.
+    Every read looks the blob up by its content hash and opens it with
+    incremental blob I/O in one short read transaction, so no lock is held
+    between reads and a rowid reused by another content after a delete or a
+    VACUUM is never read: the row found by the hash always holds the same
+    bytes, since contents are addressed by their hash.
+    """
+
+    def __init__(self, connection, digest):
+        self.connection = connection
+        self.digest = digest
+        self.position = 0
+
+    def seek(self, offset, whence=0):
+        if whence != 0:
+            raise ValueError("Only absolute seeks are supported")
+        self.position = offset
+        return self.position
+
+    def tell(self):
+        return self.position
+
+    def read(self, size=-1):
+        self.connection.execute("BEGIN")
+        try:
+            row = self.connection.execute("SELECT rowid FROM content_blob WHERE hash = ?", (self.digest,)).fetchone()
+            if row is None:
+                raise LookupError(f"Content {self.digest} was deleted while it was streamed")
+            with self.connection.blobopen("content_blob", "data", row[0], readonly=True) as blob:
+                blob.seek(self.position)
+                data = blob.read(size)
+        finally:
+            self.connection.execute("COMMIT")
+        self.position += len(data)
+        return data
+
+
+def stream_content_blob(database_path, digest, frame_size, frame_offsets, start, stop, chunk_size):
+    """
+    Description:
+    Streams a range of a stored content straight from SQLite with incremental
+    blob I/O: the compressed blob is read and decompressed one chunk at a time,
+    starting at the frame that holds the range, so the content is never held
+    in memory whole. The generator opens its own connection, since it runs
+    after the request has returned, and finds the blob by its hash on every
+    read rather than by a rowid read during the request.
+
+    Parameters:
+    - database_path (str): The SQLite database file.
+    - digest (str): The hash of the content.
+    - frame_size (int): The uncompressed bytes of each frame, or None.
+    - frame_offsets (list): The offset of each frame in the blob, or None.
+    - start (int): The first byte of the range, in the uncompressed content.
+    - stop (int): The byte after the range.
+    - chunk_size (int): The bytes read and yielded at a time.
+
+    Returns:
+    - generator: The bytes of the range, chunk by chunk.
+    """
+    connection = sqlite3.connect(database_path, isolation_level=None)
+    try:
+        blob_file = StoredBlobFile(connection, digest)
+        yield from read_content_range(blob_file, start, stop, chunk_size, frame_size, frame_offsets)
+    finally:
+        connection.close()
+
+
+@app.route("/download-file/<int:id>", methods=["GET"])
+def download_file(id):
+    """
+    Description:
+    Downloads the uploaded content of a court case file. The content is
+    streamed in chunks from the content store, with its Content-Length, and a
+    single byte range can be requested with the Range header, e.g. to resume
+    a download. A range is decompressed from the stored frame that holds its
+    first byte, not from the start of the content.
+
+    Parameters:
+    - id (int): The ID of the file.
+
+    Returns:
+    - The content of the file (200), or the requested range of it (206).
+    - 304: If the content has not changed since the client's ETag.
+    - 416: If the requested range is outside the content.
+    - JSON: An error message if the file or its content is not found.
+    """
+    row = (
+        db.session.query(
+            File.file_name, File.change_seq, ContentBlob.hash, ContentBlob.size,
+            ContentBlob.frame_size, ContentBlob.frame_offsets,
+        )
+        .join(ContentBlob, File.content_hash == ContentBlob.hash)
+        .filter(File.id == id)
+        .first()
+    )
+    if row is None:
+        return jsonify({"error": "File content not found"}), 404
+    file_name, change_seq, digest, size, frame_size, frame_offsets = row
+    frame_offsets = json.loads(frame_offsets) if frame_offsets else None
+
+    etag = entity_tag("download-file", id, change_seq)
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+
+    # A range is only honored if the client's copy is still current (If-Range)
+    byte_range = request.range
+    if byte_range is not None and request.if_range.etag is not None and request.if_range.etag != etag:
+        byte_range = None
+
+    start, stop, status = 0, size, 200
+    if byte_range is not None:
+        range_for_length = byte_range.range_for_length(size)
+        if range_for_length is None:
+            response = Response(status=416)
+            response.headers["Content-Range"] = f"bytes */{size}"
+            return response
+        (start, stop), status = range_for_length, 206
+
+    response = Response(
+        stream_content_blob(
+            db.engine.url.database, digest, frame_size, frame_offsets, start, stop, app.config["DOWNLOAD_CHUNK_SIZE"]
+        ),
+        status=status,
+        mimetype="text/plain",
+        direct_passthrough=True,
+    )
+    response.headers["Content-Length"] = str(stop - start)
+    response.headers["Accept-Ranges"] = "bytes"
+    response.headers["Content-Disposition"] = f"attachment; filename*=UTF-8''{quote(file_name)}.txt"
+    if status == 206:
+        response.headers["Content-Range"] = f"bytes {start}-{stop - 1}/{size}"
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
 
 
 @app.route("/send-file", methods=["POST"])
@@ -306,6 +1009,7 @@ def send_file():
                 )
                 db.session.add(upload)
                 db.session.commit()
+                update_corpus_idf(upload.id, upload.file_text)
             
             except Exception as e:
                 db.session.rollback()
@@ -405,6 +1109,7 @@ def send_file_link():
                 )
                 db.session.add(upload)
                 db.session.commit()
+                update_corpus_idf(upload.id, upload.file_text)
 
             except Exception as e:
                 db.session.rollback()
@@ -449,8 +1154,10 @@ def delete_file(id):
         if file is None:
             return jsonify({"error": "File not found"}), 404
         
+        FileParagraph.query.filter_by(file_id=id).delete()
         db.session.delete(file)
         db.session.commit()
+        update_corpus_idf(id)
         return jsonify({"msg": "File deleted successfully"}), 200
     except Exception as e:
         db.session.rollback()
@@ -479,90 +1186,771 @@ def update_file(id):
         file.file_name = data.get("file_name", file.file_name)
         file.file_text = data.get("file_text", file.file_text)
         file.file_has_summ = 0
+        file.file_summary_spans = None
 
         if "file_content" in data:
             file.file_content = bytes(data["file_content"], "utf-8")
 
         db.session.commit()
+        update_corpus_idf(file.id, file.file_text)
 
-        return jsonify(file.to_json()), 200
+        return jsonify(file.to_json(FILE_DETAIL_FIELDS)), 200
     except Exception as e:
         print("error:", e)
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
 
+def lsa_options():
+    """
+    Description:
+    Returns the LSA keyword arguments: the rank policy of its SVD and, if
+    enabled, a snapshot of the corpus IDF model.
+
+    Parameters: None
+
+    Returns:
+    - dict: The configured `max_rank` and `variance_target`, and the `idf_model`.
+    """
+    return {
+        "max_rank": app.config["LSA_MAX_RANK"],
+        "variance_target": app.config["LSA_VARIANCE_TARGET"],
+        "idf_model": corpus_idf.model() if corpus_idf is not None else None,
+    }
+
+
+def update_corpus_idf(id, case_text=None):
+    """
+    Description:
+    Adds a court case to the corpus IDF model, or replaces its text, or removes
+    it if no text is given. Errors are logged only: the model is brought back
+    in line with the database on the next start.
+
+    Parameters:
+    - id (int): The ID of the court case file.
+    - case_text (str): The case text, or None if the file was deleted.
+
+    Returns: None
+    """
+    if corpus_idf is None:
+        return
+    try:
+        if case_text is None:
+            corpus_idf.remove_document(id)
+        else:
+            corpus_idf.add_document(id, case_text)
+    except Exception as e:
+        print("Error updating the corpus IDF model:", e)
+
+
+def stored_paragraph_probabilities(id, keys, fingerprint):
+    """
+    Description:
+    Looks up the classifier probabilities of paragraph keys in a file's stored
+    segmentation, so that unchanged paragraphs are not classified again. Only
+    probabilities computed by the model now served are reused, so a summary
+    never mixes the labels of two models.
+
+    Parameters:
+    - id (int): The ID of the court case file.
+    - keys (list): The paragraph keys of the file's current text.
+    - fingerprint (str): The `probability_fingerprint` of the served model.
+
+    Returns:
+    - dict: The keys found in the stored segmentation, mapped to their
+      probabilities.
+    """
+    rows = (
+        db.session.query(FileParagraph.paragraph_hash, FileParagraph.probabilities)
+        .filter(
+            FileParagraph.file_id == id,
+            FileParagraph.probabilities.isnot(None),
+            FileParagraph.model_fingerprint == fingerprint,
+        )
+        .all()
+    )
+    probabilities_by_hash = dict(rows)
+
+    known_probabilities = {}
+    for key in keys:
+        probabilities = probabilities_by_hash.get(ClassificationCache.key_hash(key))
+        if probabilities is not None:
+            known_probabilities[key] = np.frombuffer(probabilities, dtype=np.float32)
+    return known_probabilities
+
+
+def store_segmentation(file, segmented_paragraph, predicted_labels, paragraph_probabilities, lsa_scores, fingerprint):
+    """
+    Description:
+    Replaces a file's stored segmentation with the labels, probabilities and LSA
+    scores of its current paragraphs, and records the text it was built from.
+    The caller commits the session.
+
+    Parameters:
+    - file (File): The court case file.
+    - segmented_paragraph (dict): The paragraph keys mapped to the paragraphs.
+    - predicted_labels (dict): The paragraphs mapped to their [label, probability].
+    - paragraph_probabilities (dict): The classifier probabilities of every
+      paragraph key that is not a heading.
+    - lsa_scores (tuple): The LSA sentences, sentence scores and SVD row sums
+      from `LSA.score_summary`.
+    - fingerprint (str): The `probability_fingerprint` of the model that
+      computed the probabilities.
+
+    Returns: None
+    """
+    FileParagraph.query.filter_by(file_id=file.id).delete()
+    file.segmented_text_hash = file.text_blob.hash
+
+    sentences, sentence_scores, row_sums = lsa_scores
+    scores_by_paragraph = {
+        sentence: (lsa_position, float(sentence_scores[lsa_position]), float(row_sums[lsa_position]))
+        for lsa_position, sentence in reversed(list(enumerate(sentences)))
+    }
+
+    offsets = paragraph_offsets(file.file_text)
+    paragraphs = []
+    for position, (key, value) in enumerate(segmented_paragraph.items()):
+        label, probability = predicted_labels[value]
+        _, start, end = offsets.get(value, (None, None, None))
+        probabilities = paragraph_probabilities.get(key)
+        # A repeated paragraph was summarized once, its scores go to its first row
+        lsa_position, lsa_score, lsa_row_sum = scores_by_paragraph.pop(value, (None, None, None))
+        paragraphs.append(FileParagraph(
+            file_id=file.id,
+            position=position,
+            paragraph_hash=ClassificationCache.key_hash(key),
+            paragraph_start=start,
+            paragraph_end=end,
+            label=label,
+            probability=probability,
+            is_heading=int(probabilities is None),
+            probabilities=(
+                np.asarray(probabilities, dtype=np.float32).tobytes()
+                if probabilities is not None else None
+            ),
+            lsa_position=lsa_position,
+            lsa_score=lsa_score,
+            lsa_row_sum=lsa_row_sum,
+            model_fingerprint=fingerprint,
+        ))
+    db.session.add_all(paragraphs)
+
+
+def summarize_file(id, job=None):
+    """
+    Description:
+    Summarizes a court case file (preprocessing, segmentation and LSA) and stores
+    the summary, or returns the stored summary if the file already has one. Used
+    both by the synchronous endpoint and by background summarization jobs.
+
+    Parameters:
+    - id (int): The ID of the court case file.
+    - job (SummarizationJob): If given, receives the current stage and an event
+      for every labeled paragraph.
+
+    Returns:
+    - dict: The title and the facts, issues and rulings summaries.
+
+    Raises:
+    - LookupError: If the file is not found.
+    - ValueError: If the file has no case text.
+    - RuntimeError: If the segmentation model is not ready in time.
+    """
+    def report(**progress):
+        if job is not None:
+            job.update(**progress)
+
+    # Verify if there are court case
+    file = db.session.get(File, id)
+    if file is None:
+        raise LookupError("Court case not found")
+
+    # Default value is set to none
+    summarize_case = {"title": file.file_name, "facts":"", "issues":"", "rulings":"", "spans": None}
+
+    # Create a summary if there are no summary
+    if file.file_has_summ == 0:
+        court_case_text = file.file_text
+
+        if not court_case_text:
+            raise ValueError("No case text provided")
+
+        # Preprocessing and segmentation
+        report(stage="preprocessing")
+        cleaned_text = preprocessor.remove_unnecesary_char(court_case_text)
+        segmented_paragraph = preprocessor.segment_paragraph(cleaned_text, court_case_text)
+
+        segmentation = model_registry.get(timeout=app.config["MODEL_READY_TIMEOUT"])
+
+        report(stage="segmenting", processed=0, total=len(segmented_paragraph))
+        label_counts = {"facts": 0, "issues": 0, "rulings": 0}
+
+        def report_paragraph(processed, total, label, probability):
+            label_counts[label] += 1
+            report(
+                processed=processed,
+                total=total,
+                event={
+                    "type": "paragraph",
+                    "processed": processed,
+                    "total": total,
+                    "label": label,
+                    "probability": probability,
+                    "counts": dict(label_counts),
+                },
+            )
+
+        # Paragraphs unchanged since the file was last segmented keep their probabilities
+        paragraph_probabilities = stored_paragraph_probabilities(
+            id, list(segmented_paragraph), segmentation.probability_fingerprint
+        )
+
+        predicted_labels = segmentation.sequence_classification(
+            segmented_paragraph,
+            threshold=0.8,
+            batch_size=app.config["SEGMENTATION_BATCH_SIZE"],
+            scheduler=inference_scheduler,
+            progress_callback=report_paragraph if job is not None else None,
+            decoder=app.config["SEGMENTATION_DECODER"],
+            paragraph_probabilities=paragraph_probabilities,
+        )
+        segmentation_output = segmentation.label_mapping(predicted_labels)
+
+        # Summarization
+        report(stage="summarizing")
+        lsa = LSA(segmentation_output, **lsa_options())
+        sentences, labels, sentence_scores, row_sums = lsa.score_summary()
+        selection = lsa.select_summary_indices(sentences, labels, sentence_scores, row_sums)
+        generated_summary = lsa.summary_text(sentences, selection)
+        summary_spans = lsa.summary_spans(sentences, selection, sentence_scores, court_case_text)
+
+        # Ensure generated summary contains required keys
+        summarize_case["facts"] = generated_summary.get("facts", "No facts available")
+        summarize_case["issues"] = generated_summary.get("issues", "No issues available")
+        summarize_case["rulings"] = generated_summary.get("rulings", "No rulings available")
+        summarize_case["spans"] = summary_spans
+
+        print("Generated Summary:", summarize_case, "\n\n")
+
+        # Update and commit summary to the database
+        report(stage="saving")
+        file.file_has_summ = 1 # 1 = True (summary exists)
+        file.file_facts = summarize_case["facts"]
+        file.file_issues = summarize_case["issues"]
+        file.file_rulings = summarize_case["rulings"]
+        file.file_summary_spans = json.dumps(summary_spans)
+        store_segmentation(
+            file,
+            segmented_paragraph,
+            predicted_labels,
+            paragraph_probabilities,
+            (sentences, sentence_scores, row_sums),
+            segmentation.probability_fingerprint,
+        )
+        db.session.commit()
+    else:
+        # Retrieve existing summary
+        summarize_case["facts"] = file.file_facts
+        summarize_case["issues"] = file.file_issues
+        summarize_case["rulings"] = file.file_rulings
+        summarize_case["spans"] = json.loads(file.file_summary_spans) if file.file_summary_spans else None
+
+    return summarize_case
+
+
+def run_summarization_job(id, job):
+    """
+    Description:
+    Runs a summarization job on a worker thread, inside the application context.
+
+    Parameters:
+    - id (int): The ID of the court case file.
+    - job (SummarizationJob): The job to report progress to.
+
+    Returns:
+    - dict: The title and the facts, issues and rulings summaries.
+    """
+    with app.app_context():
+        try:
+            return summarize_file(id, job)
+        finally:
+            db.session.remove()
+
+
+@app.route("/get-summarized/<int:id>", methods=["GET"])
+def get_stored_summary(id):
+    """
+    Description:
+    Retrieves the stored summary of a court case file, without summarizing it.
+    The ETag comes from the file's change counter value, so a client reopening
+    an unchanged case gets 304 without the summary being read.
+
+    Parameters:
+    - id (int): The ID of the court case file.
+
+    Returns:
+    - JSON: The title, the facts, issues and rulings summaries and their spans.
+    - 304: If the summary has not changed since the client's ETag.
+    - JSON: An error message if the file is not found or has no summary yet.
+    """
+    row = db.session.query(File.change_seq, File.file_has_summ).filter(File.id == id).first()
+    if row is None:
+        return jsonify({"error": "Court case not found"}), 404
+    if row.file_has_summ != 1:
+        return jsonify({"error": "File has no summary, summarize it first"}), 409
+
+    def build_payload():
+        summary_fields = ["file_name", "file_facts", "file_issues", "file_rulings", "file_summary_spans"]
+        file = file_query(summary_fields).filter(File.id == id).one()
+        return {
+            "title": file.file_name,
+            "facts": file.file_facts,
+            "issues": file.file_issues,
+            "rulings": file.file_rulings,
+            "spans": json.loads(file.file_summary_spans) if file.file_summary_spans else None,
+        }
+
+    return conditional_json_response(entity_tag("get-summarized", id, row.change_seq), build_payload)
+
+
 @app.route("/get-summarized/<int:id>", methods=["POST"])
 def get_summarized(id):
     """
     Description:
-    Retrieves and preprocesses the text of a specified court case file using custom preprocessing,
-    such as cleaning and tokenizing paragraphs.
+    Summarizes a court case file synchronously, within the request.
 
     Parameters:
     - id (int): The ID of the court case file.
 
     Returns:
-    - JSON: The cleaned and tokenized paragraphs of the case text.
-    - JSON: An error message if preprocessing fails or if the file is not found.
+    - JSON: The title and the facts, issues and rulings summaries.
+    - JSON: An error message if the file is not found, has no text, the model
+      is not ready or summarization fails.
     """
     try:
-        # Verify if there are court case
-        file = db.session.get(File, id)
-        if file is None:
-            return jsonify({"error": "Court case not found"}), 404
-        
-        # Default value is set to none
-        summarize_case = {"title": file.file_name, "facts":"", "issues":"", "rulings":""}
-        
-        # Create a summary if there are no summary
-        if file.file_has_summ == 0:
-            court_case_text = file.file_text
+        return jsonify(summarize_file(id)), 200
+    except LookupError as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except RuntimeError as e:
+        return jsonify({"error": str(e)}), 503
+    except Exception as e:
+        print("Error during summarizing:", e)
+        return jsonify({"error": str(e)}), 500
 
-            if not court_case_text:
-                return jsonify({"error": "No case text provided"}), 400
 
-            # Preprocessing and segmentation
-            cleaned_text = preprocessor.remove_unnecesary_char(court_case_text)
-            segmented_paragraph = preprocessor.segment_paragraph(cleaned_text, court_case_text)
-            
-            segmentation = TopicSegmentation()
+@app.route("/reselect-summary/<int:id>", methods=["POST"])
+def reselect_summary(id):
+    """
+    Description:
+    Selects the summary of a summarized court case file again from its stored
+    LSA scores, with other section percentages or another score threshold. No
+    segmentation or SVD is run, so a summary length can be changed interactively.
 
+    Parameters:
+    - id (int): The ID of the court case file.
+    (expects a JSON body with optional "facts_pct", "issues_pct", "ruling_pct"
+    and "threshold" numbers, and an optional "save" flag to store the new
+    summary as the file's summary)
 
-            predicted_labels = segmentation.sequence_classification(
-                segmented_paragraph, threshold=0.8
-            )
-            segmentation_output = segmentation.label_mapping(predicted_labels)
+    Returns:
+    - JSON: The title, the facts, issues and rulings summaries and their spans.
+    - JSON: An error message if the request is invalid, the file is not found
+      or the file has no stored scores.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        percentages = {
+            name: float(data[name])
+            for name in ("facts_pct", "issues_pct", "ruling_pct")
+            if data.get(name) is not None
+        }
+        threshold = float(data["threshold"]) if data.get("threshold") is not None else None
+    except (TypeError, ValueError):
+        return jsonify({"error": "Percentages and threshold must be numbers"}), 400
+    if any(not 0 <= percentage <= 1 for percentage in percentages.values()):
+        return jsonify({"error": "Percentages must be between 0 and 1"}), 400
+
+    file = db.session.get(File, id)
+    if file is None:
+        return jsonify({"error": "File not found"}), 404
+
+    paragraphs = (
+        FileParagraph.query.filter(FileParagraph.file_id == id, FileParagraph.lsa_position.isnot(None))
+        .order_by(FileParagraph.lsa_position)
+        .all()
+    )
+    if file.file_has_summ != 1 or not paragraphs:
+        return jsonify({"error": "File has no stored summary scores, summarize it first"}), 409
+    if file.segmented_text_hash != file.text_hash or any(
+        paragraph.paragraph_start is None for paragraph in paragraphs
+    ):
+        return jsonify({"error": "Stored summary scores do not match the file text, summarize it again"}), 409
+
+    sentences = [file.file_text[paragraph.paragraph_start:paragraph.paragraph_end] for paragraph in paragraphs]
+    labels = [paragraph.label for paragraph in paragraphs]
+    sentence_scores = np.array([paragraph.lsa_score for paragraph in paragraphs])
+    row_sums = np.array([paragraph.lsa_row_sum for paragraph in paragraphs])
+
+    lsa = LSA({}, **percentages)
+    selection = lsa.select_summary_indices(sentences, labels, sentence_scores, row_sums, threshold)
+    summary = lsa.summary_text(sentences, selection)
+    summary_spans = lsa.summary_spans(sentences, selection, sentence_scores, file.file_text)
+
+    if data.get("save"):
+        try:
+            file.file_facts = summary["facts"]
+            file.file_issues = summary["issues"]
+            file.file_rulings = summary["rulings"]
+            file.file_summary_spans = json.dumps(summary_spans)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({"error": str(e)}), 500
 
-            # Summarization
-            lsa = LSA(segmentation_output)
-            generated_summary = lsa.create_summary()
+    return jsonify({"title": file.file_name, **summary, "spans": summary_spans}), 200
 
-            # Ensure generated summary contains required keys
-            summarize_case["facts"] = generated_summary.get("facts", "No facts available")
-            summarize_case["issues"] = generated_summary.get("issues", "No issues available")
-            summarize_case["rulings"] = generated_summary.get("rulings", "No rulings available")
 
-            print("Generated Summary:", summarize_case, "\n\n")
-            
-            # Update and commit summary to the database
-            file.file_has_summ = 1 # 1 = True (summary exists)
-            file.file_facts = summarize_case["facts"]
-            file.file_issues = summarize_case["issues"]
-            file.file_rulings = summarize_case["rulings"]
-            db.session.commit()
+@app.route("/get-segmentation/<int:id>", methods=["GET"])
+def get_segmentation(id):
+    """
+    Description:
+    Retrieves the stored segmentation of a court case file: the label and
+    probabilities of every paragraph, in order, with its location in file_text.
+
+    Parameters:
+    - id (int): The ID of the court case file.
+
+    Returns:
+    - JSON: The file ID, whether the segmentation was built from the current
+      file text, and the list of paragraphs.
+    - JSON: An error message if the file is not found or was never segmented.
+    """
+    file = db.session.get(File, id)
+    if file is None:
+        return jsonify({"error": "File not found"}), 404
+
+    paragraphs = FileParagraph.query.filter_by(file_id=id).order_by(FileParagraph.position).all()
+    if not paragraphs:
+        return jsonify({"error": "File has not been segmented"}), 404
+
+    return jsonify({
+        "file_id": id,
+        "is_current": file.segmented_text_hash is not None and file.segmented_text_hash == file.text_hash,
+        "paragraphs": [paragraph.to_json() for paragraph in paragraphs],
+    }), 200
+
+
+def get_lsa_executor():
+    """
+    Description:
+    Returns the worker processes used to run LSA for bulk summarization,
+    starting them on first use. The workers are spawned rather than forked,
+    since this process runs the model loader, scheduler and job threads, and
+    only import the LSA module and this module's definitions.
+
+    Parameters: None
+
+    Returns:
+    - ProcessPoolExecutor: The shared LSA worker pool.
+    """
+    global lsa_executor
+    if lsa_executor is None:
+        lsa_executor = ProcessPoolExecutor(
+            max_workers=app.config["LSA_WORKERS"],
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return lsa_executor
+
+
+def summarize_files(file_ids, force=False):
+    """
+    Description:
+    Summarizes many court case files at once. The paragraphs of every file are
+    classified together in shared batches, LSA runs in worker processes and the
+    summaries and segmentations are stored in batched transactions. A file that fails is reported
+    without stopping the others.
+
+    Parameters:
+    - file_ids (list): The IDs of the court case files.
+    - force (bool): Re-summarize files that already have a summary.
+
+    Returns:
+    - list: One result per file ID, with "id", "status" ("summarized",
+      "skipped" or "failed") and either the summary or an "error".
+
+    Raises:
+    - RuntimeError: If the segmentation model is not ready in time.
+    """
+    file_ids = list(dict.fromkeys(file_ids))
+    files = {
+        file.id: file
+        for file in File.query.options(selectinload(File.text_blob)).filter(File.id.in_(file_ids)).all()
+    }
+    results = {}
+
+    documents = {}
+    for file_id in file_ids:
+        file = files.get(file_id)
+        if file is None:
+            results[file_id] = {"id": file_id, "status": "failed", "error": "Court case not found"}
+        elif file.file_has_summ == 1 and not force:
+            results[file_id] = {"id": file_id, "status": "skipped"}
         else:
-            # Retrieve existing summary
-            summarize_case["facts"] = file.file_facts 
-            summarize_case["issues"] = file.file_issues
-            summarize_case["rulings"] = file.file_rulings
-        
-        return jsonify(summarize_case), 200
+            documents[file_id] = file.file_text
+
+    if documents:
+        segmentation = model_registry.get(timeout=app.config["MODEL_READY_TIMEOUT"])
+        outcomes = bulk_summarize(
+            documents,
+            segmentation,
+            preprocessor,
+            threshold=0.8,
+            batch_size=app.config["SEGMENTATION_BATCH_SIZE"],
+            lsa_executor=get_lsa_executor() if app.config["LSA_WORKERS"] > 0 else None,
+            decoder=app.config["SEGMENTATION_DECODER"],
+            lsa_kwargs=lsa_options(),
+        )
+
+        # Store the summaries in batched transactions
+        summarized_ids = [file_id for file_id in documents if "summary" in outcomes[file_id]]
+        batch_size = app.config["BULK_COMMIT_BATCH_SIZE"]
+        for start in range(0, len(summarized_ids), batch_size):
+            batch_ids = summarized_ids[start:start + batch_size]
+            for file_id in batch_ids:
+                outcome = outcomes[file_id]
+                summary = outcome["summary"]
+                file = files[file_id]
+                file.file_has_summ = 1 # 1 = True (summary exists)
+                file.file_facts = summary.get("facts", "No facts available")
+                file.file_issues = summary.get("issues", "No issues available")
+                file.file_rulings = summary.get("rulings", "No rulings available")
+                file.file_summary_spans = json.dumps(outcome["spans"])
+                store_segmentation(
+                    file,
+                    outcome["paragraphs"],
+                    outcome["labels"],
+                    outcome["probabilities"],
+                    outcome["scores"],
+                    segmentation.probability_fingerprint,
+                )
+            try:
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                print("Error during bulk commit:", e)
+                for file_id in batch_ids:
+                    outcomes[file_id] = {"error": str(e)}
+
+        for file_id in documents:
+            if "summary" in outcomes[file_id]:
+                file = files[file_id]
+                results[file_id] = {
+                    "id": file_id,
+                    "status": "summarized",
+                    "title": file.file_name,
+                    "facts": file.file_facts,
+                    "issues": file.file_issues,
+                    "rulings": file.file_rulings,
+                }
+            else:
+                results[file_id] = {"id": file_id, "status": "failed", "error": outcomes[file_id]["error"]}
+
+    return [results[file_id] for file_id in file_ids]
+
+
+@app.route("/bulk-summarize", methods=["POST"])
+def bulk_summarize_files():
+    """
+    Description:
+    Summarizes many court case files in one request, sharing classifier batches
+    across files. Failures are reported per file.
+
+    Parameters: None (expects a JSON body with a "file_ids" list and an optional
+    "force" flag to re-summarize files that already have a summary)
+
+    Returns:
+    - JSON: A result per file and the number of summarized, skipped and failed files.
+    - JSON: An error message if the request is invalid or the model is not ready.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        file_ids = [int(file_id) for file_id in data.get("file_ids", [])]
+    except (TypeError, ValueError):
+        return jsonify({"error": "file_ids must be a list of file IDs"}), 400
 
+    if not file_ids:
+        return jsonify({"error": "file_ids must be a list of file IDs"}), 400
+
+    try:
+        results = summarize_files(file_ids, force=bool(data.get("force", False)))
+    except RuntimeError as e:
+        return jsonify({"error": str(e)}), 503
     except Exception as e:
-        print("Error during summarizing:", e)
+        print("Error during bulk summarizing:", e)
         return jsonify({"error": str(e)}), 500
 
+    counts = {
+        status: sum(result["status"] == status for result in results)
+        for status in ("summarized", "skipped", "failed")
+    }
+    return jsonify({"results": results, **counts}), 200
+
+
+@app.route("/summarize-jobs", methods=["POST"])
+def create_summarize_job():
+    """
+    Description:
+    Starts summarizing a court case file in the background.
+
+    Parameters: None (expects a JSON body with a "file_id" field)
+
+    Returns:
+    - JSON: The queued job (or the file's job that is already running), with a
+      202 status. Its id is used to follow the job.
+    - JSON: An error message if the file_id is missing or the file is not found.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        file_id = int(data.get("file_id"))
+    except (TypeError, ValueError):
+        return jsonify({"error": "A file_id is required"}), 400
+
+    if db.session.get(File, file_id) is None:
+        return jsonify({"error": "Court case not found"}), 404
+
+    job = job_manager.submit(file_id)
+    return jsonify(job.to_json()), 202
+
+
+@app.route("/summarize-jobs/<job_id>", methods=["GET"])
+def get_summarize_job(job_id):
+    """
+    Description:
+    Reports the status, stage and progress of a summarization job, and its result
+    once it is completed.
+
+    Parameters:
+    - job_id (str): The ID returned when the job was created.
+
+    Returns:
+    - JSON: The job's status, stage, processed/total paragraphs, result and error.
+    - JSON: An error message if the job is unknown.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.to_json()), 200
+
+
+@app.route("/summarize-jobs/<job_id>/events", methods=["GET"])
+def stream_summarize_job(job_id):
+    """
+    Description:
+    Streams the events of a summarization job as Server-Sent Events: every stage
+    change, every labeled paragraph (with its label, probability and the label
+    counts so far) and finally the completed summary or the error. A comment is
+    sent whenever the job is quiet, so proxies do not close the connection.
+    Reconnecting clients resume after the last event they received.
+
+    Parameters:
+    - job_id (str): The ID returned when the job was created.
+
+    Returns:
+    - text/event-stream: The job's events, until the job finishes.
+    - JSON: An error message if the job is unknown.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+
+    try:
+        start = int(request.headers.get("Last-Event-ID", -1)) + 1
+    except ValueError:
+        start = 0
+    heartbeat = app.config["SSE_HEARTBEAT_SECONDS"]
+
+    def generate():
+        position = start
+        while True:
+            events, finished = job.wait_for_events(position, timeout=heartbeat)
+            if not events:
+                if finished:
+                    return
+                yield ": heartbeat\n\n"
+                continue
+
+            for event in events:
+                yield f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+            position += len(events)
+
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.route("/health", methods=["GET"])
+def health():
+    """
+    Description:
+    Reports whether the segmentation model is loaded and ready to serve requests.
+
+    Parameters: None
+
+    Returns:
+    - JSON: The model registry status, with a 200 status when the model is
+      ready and 503 while it is still loading or failed to load.
+    """
+    status = model_registry.status()
+    if status["ready"] and model_registry.get().cache is not None:
+        status["classification_cache"] = model_registry.get().cache.stats()
+    if status["ready"] and model_registry.get().cascade is not None:
+        status["cascade"] = model_registry.get().cascade_stats()
+    status["inference_scheduler"] = inference_scheduler.stats()
+    if corpus_idf is not None:
+        status["corpus_idf"] = corpus_idf.stats()
+    return jsonify(status), 200 if status["ready"] else 503
+
+
+@app.route("/reload-model", methods=["POST"])
+def reload_model():
+    """
+    Description:
+    Hot-reloads the segmentation model, optionally switching to another model
+    directory. Only the directories configured in MODEL_DIRECTORIES can be
+    loaded, by name, since loading a model runs code from its files. The
+    current model keeps serving requests until the new one is ready.
+
+    Parameters: None (accepts an optional JSON body with a "model" field, the
+    name of a configured model directory)
+
+    Returns:
+    - JSON: The model registry status after the reload.
+    - JSON: An error message if the model name is unknown or the new model
+      could not be loaded.
+    """
+    data = request.get_json(silent=True) or {}
+    if "model_path" in data:
+        return jsonify({"error": "Model paths are not accepted, use a configured model name"}), 400
+
+    model_path = None
+    if data.get("model") is not None:
+        model_path = app.config["MODEL_DIRECTORIES"].get(str(data["model"]))
+        if model_path is None:
+            return jsonify({"error": f"Unknown model: {data['model']}"}), 400
+
+    try:
+        model_registry.reload(model_path)
+        return jsonify(model_registry.status()), 200
+    except Exception as e:
+        print("Error during model reload:", e)
+        return jsonify({"error": str(e)}), 500
+
+
 @app.route("/get-preprocess/<int:id>", methods=["POST"])
 def get_preprocess(id):
     """
@@ -604,8 +1992,251 @@ def get_preprocess(id):
 
 
 
-with app.app_context():
-    db.create_all()
+def add_missing_columns():
+    """
+    Description:
+    Adds the columns of the models that are missing from their existing tables.
+    `db.create_all` only creates missing tables, so a database created before a
+    column was added to a model is migrated here. New columns must be nullable
+    or have a scalar default, which existing rows are given.
+
+    Parameters: None
+
+    Returns: None
+    """
+    inspector = inspect(db.engine)
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+
+        existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            column_type = column.type.compile(dialect=db.engine.dialect)
+            if column.default is not None and column.default.is_scalar:
+                column_type += f" DEFAULT {column.default.arg!r}"
+            with db.engine.begin() as connection:
+                connection.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'))
+            print(f"Added column {table.name}.{column.name}")
+
+        # Indexes of the new columns
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+
+
+def move_file_text_to_blobs():
+    """
+    Description:
+    Moves the texts and uploads of a database created before the content store
+    existed into it: every distinct content is stored once, compressed, the
+    files refer to it by hash and the old text columns are dropped. The file is
+    then vacuumed to give the space back. Change counter values are left
+    unchanged, since the contents are the same.
+
+    Parameters: None
+
+    Returns: None
+    """
+    legacy_columns = ["file_orig_text", "file_text", "file_content"]
+    hash_columns = ["orig_text_hash", "text_hash", "content_hash"]
+    existing_columns = {column["name"] for column in inspect(db.engine).get_columns("file")}
+    legacy_columns = [column for column in legacy_columns if column in existing_columns]
+    if not legacy_columns:
+        return
+
+    with db.engine.begin() as connection:
+        file_ids = connection.execute(text("SELECT id FROM file")).scalars().all()
+        for file_id in file_ids:
+            row = connection.execute(
+                text(f"SELECT {', '.join(legacy_columns)} FROM file WHERE id = :id"), {"id": file_id}
+            ).mappings().one()
+
+            hashes = {}
+            for legacy_column, hash_column in zip(["file_orig_text", "file_text", "file_content"], hash_columns):
+                value = row.get(legacy_column)
+                if value is None:
+                    continue
+                content = value.encode("utf-8") if isinstance(value, str) else bytes(value)
+                hashes[hash_column] = content_hash(content)
+                data, frame_offsets = compress_content(
+                    content, app.config["CONTENT_ZSTD_LEVEL"], app.config["CONTENT_FRAME_SIZE"]
+                )
+                connection.execute(
+                    text(
+                        "INSERT OR IGNORE INTO content_blob (hash, size, data, frame_size, frame_offsets) "
+                        "VALUES (:hash, :size, :data, :frame_size, :frame_offsets)"
+                    ),
+                    {
+                        "hash": hashes[hash_column],
+                        "size": len(content),
+                        "data": data,
+                        "frame_size": app.config["CONTENT_FRAME_SIZE"],
+                        "frame_offsets": json.dumps(frame_offsets),
+                    },
+                )
+
+            if hashes:
+                assignments = ", ".join(f"{column} = :{column}" for column in hashes)
+                connection.execute(text(f"UPDATE file SET {assignments} WHERE id = :id"), {**hashes, "id": file_id})
+
+        for legacy_column in legacy_columns:
+            connection.execute(text(f'ALTER TABLE file DROP COLUMN "{legacy_column}"'))
+
+    with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("VACUUM"))
+    print(f"Moved the texts of {len(file_ids)} files to the content store")
+
+
+def delete_unreferenced_blobs():
+    """
+    Description:
+    Deletes the stored contents no file refers to anymore. Edits and deletions
+    release their contents as they are flushed; this runs at startup, before any
+    request, for contents left behind by databases written before that.
+
+    Parameters: None
+
+    Returns: None
+    """
+    referenced = union(*[
+        select(getattr(File, column)).where(getattr(File, column).is_not(None))
+        for column in BLOB_HASH_COLUMNS
+    ])
+    db.session.execute(delete(ContentBlob).where(ContentBlob.hash.not_in(referenced)))
+    db.session.commit()
+
+
+def init_change_counter():
+    """
+    Description:
+    Creates the change counter row if it does not exist yet. Files stored
+    before the change feed existed are numbered by their IDs, so every file
+    has its own change counter value, and the counter starts after them.
+
+    Parameters: None
+
+    Returns: None
+    """
+    if db.session.get(FileChangeCounter, 1) is None:
+        db.session.execute(text("UPDATE file SET change_seq = id"))
+        last_seq = max(
+            db.session.query(func.max(File.change_seq)).scalar() or 0,
+            db.session.query(func.max(FileTombstone.change_seq)).scalar() or 0,
+        )
+        db.session.add(FileChangeCounter(id=1, value=last_seq))
+        db.session.commit()
+
+
+# Services used by the request handlers, started by init_app_services
+corpus_idf = None   # Corpus-wide term weights for the LSA
+model_registry = None   # The segmentation model shared by all requests
+inference_scheduler = None  # Coalesces the paragraphs of concurrent summarize requests
+lsa_executor = None     # Worker processes for bulk LSA, started on the first bulk request
+job_manager = None  # Background workers for summarization jobs
+services_lock = threading.Lock()    # Held while the services are started
+services_ready = False  # Whether this process has started the services
+
+
+def init_app_services():
+    """
+    Description:
+    Prepares the database and starts the services used by the request
+    handlers, once per serving process. It runs before the first request
+    rather than on import, because the LSA worker processes and the debug
+    reloader's watcher process import this module too, and must not migrate
+    the database, load the models or start threads.
+
+    Parameters: None
+
+    Returns: None
+    """
+    global services_ready
+
+    # The LSA workers are started by multiprocessing and never serve requests
+    if multiprocessing.parent_process() is not None:
+        raise RuntimeError("The application services are not started in worker processes")
+
+    with services_lock:
+        if services_ready:
+            return
+        start_app_services()
+        services_ready = True
+
+
+def start_app_services():
+    """
+    Description:
+    Starts the services of `init_app_services`. Called once, with the
+    services lock held.
+
+    Parameters: None
+
+    Returns: None
+    """
+    global preprocessor, nlp, corpus_idf, model_registry, inference_scheduler, job_manager
+
+    with app.app_context():
+        db.create_all()
+        add_missing_columns()
+        move_file_text_to_blobs()
+        delete_unreferenced_blobs()
+        init_change_counter()
+
+    preprocessor = preprocess(is_training=False)
+    nlp = spacy.load("en_core_web_sm")
+
+    # Corpus-wide term weights for the LSA, brought in line with the stored cases
+    if app.config["LSA_CORPUS_IDF"]:
+        corpus_idf = CorpusIDF(os.path.join(app.instance_path, "test.db"))
+        with app.app_context():
+            # The content hash of a file's text is the hash the model compares
+            corpus_idf.sync(
+                dict(db.session.query(File.id, File.text_hash).all()),
+                lambda file_id: db.session.get(File, file_id).file_text,
+            )
+
+    # Load the segmentation model once, in the background, for all requests
+    model_registry = ModelRegistry(
+        app.config["MODEL_PATH"],
+        backend=app.config["MODEL_BACKEND"],
+        quantized_cache_dir=os.path.join(app.instance_path, "quantized_models"),
+        cache_path=os.path.join(app.instance_path, "test.db"),
+        cache_size=app.config["CLASSIFICATION_CACHE_SIZE"],
+        cascade_path=app.config["CASCADE_MODEL_PATH"],
+        cascade_threshold=app.config["CASCADE_THRESHOLD"],
+        fast_tokenizer=app.config["SEGMENTATION_FAST_TOKENIZER"],
+    )
+    model_registry.load_async()
+
+    # Coalesce the paragraphs of concurrent summarize requests into shared batches
+    inference_scheduler = InferenceScheduler(
+        max_batch_size=app.config["SEGMENTATION_BATCH_SIZE"],
+        max_wait_ms=app.config["SCHEDULER_MAX_WAIT_MS"],
+    )
+
+    # Background workers for summarization jobs
+    job_manager = JobManager(run_summarization_job, max_workers=app.config["SUMMARIZATION_WORKERS"])
+
+
+@app.before_request
+def ensure_app_services():
+    """
+    Description:
+    Starts the services on the first request of a serving process, however the
+    application is served (`python app.py`, `flask run` or a WSGI server).
+
+    Parameters: None
+
+    Returns: None
+    """
+    if not services_ready:
+        init_app_services()
+
 
 if __name__ == "__main__":
+    # Start loading the model right away in the process that serves requests,
+    # not in the debug reloader's watcher
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        init_app_services()
     app.run(debug=True)
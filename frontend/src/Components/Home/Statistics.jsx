@@ -3,7 +3,7 @@
  *
  * Programmers: Nicholas Dela Torre, Jino Llamado, Jewell Anne Diamante
  * Date Written: October 12, 2024
- * Date Revised: January 23, 2025
+ * Date Revised: October 17, 2026
  *
  * Purpose:
  *    This component is part of the Court Case Summarizer project and is designed
@@ -32,10 +32,12 @@
  *       and calculates unigram frequencies.
  *    2. `calculateBigramFrequencies`: Processes text to generate and calculate
  *       bigram frequencies.
- *    3. `handleFileClick`: Sets the active file and computes unigram and bigram
- *       statistics for the selected file.
- *    4. `useEffect`: Fetches the list of available files from the backend API
- *       when the component mounts.
+ *    3. `handleFileClick`: Fetches the text of the selected file, sets it as the
+ *       active file and computes its unigram and bigram statistics.
+ *    4. `refreshFiles`: Brings the list of files up to date with the backend's
+ *       change feed through the shared `syncFiles`, fetching only the files
+ *       changed since the last sync.
+ *    5. `useEffect`: Syncs the list of available files when the component mounts.
  *
  * Key Variables:
  *    - `existingFiles`: Stores the list of court case files retrieved from the
@@ -52,11 +54,12 @@
 
 import NavBar from "../Navigation/NavBar";
 import WordCloudPage from "./WordCloudPage";
-import { useEffect, useState, useContext } from "react";
+import { useEffect, useState, useContext, useRef } from "react";
 import axios from "axios";
 import "../../assets/wordcloud.css";
 import { unigramStopwords, bigramStopwords } from "../Constants/stopwords";
 import { ThemeContext } from "../../ThemeContext";
+import { syncFiles } from "./syncFiles";
 
 const Statistics = () => {
   /**
@@ -83,22 +86,36 @@ const Statistics = () => {
   const [bigramStatsList, setBigramStatsList] = useState([]);
   const [loading, setLoading] = useState(false);
   const { isDarkMode } = useContext(ThemeContext);
+  const changeCursor = useRef(0); // Change feed cursor of the file list
 
-  const handleFileClick = (file) => {
+  const handleFileClick = async (listedFile) => {
     /**
      * Description:
-     * Handles the selection of a file, processes its content to calculate unigrams and bigrams,
+     * Handles the selection of a file, fetches its text, processes it to calculate unigrams and bigrams,
      * and updates the component's state with the computed statistics.
      *
      * Parameter:
-     * {object} file - The selected file object containing `file_text` and `id` properties.
+     * {object} listedFile - The selected entry of the file list, containing its `id` and `file_name`.
      *
      * Returns:
      * {void} - No return value, updates the component's state with unigrams and bigrams.
      */
-    setActiveFile(file);
     setLoading(true);
-    console.log("Selected File ID: ", file.id);
+    console.log("Selected File ID: ", listedFile.id);
+
+    let file;
+    try {
+      const res = await axios.get(
+        `http://127.0.0.1:5000/get-file/${listedFile.id}`,
+        { params: { fields: "id,file_name,file_text" } }
+      );
+      file = res.data;
+    } catch (err) {
+      console.log(err);
+      setLoading(false);
+      return;
+    }
+    setActiveFile(file);
 
     // Preprocess the text
     const text = file.file_text.toLowerCase().replace(/[^a-z\s]/g, "");
@@ -176,11 +193,14 @@ const Statistics = () => {
     return bigramStats.sort((a, b) => b.frequency - a.frequency).slice(0, 10);
   };
 
+  // Syncs this component's file list from its own change feed cursor
+  const refreshFiles = () => syncFiles(changeCursor, setExistingFiles);
+
   useEffect(() => {
     /**
      * Description:
-     * Fetches the list of available files from the server when the component is
-     * mounted and sets the state with the list of files.
+     * Syncs the list of available files with the server when the component is
+     * mounted.
      *
      * Parameter:
      * None
@@ -190,14 +210,9 @@ const Statistics = () => {
      *          files.
      */
 
-    axios
-      .get("http://127.0.0.1:5000/get-files")
-      .then((res) => {
-        setExistingFiles(res.data);
-      })
-      .catch((err) => {
-        console.log(err);
-      });
+    refreshFiles().catch((err) => {
+      console.log(err);
+    });
   }, []);
 
   return (
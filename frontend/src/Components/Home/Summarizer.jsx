@@ -5,7 +5,7 @@
  * Nicholas Dela Torre, Jino Llamado, Jewell Anne Diamante, Miguel Tolentino
  *
  * Date Written: October 12, 2024
- * Date Revised: January 25, 2025
+ * Date Revised: October 17, 2026
  *
  * Purpose:
  *    This component is part of the Court Case Summarizer project. It provides a
@@ -40,7 +40,7 @@ import ConfirmDelete from "../Modals/ConfirmDelete";
 import { PiArrowLineDownBold } from "react-icons/pi";
 import { FaTrash } from "react-icons/fa6";
 import { ImCloudDownload } from "react-icons/im";
-import { useState, useEffect, useContext } from "react";
+import { useState, useEffect, useContext, useRef } from "react";
 import axios from "axios";
 import { BiSolidEditAlt } from "react-icons/bi";
 import { FaCirclePlus, FaCircleMinus } from "react-icons/fa6";
@@ -50,6 +50,7 @@ import SavingModal from "../Modals/SavingModal";
 import { ThemeContext } from "../../ThemeContext";
 import ConfirmSave from "../Modals/ConfirmSave";
 import ConfirmRevert from "../Modals/ConfirmRevert";
+import { syncFiles } from "./syncFiles";
 
 const Summarizer = () => {
   const [editCase, setEditCase] = useState(false);
@@ -64,7 +65,6 @@ const Summarizer = () => {
   const [isModalOpen, setIsModalOpen] = useState(false);
   const [loadingText, setLoadingText] = useState("");
   const [progress, setProgress] = useState(0);
-  const [isFadingOut, setIsFadingOut] = useState(false);
   const [loadingModal, setLoadingModal] = useState(false);
   const [showConfirmation, setShowConfirmation] = useState(false);
   const [isSummaryLoading, setIsSummaryLoading] = useState(false); // for summary loading state
@@ -75,62 +75,110 @@ const Summarizer = () => {
   const [summaryPopup, setSummaryPopup] = useState(false);
   const [hasSummaryPopup, setHasSummaryPopup] = useState(false);
   const [revertModal, setRevertModal] = useState(false);
+  const changeCursor = useRef(0); // Change feed cursor of the file list
   const { isDarkMode } = useContext(ThemeContext);
 
-  useEffect(() => {
-    axios
-      .get("http://127.0.0.1:5000/get-files")
-      .then((res) => {
-        console.log("file text: ", res.data);
-        setExistingFiles(res.data);
-      })
-      .catch((err) => {
-        console.log(err);
-      });
-  }, [activeFile]);
+  // Syncs this component's file list from its own change feed cursor
+  const refreshFiles = () => syncFiles(changeCursor, setExistingFiles);
+
+  const fetchFileDetail = async (id) => {
+    /**
+     * Fetches the texts and summary of one court case.
+     *
+     * @param {number} id - The ID of the case.
+     * @returns {Promise<Object>} Resolves to the case, without its uploaded file content.
+     */
+    const res = await axios.get(`http://127.0.0.1:5000/get-file/${id}`);
+    return res.data;
+  };
 
   useEffect(() => {
-    const tasks = ["Pre-processing..", "Segmenting..", "Summarizing.."];
-    let taskIndex = 0;
-
-    // Set initial loading text
-    setLoadingText(tasks[taskIndex]);
-
-    // Track fading state
-    let fadeOutTimeout;
-
-    const updateText = () => {
-      // After the fade-out completes, show the new text
-      fadeOutTimeout = setTimeout(() => {
-        // Increment index and loop back to 0 if it exceeds array length
-        taskIndex = (taskIndex + 1) % tasks.length;
-        setLoadingText(tasks[taskIndex]);
-      }, 1000);
-    };
+    refreshFiles().catch((err) => {
+      console.log(err);
+    });
+  }, []);
 
-    // Set an interval to update loading text every 5 seconds
-    const intervalId = setInterval(() => {
-      setIsFadingOut(true); // Start fading out
-      updateText();
-      setIsFadingOut(false); // Reset fade state
-    }, 5000); // 5 seconds
-
-    // Clean up interval and timeout when component unmounts
-    return () => {
-      clearInterval(intervalId);
-      clearTimeout(fadeOutTimeout);
+  const describeJob = (job) => {
+    /**
+     * Builds the loading text shown while a summarization job runs.
+     *
+     * @param {Object} job - The job's stage, with processed/total paragraph counts.
+     * @returns {string} The current stage, with paragraph progress while segmenting.
+     */
+    const stages = {
+      queued: "Queued..",
+      preprocessing: "Pre-processing..",
+      segmenting: "Segmenting..",
+      summarizing: "Summarizing..",
+      saving: "Saving..",
+      done: "Done",
     };
-  }, [isSummaryLoading]);
+    const text = stages[job.stage] || "Summarizing..";
+    if (job.stage === "segmenting" && job.total > 0) {
+      return `${text} (${job.processed}/${job.total} paragraphs)`;
+    }
+    return text;
+  };
 
-  const handleFileClick = (file) => {
+  const waitForJob = (jobId) => {
     /**
-     * Handles the click event for selecting a file. Sets the active file and updates the court case text.
+     * Follows a summarization job through its Server-Sent Events stream,
+     * updating the loading text and progress as each paragraph is labeled.
      *
-     * @param {Object} file - The selected file object containing file details.
-     *   - file: Object representing the file containing file name, file content, and file text.
+     * @param {string} jobId - The ID of the summarization job.
+     * @returns {Promise<Object>} Resolves to the summary produced by the job.
+     */
+    return new Promise((resolve, reject) => {
+      const events = new EventSource(
+        `http://127.0.0.1:5000/summarize-jobs/${jobId}/events`
+      );
+
+      events.addEventListener("stage", (event) => {
+        setLoadingText(describeJob(JSON.parse(event.data)));
+      });
+
+      events.addEventListener("paragraph", (event) => {
+        const paragraph = JSON.parse(event.data);
+        setLoadingText(describeJob({ stage: "segmenting", ...paragraph }));
+        setProgress(Math.round((paragraph.processed / paragraph.total) * 100));
+      });
+
+      events.addEventListener("completed", (event) => {
+        events.close();
+        resolve(JSON.parse(event.data).result);
+      });
+
+      events.addEventListener("failed", (event) => {
+        events.close();
+        reject(new Error(JSON.parse(event.data).error));
+      });
+
+      // The browser reconnects on its own unless the stream was rejected
+      events.onerror = () => {
+        if (events.readyState === EventSource.CLOSED) {
+          reject(new Error("Lost connection to the summarization job"));
+        }
+      };
+    });
+  };
+
+  const handleFileClick = async (listedFile) => {
+    /**
+     * Handles the click event for selecting a file. Fetches the file's details, then sets the active file and updates the court case text.
+     *
+     * @param {Object} listedFile - The selected entry of the file list.
+     *   - listedFile: Object representing the file containing its id, file name and summary flag.
      *
      * @returns {void}
      */
+    let file;
+    try {
+      file = await fetchFileDetail(listedFile.id);
+    } catch (err) {
+      console.error(err);
+      return;
+    }
+
     setActiveFile(file);
     setCourtCaseValue(file.file_text);
 
@@ -173,7 +221,9 @@ const Summarizer = () => {
       // Update the existing files in the state
       setActiveFile(newFile); // Update the active file state
       setExistingFiles((prev) =>
-        prev.map((file) => (file.id === activeFile.id ? newFile : file))
+        prev.map((file) =>
+          file.id === activeFile.id ? { ...file, file_summary: 0 } : file
+        )
       );
       setEditCase(false); // Exit edit mode after saving
       setCancelEdit(false); // Reset cancel state
@@ -211,9 +261,7 @@ const Summarizer = () => {
       // Update the existing files in the state
       setExistingFiles((prev) =>
         prev.map((file) =>
-          file.id === activeFile.id
-            ? { ...file, file_text: courtCaseValue }
-            : file
+          file.id === activeFile.id ? { ...file, file_summary: 0 } : file
         )
       );
       console.log("summ:", activeFile.file_summary);
@@ -265,8 +313,7 @@ const Summarizer = () => {
         setCourtCaseLink(""); // Reset link input after submission
         setIsModalOpen(false); // Close modal
 
-        const updatedFiles = await axios.get("http://127.0.0.1:5000/get-files");
-        setExistingFiles(updatedFiles.data);
+        await refreshFiles();
 
         setShowAddedPopup(true); // Show the popup
         setTimeout(() => setShowAddedPopup(false), 3000); // Hide popup after 3 seconds
@@ -301,9 +348,8 @@ const Summarizer = () => {
       if (resetFileName) resetFileName(); // Clear the file input
       setIsModalOpen(false); // Close the modal
 
-      // Refresh the list of files after upload
-      const updatedFiles = await axios.get("http://127.0.0.1:5000/get-files");
-      setExistingFiles(updatedFiles.data);
+      // Bring the list of files up to date after upload
+      await refreshFiles();
 
       setShowAddedPopup(true); // Show the popup
       setTimeout(() => setShowAddedPopup(false), 3000);
@@ -324,9 +370,7 @@ const Summarizer = () => {
 
     try {
       await axios.delete(`http://127.0.0.1:5000/delete-file/${activeFile.id}`);
-      setExistingFiles((prevFiles) =>
-        prevFiles.filter((file) => file.id !== activeFile.id)
-      );
+      await refreshFiles();
       setActiveFile(null);
       setCourtCaseValue(""); // Clear the displayed court case text
 
@@ -380,6 +424,8 @@ const Summarizer = () => {
   const handleSummarizedCase = async () => {
     /**
      * Summarizes the case by performing a series of steps: pre-processing, segmenting, and summarizing.
+     * The steps run as a backend job whose stage and per-paragraph progress are
+     * streamed to the page while it runs.
      * Updates the summarized case text in the state after the process is complete.
      *
      * @returns {void}
@@ -392,15 +438,16 @@ const Summarizer = () => {
     setIsSummaryLoading(true);
     console.log("has summary", activeFile.file_summary);
     setProgress(0); // Reset progress at the beginning of the process
-
-    // Function to slowly increment progress over time
+    setLoadingText("Queued..");
 
     try {
-      const summarize_res = await axios.post(
-        `http://127.0.0.1:5000/get-summarized/${activeFile.id}`,
-        {},
+      // Start a background job and follow its events until the summary is ready
+      const job_res = await axios.post(
+        "http://127.0.0.1:5000/summarize-jobs",
+        { file_id: activeFile.id },
         { headers: { "Content-Type": "application/json" } }
       );
+      const summarize_res = { data: await waitForJob(job_res.data.id) };
 
       const summarizedFile = {
         ...activeFile,
@@ -417,9 +464,7 @@ const Summarizer = () => {
 
       setExistingFiles((prev) =>
         prev.map((file) =>
-          file.id === activeFile.id
-            ? { ...file, file_text: courtCaseValue }
-            : file
+          file.id === activeFile.id ? { ...file, file_summary: 1 } : file
         )
       );
     } catch (err) {
@@ -773,8 +818,6 @@ const Summarizer = () => {
                 >
                   <p
                     className={`loading-text fade-text ${
-                      isFadingOut ? "hidden" : ""
-                    } ${
                       isDarkMode
                         ? "bg-darkSecondary text-white"
                         : "bg-customRbox text-black"
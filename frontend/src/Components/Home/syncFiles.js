@@ -0,0 +1,69 @@
+/**
+ * Program Title: Court Case Summarizer - File List Sync
+ *
+ * Programmer: Jewell Anne Diamante
+ * Date Written: October 17, 2026
+ * Date Revised: October 17, 2026
+ *
+ * Purpose:
+ *    This module keeps a component's list of court case files up to date with
+ *    the backend by reading its change feed, so only the files created,
+ *    updated or deleted since the last sync are fetched.
+ *
+ * Where the Program Fits in the General System Design:
+ *    The Summarizer and Statistics components both list the stored files and
+ *    share this sync. Each keeps its own change feed cursor and file list.
+ *
+ * Dependencies and Resources:
+ *    - Axios: For HTTP requests to the backend's change feed.
+ *
+ * Control Flow and Logic:
+ *    1. `syncFiles`: Reads the change feed from the component's cursor one
+ *       page at a time, then merges the changes into its file list.
+ */
+
+import axios from "axios";
+
+export const syncFiles = async (changeCursor, setExistingFiles) => {
+  /**
+   * Description:
+   * Brings a list of files up to date with the files created, updated or
+   * deleted on the server since the last sync, reading the change feed one
+   * page at a time. The first sync (cursor 0) fetches every file.
+   *
+   * Parameter:
+   * {Object} changeCursor - The component's ref holding its change feed cursor.
+   * {Function} setExistingFiles - The state setter of the component's file list.
+   *
+   * Returns:
+   * {Promise<void>} - Resolves once the list of files is up to date.
+   */
+  const changed = new Map();
+  const deleted = new Set();
+  let since = changeCursor.current;
+  let hasMore = true;
+  while (hasMore) {
+    const res = await axios.get("http://127.0.0.1:5000/files/changes", {
+      params: { since },
+    });
+    // Pages come in change order, so a later page overrides an earlier one
+    res.data.files.forEach((file) => {
+      changed.set(file.id, file);
+      deleted.delete(file.id);
+    });
+    res.data.deleted.forEach((id) => {
+      deleted.add(id);
+      changed.delete(id);
+    });
+    since = res.data.cursor;
+    hasMore = res.data.has_more;
+  }
+  changeCursor.current = since;
+
+  setExistingFiles((prev) => {
+    const files = new Map(prev.map((file) => [file.id, file]));
+    deleted.forEach((id) => files.delete(id));
+    changed.forEach((file, id) => files.set(id, { ...files.get(id), ...file }));
+    return [...files.values()].sort((a, b) => a.id - b.id);
+  });
+};